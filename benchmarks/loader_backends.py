@@ -0,0 +1,56 @@
+import sys
+import time
+from argparse import Namespace, ArgumentParser
+from pathlib import Path
+
+from python_json_config import ConfigBuilder
+
+# Allow running the script from any directory without installing the package
+sys.path.insert(0, str(Path(__file__).absolute().parent.parent))
+
+from eso_logs_analyzer.logging import init_loggers
+
+
+def cli_args() -> Namespace:
+    parser = ArgumentParser(prog="Loader Backend Benchmark",
+                            description="Compares the wall time of the process and thread backends of the parallel loader on the same log file.")
+    parser.add_argument("log", type=str, help="The log file that is loaded")
+    parser.add_argument("--config", default="./config.json", type=str, help="Configuration file (JSON). Only the logging settings are used.")
+    parser.add_argument("--workers", default=4, type=int, help="Number of processes or threads.")
+    parser.add_argument("--chunks", default=64, type=int, help="Number of chunks the file is split into.")
+    parser.add_argument("--repeat", default=3, type=int, help="How often the file is loaded with each backend. The fastest run is reported.")
+    parser.add_argument("--single", action="store_false", help="Set to only read the first encounterlog in the file.")
+    parser.add_argument("--all-events", action="store_true", help="Set to load all events instead of only the events the analysis consumes.")
+    return parser.parse_args()
+
+
+def main(args: Namespace):
+    init_loggers(ConfigBuilder().parse_config(args.config))
+
+    # Loggers may only be created after they were initialized
+    from eso_logs_analyzer.analysis.analysis import EVENT_FILTER, PROJECTION
+    from eso_logs_analyzer.loading.parallel_loader import ParallelLoader
+    from eso_logs_analyzer.utils import is_gil_enabled
+
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled() else 'disabled'}")
+    if is_gil_enabled():
+        print(f"The {ParallelLoader.THREAD_BACKEND} backend loads the chunks one after another on builds with a GIL")
+
+    loader_kwargs = dict(file=args.log, multiple=args.single, num_processes=args.workers, num_chunks=args.chunks)
+    if not args.all_events:
+        loader_kwargs.update(event_filter=EVENT_FILTER, projection=PROJECTION)
+
+    for backend in [ParallelLoader.PROCESS_BACKEND, ParallelLoader.THREAD_BACKEND]:
+        times = []
+        num_events = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            logs = ParallelLoader(backend=backend, **loader_kwargs).parse_log()
+            times.append(time.perf_counter() - start)
+            logs = logs if isinstance(logs, list) else [logs]
+            num_events = sum([len(log.events) for log in logs])
+        print(f"{backend:>8}: {min(times):.2f}s (best of {args.repeat}), {num_events} events")
+
+
+if __name__ == "__main__":
+    main(cli_args())
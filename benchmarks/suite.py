@@ -0,0 +1,298 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from argparse import Namespace, ArgumentParser
+from datetime import datetime
+from multiprocessing import Process, Queue
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from python_json_config import ConfigBuilder
+
+try:
+    import resource
+except ImportError:
+    # The peak memory usage is only measured on Unix
+    resource = None
+
+ROOT = Path(__file__).absolute().parent.parent
+# Allow running the script from any directory without installing the package
+sys.path.insert(0, str(ROOT))
+
+# Increase when the format of the results changes
+RESULTS_VERSION = 1
+# The stages of analyzing a log file in order
+STAGES = ["load", "initialize", "analyze", "render"]
+SEQUENTIAL_LOADER = "sequential"
+
+
+def cli_args() -> Namespace:
+    parser = ArgumentParser(prog="Benchmark Suite",
+                            description="Measures the wall time, throughput and peak memory usage of each stage of analyzing log files and compares the "
+                                        "results to a baseline.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Runs the benchmarks and writes the results as JSON.")
+    run_parser.add_argument("logs", nargs="*", type=str, help="The log files that are benchmarked")
+    run_parser.add_argument("--output", default="benchmark_results.json", type=str, help="File the results are written to.")
+    run_parser.add_argument("--config", default="./config.json", type=str, help="Configuration file (JSON). Only the logging and export settings are used.")
+    run_parser.add_argument("--repeat", default=3, type=int, help="How often each benchmark is run. The fastest run is reported.")
+    run_parser.add_argument("--processes", nargs="+", default=[1, 2, 4], type=int,
+                            help="Numbers of processes of the parallel loader that are benchmarked. One process benchmarks the sequential loader.")
+    run_parser.add_argument("--chunks", nargs="+", default=[16, 64], type=int, help="Numbers of chunks of the parallel loader that are benchmarked.")
+    run_parser.add_argument("--backend", default="process", choices=["process", "thread"], type=str, help="Backend of the parallel loader.")
+    run_parser.add_argument("--all-events", action="store_true", help="Set to load all events instead of only the events the analysis consumes.")
+    run_parser.add_argument("--synthetic", nargs="+", default=[], type=int,
+                            help="Approximate numbers of lines of synthetic log files that are generated and benchmarked in addition to the log files.")
+    run_parser.add_argument("--seed", default=0, type=int, help="Seed of the synthetic log files.")
+
+    compare_parser = subparsers.add_parser("compare", help="Compares results to a baseline. Exits with status 1 if any benchmark regressed.")
+    compare_parser.add_argument("baseline", type=str, help="Results of the baseline")
+    compare_parser.add_argument("results", type=str, help="Results that are compared to the baseline")
+    compare_parser.add_argument("--threshold", default=0.1, type=float, help="Relative increase of the wall time that is reported as regression.")
+    compare_parser.add_argument("--min-difference", default=0.05, type=float,
+                                help="Seconds the wall time needs to increase by at least to be reported as regression. Avoids reporting noise of short stages.")
+    compare_parser.add_argument("--memory-threshold", default=0.2, type=float,
+                                help="Relative increase of the peak memory usage that is reported as regression.")
+    return parser.parse_args()
+
+
+def peak_rss() -> Optional[float]:
+    """
+    @return: The peak resident set size in MiB of this process or of its largest child process (e.g., a loader process) or None, if it can't be
+             measured on this platform.
+    """
+    if resource is None:
+        return None
+    max_rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # The size is given in bytes on macOS and in kibibytes on other platforms
+    return max_rss / (1 << 20) if sys.platform == "darwin" else max_rss / (1 << 10)
+
+
+def run_case(case: dict, config_path: str, queue: Queue):
+    """
+    Runs the stages of a benchmark case in a separate process, so that the peak memory usage of the case is not influenced by the previous cases.
+    Puts the wall time and the peak memory usage after each stage or the error of the case into the queue.
+    """
+    try:
+        queue.put(__measure_case(case, config_path))
+    except Exception:
+        queue.put({"error": traceback.format_exc()})
+
+
+def __measure_case(case: dict, config_path: str) -> Dict[str, dict]:
+    # Templates are found relative to the working directory
+    os.chdir(ROOT)
+    config_dict = ConfigBuilder().parse_config(config_path).to_dict()
+    with tempfile.TemporaryDirectory() as export_path:
+        config_dict["export"] = {**(config_dict.get("export") or {}), "path": export_path}
+        config = ConfigBuilder().parse_config(config_dict)
+
+        from eso_logs_analyzer.logging import init_loggers
+        init_loggers(config)
+
+        # Loggers may only be created after they were initialized
+        from eso_logs_analyzer.analysis import analyze_logs
+        from eso_logs_analyzer.analysis.analysis import EVENT_FILTER, PROJECTION
+        from eso_logs_analyzer.loading.log_loader import LogLoader
+        from eso_logs_analyzer.loading.parallel_loader import ParallelLoader
+        from eso_logs_analyzer.rendering import render_log
+
+        loader_kwargs = dict(file=case["file"], multiple=True)
+        if not case["all_events"]:
+            loader_kwargs.update(event_filter=EVENT_FILTER, projection=PROJECTION)
+        if case["loader"] == SEQUENTIAL_LOADER:
+            loader = LogLoader(**loader_kwargs)
+        else:
+            loader = ParallelLoader(num_processes=case["num_processes"], num_chunks=case["num_chunks"], backend=case["loader"], **loader_kwargs)
+
+        measurements = {}
+        state = {}
+
+        def measure(stage: str, function):
+            start = time.perf_counter()
+            state[stage] = function()
+            measurements[stage] = {"wall_time": time.perf_counter() - start, "peak_rss": peak_rss()}
+
+        # The loaders initialize the logs while parsing them, so the stages are run separately
+        measure("load", lambda: loader._load_log())
+        if "initialize" in case["stages"]:
+            measure("initialize", lambda: [log.initialize() for log in state["load"]])
+        if "analyze" in case["stages"]:
+            measure("analyze", lambda: analyze_logs(state["load"]))
+        if "render" in case["stages"]:
+            measure("render", lambda: render_log(state["analyze"], config))
+    return measurements
+
+
+def __run_case_in_process(case: dict, config_path: str) -> Dict[str, dict]:
+    queue = Queue()
+    process = Process(target=run_case, args=(case, config_path, queue))
+    process.start()
+    measurements = queue.get()
+    process.join()
+    if "error" in measurements:
+        raise RuntimeError(f"Benchmark case {case} failed:\n{measurements['error']}")
+    return measurements
+
+
+def __git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def __cases(file: str, args: Namespace) -> List[dict]:
+    """
+    The sequential loader is benchmarked with all stages, while the parallel loader is only benchmarked loading the file with each number of
+    processes and chunks.
+    """
+    cases = []
+    for num_processes in args.processes:
+        if num_processes <= 1:
+            cases.append(dict(file=file, loader=SEQUENTIAL_LOADER, num_processes=1, num_chunks=None, stages=STAGES, all_events=args.all_events))
+            continue
+        for num_chunks in args.chunks:
+            cases.append(dict(file=file, loader=args.backend, num_processes=num_processes, num_chunks=num_chunks, stages=["load"],
+                              all_events=args.all_events))
+    return cases
+
+
+def __generate_synthetic_logs(directory: str, args: Namespace) -> List[str]:
+    """
+    Generates the synthetic log files. The same seed and number of lines always generate the same file, so their results can be compared.
+    """
+    from eso_logs_analyzer.generation import LogGenerator
+
+    files = []
+    for num_lines in args.synthetic:
+        file = str(Path(directory) / f"synthetic_{num_lines}_{args.seed}.log")
+        events_per_pull = LogGenerator.events_per_pull_for_size(num_lines, 1, 10)
+        LogGenerator(seed=args.seed, num_pulls=10, events_per_pull=events_per_pull).write(file)
+        files.append(file)
+    return files
+
+
+def run(args: Namespace):
+    with tempfile.TemporaryDirectory() as synthetic_path:
+        __run_benchmarks(args.logs + __generate_synthetic_logs(synthetic_path, args), args)
+
+
+def __run_benchmarks(files: List[str], args: Namespace):
+    from eso_logs_analyzer.loading.utils import get_num_lines, file_fingerprint
+
+    assert files, "No log files to benchmark. Pass log files or numbers of lines of synthetic log files."
+    benchmarks = []
+    for file in files:
+        file = str(Path(file).absolute())
+        num_lines = get_num_lines(file)
+        size = os.path.getsize(file)
+        for case in __cases(file, args):
+            runs = [__run_case_in_process(case, args.config) for _ in range(args.repeat)]
+            for stage in case["stages"]:
+                wall_time = min([measurements[stage]["wall_time"] for measurements in runs])
+                peak_rss_values = [measurements[stage]["peak_rss"] for measurements in runs if measurements[stage]["peak_rss"] is not None]
+                benchmark = {
+                    "name": Path(file).name,
+                    "fingerprint": file_fingerprint(file),
+                    "loader": case["loader"],
+                    "num_processes": case["num_processes"],
+                    "num_chunks": case["num_chunks"],
+                    "all_events": case["all_events"],
+                    "stage": stage,
+                    "wall_time": wall_time,
+                    "lines_per_second": num_lines / wall_time,
+                    "mb_per_second": size / (1 << 20) / wall_time,
+                    "peak_rss_mb": max(peak_rss_values) if peak_rss_values else None
+                }
+                benchmarks.append(benchmark)
+                print(f"{benchmark['name']} {__case_str(benchmark):<36} {stage:>10}: {wall_time:.3f}s, {benchmark['lines_per_second']:.0f} lines/s, "
+                      f"{benchmark['mb_per_second']:.1f} MB/s, peak RSS {__format_optional(benchmark['peak_rss_mb'], '.0f')} MB")
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(),
+        "commit": __git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "benchmarks": benchmarks
+    }
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Wrote {len(benchmarks)} benchmark results to {args.output}")
+
+
+def __case_str(benchmark: dict) -> str:
+    if benchmark["loader"] == SEQUENTIAL_LOADER:
+        return SEQUENTIAL_LOADER
+    return f"{benchmark['loader']}(processes={benchmark['num_processes']}, chunks={benchmark['num_chunks']})"
+
+
+def __format_optional(value: Optional[float], format_spec: str) -> str:
+    return format(value, format_spec) if value is not None else "n/a"
+
+
+def __key(benchmark: dict) -> Tuple:
+    """
+    Benchmarks are only compared if they loaded the same file in the same way.
+    """
+    return (benchmark["fingerprint"], benchmark["loader"], benchmark["num_processes"], benchmark["num_chunks"], benchmark["all_events"],
+            benchmark["stage"])
+
+
+def compare(args: Namespace) -> bool:
+    """
+    @return: True, if no benchmark regressed.
+    """
+    with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.results, "r", encoding="utf-8") as results_file:
+        results = json.load(results_file)
+    assert baseline["version"] == results["version"] == RESULTS_VERSION, f"Only results of version {RESULTS_VERSION} can be compared"
+
+    baseline_benchmarks = {__key(benchmark): benchmark for benchmark in baseline["benchmarks"]}
+    num_regressions = 0
+    for benchmark in results["benchmarks"]:
+        reference = baseline_benchmarks.get(__key(benchmark))
+        if reference is None:
+            print(f"{benchmark['name']} {__case_str(benchmark):<36} {benchmark['stage']:>10}: no baseline")
+            continue
+
+        time_change = benchmark["wall_time"] / reference["wall_time"] - 1
+        regressions = []
+        if time_change > args.threshold and benchmark["wall_time"] - reference["wall_time"] > args.min_difference:
+            regressions.append("wall time")
+        memory_change = None
+        if benchmark["peak_rss_mb"] is not None and reference["peak_rss_mb"] is not None:
+            memory_change = benchmark["peak_rss_mb"] / reference["peak_rss_mb"] - 1
+            if memory_change > args.memory_threshold:
+                regressions.append("peak RSS")
+        num_regressions += len(regressions)
+
+        print(f"{benchmark['name']} {__case_str(benchmark):<36} {benchmark['stage']:>10}: "
+              f"{reference['wall_time']:.3f}s -> {benchmark['wall_time']:.3f}s ({time_change:+.1%}), "
+              f"peak RSS {__format_optional(reference['peak_rss_mb'], '.0f')} -> {__format_optional(benchmark['peak_rss_mb'], '.0f')} MB"
+              f"{f' ({memory_change:+.1%})' if memory_change is not None else ''}"
+              f"{'  REGRESSION: ' + ', '.join(regressions) if regressions else ''}")
+
+    print(f"{num_regressions} regressions found" if num_regressions else "No regressions found")
+    return num_regressions == 0
+
+
+def main(args: Namespace):
+    if args.command == "run":
+        run(args)
+    elif not compare(args):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(cli_args())
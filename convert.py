@@ -0,0 +1,53 @@
+from argparse import Namespace, ArgumentParser
+from pathlib import Path
+
+from python_json_config import ConfigBuilder
+
+from eso_logs_analyzer.archive import convert_log, ARCHIVE_SUFFIX
+from eso_logs_analyzer.loading.compression import compress_log, is_compressed, GZIP_SUFFIX
+from eso_logs_analyzer.logging import init_loggers
+from eso_logs_analyzer.progress import enable_progress
+
+FORMAT_ARCHIVE: str = "archive"
+FORMAT_GZIP: str = "gzip"
+
+
+def cli_args() -> Namespace:
+    parser = ArgumentParser(prog="ESO Logs Converter",
+                            description="Converts encounterlog files into a format that is smaller to archive and can still be analyzed directly.")
+    parser.add_argument("log", type=str, help="The log file that is converted. May be compressed (.gz or .xz).")
+    parser.add_argument("--format", default=FORMAT_ARCHIVE, choices=[FORMAT_ARCHIVE, FORMAT_GZIP],
+                        help="Either an archive with the events stored in compressed columns or a gzip file of independently compressed blocks.")
+    parser.add_argument("--output", default=None, type=str, help="The converted file. Defaults to the log file with the suffix of the format.")
+    parser.add_argument("--config", default="./config.json", type=str, help="Configuration file (JSON). Only the logging settings are used.")
+    parser.add_argument("--block-size", default=16, type=int, help="Uncompressed size of each independently compressed block in MiB (gzip only).")
+    parser.add_argument("--block-rows", default=65536, type=int, help="Maximum number of events of a type in each compressed block (archive only).")
+    parser.add_argument("--no-progress", action="store_true", help="Set to disable the progress bar, e.g., for batch or cron runs.")
+    return parser.parse_args()
+
+
+def __default_output(log: Path, output_format: str) -> Path:
+    # Replace the suffix of compressed logs (e.g., "a.log.xz" becomes "a.log.gz")
+    name = log.name.removesuffix(log.suffix) if is_compressed(log) else log.name
+    if output_format == FORMAT_ARCHIVE:
+        return log.with_name(f"{name.removesuffix('.log')}{ARCHIVE_SUFFIX}")
+    return log.with_name(f"{name}{GZIP_SUFFIX}")
+
+
+def main(args: Namespace):
+    init_loggers(ConfigBuilder().parse_config(args.config))
+    enable_progress(not args.no_progress)
+
+    log = Path(args.log)
+    assert log.is_file(), f"Log file at {log} does not exist."
+    output = Path(args.output) if args.output is not None else __default_output(log, args.format)
+    assert output.absolute() != log.absolute(), f"Can't convert {log} into itself."
+    if args.format == FORMAT_ARCHIVE:
+        writer = convert_log(log, output, block_rows=args.block_rows)
+        print(f"Archived {len(writer.logs)} logs with {writer.num_lines} lines: {log.stat().st_size >> 10} KiB -> {output.stat().st_size >> 10} KiB")
+    else:
+        compress_log(log, output, block_size=args.block_size << 20)
+
+
+if __name__ == "__main__":
+    main(cli_args())
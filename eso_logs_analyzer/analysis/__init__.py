@@ -0,0 +1,14 @@
+from .analysis import analyze_logs, analyze_encounter
+from .cache import AnalysisCache
+from .checkpoint import LogCheckpoint
+from .results import LogResult, EncounterResult, UnitResult
+
+__all__ = [
+    analyze_logs.__name__,
+    analyze_encounter.__name__,
+    AnalysisCache.__name__,
+    LogCheckpoint.__name__,
+    LogResult.__name__,
+    EncounterResult.__name__,
+    UnitResult.__name__
+]
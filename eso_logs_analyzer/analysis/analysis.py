@@ -0,0 +1,111 @@
+from typing import Union, List, Optional
+
+from .results import LogResult, EncounterResult, UnitResult
+from ..instrumentation import span
+from ..loading import EventFilter
+from ..models.data import EncounterLog
+from ..models.data.events import CombatEvent, EffectChanged
+from ..models.postprocessing import CombatEncounter, Unit
+from ..utils import tqdm
+
+# Increase when the computed results change to invalidate cached results
+ANALYSIS_VERSION = 2
+
+# Debuffs whose uptimes are rendered. The results contain the uptimes of all effects, so this list can be changed without analyzing the logs again.
+DEBUFFS = sorted([
+    "Crusher",
+    "Major Breach",
+    "Minor Breach",
+    "Crimson Oath's Rive",
+    "Minor Vulnerability",
+    "Major Vulnerability",
+    "Minor Brittle",
+    "Flame Weakness",
+    "Frost Weakness",
+    "Shock Weakness"
+])
+
+# Events the analysis consumes in addition to the structural events of a log.
+# Combat events determine the hostile units and their active times, effect changed events the effect uptimes. The effect changed events are not
+# restricted to the rendered debuffs, since the uptimes of all effects are stored in the results.
+EVENT_FILTER = EventFilter(event_types=[CombatEvent, EffectChanged])
+
+# Unit state attributes the analysis reads. The health of the last hit on a unit determines if it was killed.
+PROJECTION = {
+    CombatEvent: ["target_current_health", "target_maximum_health"],
+    EffectChanged: []
+}
+
+
+def __unit_result(unit: Unit) -> UnitResult:
+    begin_time = unit.combat_encounter.begin.time
+    return UnitResult(name=unit.unit.name,
+                      unit_id=unit.unit.unit_id,
+                      uptime_begin=(unit.uptime_begin - begin_time).total_seconds(),
+                      uptime_end=(unit.uptime_end - begin_time).total_seconds(),
+                      was_killed=unit.was_killed,
+                      uptimes_for_abilities={ability.ability_id: uptime for ability, uptime in unit.uptimes_for_abilities.items()},
+                      max_uptime_for_abilities={name: (ability.ability_id, uptime) for name, (ability, uptime) in unit.max_uptime_for_abilities.items()})
+
+
+def __encounter_result(encounter: CombatEncounter) -> EncounterResult:
+    boss_name = encounter.get_boss().value
+    boss_unit = [unit for unit in encounter.boss_units if unit.unit.name == boss_name][0]
+    final_boss_hp = float(boss_unit.uptime_end_event.target_current_health) / float(boss_unit.uptime_end_event.target_maximum_health)
+
+    return EncounterResult(boss=boss_name,
+                           trial=encounter.trial_id.name if encounter.trial_id is not None else None,
+                           begin_time=encounter.begin.time,
+                           begin_event_id=encounter.begin.event_id,
+                           end_event_id=encounter.end.event_id,
+                           duration=encounter.event_span.duration.total_seconds(),
+                           is_clear=all([unit.was_killed for unit in encounter.boss_units]),
+                           final_boss_hp=final_boss_hp,
+                           units=[__unit_result(unit) for unit in encounter.hostile_units])
+
+
+def analyze_encounter(encounter: CombatEncounter) -> Optional[EncounterResult]:
+    """
+    Computes the debuff uptimes of a combat encounter.
+    @param encounter: The encounter.
+    @return: The results or None if the encounter is not a boss encounter of a supported trial.
+    """
+    if not encounter.is_boss_encounter:
+        return None
+    try:
+        if encounter.get_boss() is None:
+            return None
+    except NotImplementedError:
+        return None
+
+    encounter.compute_debuff_uptimes()
+    return __encounter_result(encounter)
+
+
+def analyze_logs(encounter_log: Union[EncounterLog, List[EncounterLog]]) -> List[LogResult]:
+    """
+    Computes the debuff uptimes of every boss encounter in the logs. The results contain the uptimes of all loaded effects on all hostile units, so
+    that the rendered abilities and units can be changed without computing the results again.
+    @param encounter_log: Either a single log or multiple logs that were in a single file.
+    @return: The results for each log.
+    """
+    encounter_logs = encounter_log if isinstance(encounter_log, list) else [encounter_log]
+
+    results = []
+    for log in encounter_logs:
+        with span("create_encounters") as encounters_span:
+            combat_encounters = CombatEncounter.load(log)
+            encounters_span.add_events(len(combat_encounters))
+        boss_encounters = [encounter for encounter in combat_encounters if encounter.is_boss_encounter]
+
+        encounters = []
+        with span("compute_uptimes") as uptimes_span:
+            for encounter in tqdm(boss_encounters, desc="Computing boss encounter uptimes"):
+                result = analyze_encounter(encounter)
+                if result is not None:
+                    encounters.append(result)
+            uptimes_span.add_events(len(boss_encounters))
+
+        results.append(LogResult(begin_time=log.begin_log.time, server=log.begin_log.server.value, encounters=encounters))
+
+    return results
@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Union, List, Optional
+
+from .analysis import ANALYSIS_VERSION
+from .checkpoint import LogCheckpoint
+from .results import LogResult
+from ..loading.utils import file_fingerprint, prefix_fingerprint
+from ..models import Base
+
+
+class AnalysisCache(Base):
+    __CACHE_SUBDIR: str = "analysis"
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Stores the analysis results of log files, so that the rendering can be repeated without parsing and analyzing the logs again.
+        Results are stored per log file and identified by the fingerprint of the file, the analysis version and the loader options.
+        @param path: Directory of the cache.
+        """
+        super().__init__()
+        self.path = Path(path) / self.__CACHE_SUBDIR
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def key(self, file: Union[str, Path], **options) -> str:
+        """
+        Computes the key of the cache entry for a log file.
+        @param file: The log file.
+        @param options: Further options that influence the analysis results (e.g., if multiple logs are loaded from the file).
+        @return: The cache key.
+        """
+        return self.__key(f"{ANALYSIS_VERSION}:{file_fingerprint(file)}", **options)
+
+    def checkpoint_key(self, file: Union[str, Path], **options) -> str:
+        """
+        Computes the key of the checkpoint for a log file. In contrast to the cache entry, the checkpoint is identified by the path of the file,
+        since its fingerprint changes whenever logs are appended to it.
+        @param file: The log file.
+        @param options: Further options that influence the analysis results.
+        @return: The checkpoint key.
+        """
+        return self.__key(f"{ANALYSIS_VERSION}:checkpoint:{Path(file).absolute()}", **options)
+
+    @staticmethod
+    def __key(identifier: str, **options) -> str:
+        key = hashlib.sha256(identifier.encode("utf-8"))
+        for name, value in sorted(options.items()):
+            key.update(f":{name}={value}".encode("utf-8"))
+        return key.hexdigest()
+
+    def __entry_path(self, key: str) -> Path:
+        return self.path / f"{key}.json.gz"
+
+    def __checkpoint_path(self, key: str) -> Path:
+        return self.path / f"{key}.checkpoint.json.gz"
+
+    def __read(self, entry_path: Path) -> Optional[dict]:
+        """
+        Reads a cache file.
+        @return: The stored data or None, if there is no valid file of the current analysis version.
+        """
+        if not entry_path.exists():
+            return None
+
+        try:
+            with gzip.open(entry_path, "rt", encoding="utf-8") as entry_file:
+                data = json.load(entry_file)
+            if data["version"] != ANALYSIS_VERSION:
+                return None
+            return data
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring invalid analysis cache entry {entry_path}: {e}")
+            return None
+
+    def load(self, key: str) -> Optional[List[LogResult]]:
+        """
+        Loads the results stored with the key.
+        @return: The results for each log in the file or None if there is no valid cache entry.
+        """
+        data = self.__read(self.__entry_path(key))
+        if data is None:
+            return None
+        try:
+            return [LogResult.from_dict(log) for log in data["logs"]]
+        except (ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring invalid analysis cache entry {self.__entry_path(key)}: {e}")
+            return None
+
+    def load_checkpoint(self, key: str, file: Union[str, Path]) -> Optional[LogCheckpoint]:
+        """
+        Loads the checkpoint stored with the key.
+        @param file: The log file. The checkpoint is only returned if the part of the file before the checkpoint did not change.
+        @return: The checkpoint or None if there is no valid checkpoint.
+        """
+        checkpoint_path = self.__checkpoint_path(key)
+        data = self.__read(checkpoint_path)
+        if data is None:
+            return None
+        try:
+            checkpoint = LogCheckpoint.from_dict(data["checkpoint"])
+        except (ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring invalid analysis checkpoint {checkpoint_path}: {e}")
+            return None
+
+        if prefix_fingerprint(file, checkpoint.offset) != checkpoint.fingerprint:
+            self.logger.info(f"Ignoring checkpoint {checkpoint} of {file}, since the file was changed before the checkpoint")
+            return None
+        return checkpoint
+
+    def store(self, key: str, results: List[LogResult]) -> None:
+        """
+        Stores the results of the logs in a file with the key.
+        """
+        self.__write(self.__entry_path(key), {
+            "version": ANALYSIS_VERSION,
+            "logs": [log.to_dict() for log in results]
+        })
+
+    def store_checkpoint(self, key: str, checkpoint: LogCheckpoint) -> None:
+        """
+        Stores the checkpoint of a log file in a file with the key. Replaces the previous checkpoint of the file.
+        """
+        self.__write(self.__checkpoint_path(key), {
+            "version": ANALYSIS_VERSION,
+            "checkpoint": checkpoint.to_dict()
+        })
+
+    @staticmethod
+    def __write(entry_path: Path, content: dict) -> None:
+        data = json.dumps(content).encode("utf-8")
+
+        # Write to a temporary file first to never leave an incomplete entry behind
+        temp_path = entry_path.with_name(f".{entry_path.name}.tmp")
+        with open(temp_path, "wb") as temp_file:
+            temp_file.write(gzip.compress(data))
+        os.replace(temp_path, entry_path)
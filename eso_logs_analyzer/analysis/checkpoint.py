@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import List
+
+from .results import LogResult
+
+
+class LogCheckpoint:
+    def __init__(self, offset: int, fingerprint: str, results: List[LogResult]):
+        """
+        Analysis results of the complete logs at the beginning of a log file that is still growing. Only the logs after the checkpoint need to be
+        loaded and analyzed when the file is analyzed again.
+        @param offset: Byte offset after the end log event of the last log in the results.
+        @param fingerprint: Fingerprint of the file up to the offset. The checkpoint is only valid as long as this part of the file does not change.
+        @param results: Results of each log before the offset.
+        """
+        self.offset = offset
+        self.fingerprint = fingerprint
+        self.results = results
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(offset={self.offset}, logs={len(self.results)})"
+
+    __repr__ = __str__
+
+    def to_dict(self) -> dict:
+        return {
+            "offset": self.offset,
+            "fingerprint": self.fingerprint,
+            "logs": [log.to_dict() for log in self.results]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LogCheckpoint:
+        return cls(offset=data["offset"],
+                   fingerprint=data["fingerprint"],
+                   results=[LogResult.from_dict(log) for log in data["logs"]])
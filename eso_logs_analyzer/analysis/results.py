@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Tuple, List, Optional
+
+
+class UnitResult:
+    def __init__(self,
+                 name: str,
+                 unit_id: int,
+                 uptime_begin: float,
+                 uptime_end: float,
+                 was_killed: bool,
+                 uptimes_for_abilities: Dict[int, float],
+                 max_uptime_for_abilities: Dict[str, Tuple[int, float]]):
+        """
+        Analysis results of a single hostile unit in a combat encounter.
+        @param name: Name of the unit.
+        @param unit_id: Id of the unit in the log.
+        @param uptime_begin: Seconds since the start of the encounter until the unit was first hit.
+        @param uptime_end: Seconds since the start of the encounter until the unit was hit for the last time.
+        @param was_killed: True, if the unit died during the encounter.
+        @param uptimes_for_abilities: Total uptime in seconds of each effect (by ability id) on the unit.
+        @param max_uptime_for_abilities: Ability id and uptime in seconds of the effect with the highest uptime for each ability name.
+        """
+        self.name = name
+        self.unit_id = unit_id
+        self.uptime_begin = uptime_begin
+        self.uptime_end = uptime_end
+        self.was_killed = was_killed
+        self.uptimes_for_abilities = uptimes_for_abilities
+        self.max_uptime_for_abilities = max_uptime_for_abilities
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(name={self.name}, unit_id={self.unit_id}, uptime_begin={self.uptime_begin}, uptime_end={self.uptime_end})"
+
+    __repr__ = __str__
+
+    @property
+    def duration(self) -> float:
+        # Times in the log have a resolution of microseconds at most, so rounding removes the error of subtracting the relative times
+        return round(self.uptime_end - self.uptime_begin, 6)
+
+    @property
+    def display_str(self) -> str:
+        return f"{self.name} ({self.unit_id})"
+
+    def uptime_for_ability_name(self, ability_name: str) -> float:
+        if ability_name not in self.max_uptime_for_abilities:
+            return 0.0
+        return self.max_uptime_for_abilities[ability_name][1]
+
+    def relative_uptime_for_ability_name(self, ability_name: str) -> float:
+        return self.uptime_for_ability_name(ability_name) / self.duration
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "unit_id": self.unit_id,
+            "uptime_begin": self.uptime_begin,
+            "uptime_end": self.uptime_end,
+            "was_killed": self.was_killed,
+            # Json only supports string keys
+            "uptimes_for_abilities": {str(ability_id): uptime for ability_id, uptime in self.uptimes_for_abilities.items()},
+            "max_uptime_for_abilities": {name: list(value) for name, value in self.max_uptime_for_abilities.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UnitResult:
+        return cls(name=data["name"],
+                   unit_id=data["unit_id"],
+                   uptime_begin=data["uptime_begin"],
+                   uptime_end=data["uptime_end"],
+                   was_killed=data["was_killed"],
+                   uptimes_for_abilities={int(ability_id): uptime for ability_id, uptime in data["uptimes_for_abilities"].items()},
+                   max_uptime_for_abilities={name: (value[0], value[1]) for name, value in data["max_uptime_for_abilities"].items()})
+
+
+class EncounterResult:
+    def __init__(self,
+                 boss: str,
+                 trial: Optional[str],
+                 begin_time: datetime,
+                 begin_event_id: int,
+                 end_event_id: int,
+                 duration: float,
+                 is_clear: bool,
+                 final_boss_hp: float,
+                 units: List[UnitResult]):
+        """
+        Analysis results of a boss encounter.
+        @param boss: Name of the boss.
+        @param trial: Name of the trial the encounter happened in.
+        @param begin_time: Time at which the encounter started.
+        @param begin_event_id: Event id (millisecond offset to the start of the log) of the start of the encounter.
+        @param end_event_id: Event id of the end of the encounter.
+        @param duration: Duration of the encounter in seconds.
+        @param is_clear: True, if all bosses of the encounter died.
+        @param final_boss_hp: Remaining health of the boss relative to its maximum health.
+        @param units: Results of each hostile unit that was damaged during the encounter.
+        """
+        self.boss = boss
+        self.trial = trial
+        self.begin_time = begin_time
+        self.begin_event_id = begin_event_id
+        self.end_event_id = end_event_id
+        self.duration = duration
+        self.is_clear = is_clear
+        self.final_boss_hp = final_boss_hp
+        self.units = units
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(boss={self.boss}, begin_time={self.begin_time}, duration={self.duration}, is_clear={self.is_clear})"
+
+    __repr__ = __str__
+
+    def to_dict(self) -> dict:
+        return {
+            "boss": self.boss,
+            "trial": self.trial,
+            "begin_time": self.begin_time.isoformat(),
+            "begin_event_id": self.begin_event_id,
+            "end_event_id": self.end_event_id,
+            "duration": self.duration,
+            "is_clear": self.is_clear,
+            "final_boss_hp": self.final_boss_hp,
+            "units": [unit.to_dict() for unit in self.units]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> EncounterResult:
+        return cls(boss=data["boss"],
+                   trial=data["trial"],
+                   begin_time=datetime.fromisoformat(data["begin_time"]),
+                   begin_event_id=data["begin_event_id"],
+                   end_event_id=data["end_event_id"],
+                   duration=data["duration"],
+                   is_clear=data["is_clear"],
+                   final_boss_hp=data["final_boss_hp"],
+                   units=[UnitResult.from_dict(unit) for unit in data["units"]])
+
+
+class LogResult:
+    def __init__(self, begin_time: datetime, server: str, encounters: List[EncounterResult]):
+        """
+        Analysis results of a single encounter log.
+        @param begin_time: Time at which the log started.
+        @param server: Server on which the log was recorded.
+        @param encounters: Results of the boss encounters in the log.
+        """
+        self.begin_time = begin_time
+        self.server = server
+        self.encounters = encounters
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(begin_time={self.begin_time}, server={self.server}, encounters={len(self.encounters)})"
+
+    __repr__ = __str__
+
+    def to_dict(self) -> dict:
+        return {
+            "begin_time": self.begin_time.isoformat(),
+            "server": self.server,
+            "encounters": [encounter.to_dict() for encounter in self.encounters]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> LogResult:
+        return cls(begin_time=datetime.fromisoformat(data["begin_time"]),
+                   server=data["server"],
+                   encounters=[EncounterResult.from_dict(encounter) for encounter in data["encounters"]])
@@ -1,12 +1,24 @@
+import time
 from argparse import Namespace
-from distutils.dir_util import copy_tree
+from functools import partial
 from pathlib import Path
+from typing import List, Dict
 
 from python_json_config import Config, ConfigBuilder
 
-from .loading import load_log
-from .logging import init_loggers
-from .rendering import render_readme, render_log
+from .analysis import AnalysisCache, LogResult, LogCheckpoint, analyze_logs, analyze_encounter
+from .analysis.analysis import EVENT_FILTER, PROJECTION
+from .archive import ARCHIVE_SUFFIX
+from .catalog import LogCatalog, format_catalog
+from .instrumentation import enable_instrumentation, span, collect_spans, write_report, enable_profiling, write_profiles
+from .loading import load_log, LogFollower, TimeWindow
+from .loading.log_loader import LogLoader
+from .loading.utils import prefix_fingerprint
+from .logging import init_loggers, log_suppressed_messages
+from .models.data import EncounterLog
+from .pipeline import Pipeline, Stage
+from .progress import enable_progress
+from .rendering import render_readme, render_log, sync_web_resources
 
 
 class Analyzer:
@@ -16,7 +28,10 @@ class Analyzer:
     """
     __DEFAULT_CONFIG: str = "config.json"
     __DEFAULT_DEV_CONFIG: str = "config.dev.json"
-    __LOG_FILE_SUFFIX: str = ".log"
+    # Log files may be compressed
+    __LOG_FILE_SUFFIXES: List[str] = [".log", ".log.gz", ".log.xz", ARCHIVE_SUFFIX]
+    # Stages that are profiled if no stages are passed to --profile
+    __DEFAULT_PROFILED_STAGES: List[str] = ["load", "initialize", "create_encounters", "compute_uptimes", "render"]
 
     def __init__(self, project_root: Path, cli_args: Namespace):
         super().__init__()
@@ -39,24 +54,172 @@ class Analyzer:
         # Initialize the loggers with the loaded config
         init_loggers(self.config)
 
+        # Worker processes only record spans and profiles if they were enabled before the processes were created
+        if cli_args.profile is not None:
+            enable_profiling(cli_args.profile or self.__DEFAULT_PROFILED_STAGES)
+        if cli_args.profile_report is not None or cli_args.profile is not None:
+            enable_instrumentation(trace_memory=cli_args.trace_memory)
+        # Progress bars are disabled for unattended runs, e.g., by cron jobs. Worker processes inherit the setting.
+        progress_config = self.config.progress
+        enable_progress(not cli_args.no_progress and (progress_config is None or progress_config.enabled is not False))
+
         # Ensure the input log file exists
         self.input_dir = Path(cli_args.log)
         assert self.input_dir.exists(), f"Log file or directory at {self.input_dir} does not exist."
 
+        # Only the events in the time window are analyzed, if it is set
+        self.window = None
+        if cli_args.since is not None or cli_args.until is not None:
+            self.window = TimeWindow(since=cli_args.since, until=cli_args.until)
+
+        # Analysis results are only cached if a cache directory is configured
+        self.analysis_cache = None
+        if self.config.cache is not None and self.config.cache.path is not None:
+            self.analysis_cache = AnalysisCache(self.project_root / self.config.cache.path)
+
+    def analyze_file(self, file: Path) -> List[LogResult]:
+        """
+        Loads and analyzes a log file. If the results of the file are cached, neither loading nor analyzing is necessary.
+        @param file: The log file.
+        @return: The results of each log in the file.
+        """
+        try:
+            with span("file", file=str(file)):
+                return self.__analyze_file(file)
+        finally:
+            # Repeated errors of a file are summarized once it was analyzed
+            log_suppressed_messages()
+
+    def __analyze_file(self, file: Path) -> List[LogResult]:
+        if self.analysis_cache is None:
+            return analyze_logs(load_log(file, self.read_multiple_logs_in_file, self.config, event_filter=EVENT_FILTER, projection=PROJECTION,
+                                         window=self.window))
+
+        options = dict(multiple=self.read_multiple_logs_in_file, events=EVENT_FILTER.fingerprint)
+        if self.window is not None:
+            options["window"] = self.window.fingerprint
+        key = self.analysis_cache.key(file, **options)
+        results = self.analysis_cache.load(key)
+        if results is None:
+            if self.read_multiple_logs_in_file and file.suffix != ARCHIVE_SUFFIX and self.window is None:
+                results = self.__analyze_appended_logs(file)
+            else:
+                results = analyze_logs(load_log(file, self.read_multiple_logs_in_file, self.config, event_filter=EVENT_FILTER, projection=PROJECTION,
+                                                window=self.window))
+            self.analysis_cache.store(key, results)
+        return results
+
+    def __analyze_appended_logs(self, file: Path) -> List[LogResult]:
+        """
+        Analyzes the logs of a file that were appended since the checkpoint of its last analysis and adds their results to the results of the
+        checkpoint. Log files usually only grow, so the logs before the checkpoint don't need to be loaded again. Afterwards, the checkpoint is moved
+        to the end of the last complete log in the file.
+        @param file: The log file.
+        @return: The results of each log in the file.
+        """
+        checkpoint_key = self.analysis_cache.checkpoint_key(file, events=EVENT_FILTER.fingerprint)
+        checkpoint = self.analysis_cache.load_checkpoint(checkpoint_key, file)
+        offset, results = (checkpoint.offset, checkpoint.results) if checkpoint is not None else (0, [])
+
+        # Logs after the last end log event are still being written and are analyzed once they are complete
+        end = LogLoader.find_end_of_last_log(file, offset=offset)
+        if end is None:
+            return results
+
+        results = results + analyze_logs(load_log(file, True, self.config, event_filter=EVENT_FILTER, projection=PROJECTION, offset=offset, end=end))
+        self.analysis_cache.store_checkpoint(checkpoint_key, LogCheckpoint(end, prefix_fingerprint(file, end), results))
+        return results
+
+    def follow(self, file: Path, interval: float, assets: Dict[str, str]):
+        """
+        Follows a log file that is still being written. Each boss encounter is analyzed as soon as it is complete and the page of the file is
+        rendered again with the new results. Runs until it is interrupted.
+        @param file: The log file.
+        @param interval: Seconds to wait before checking the file for new lines again.
+        @param assets: Manifest mapping web resources to their fingerprinted file names.
+        """
+        follower = LogFollower(file, event_filter=EVENT_FILTER, projection=PROJECTION)
+        results: Dict[EncounterLog, LogResult] = {}
+        try:
+            while True:
+                changed = False
+                for encounter in follower.poll():
+                    encounter_result = analyze_encounter(encounter)
+                    if encounter_result is None:
+                        continue
+                    log = encounter.encounter_log
+                    if log not in results:
+                        results[log] = LogResult(begin_time=log.begin_log.time, server=log.begin_log.server.value, encounters=[])
+                    results[log].encounters.append(encounter_result)
+                    changed = True
+
+                if changed:
+                    log_suppressed_messages()
+                    render_log(list(results.values()), self.config, dev_mode=self.cli_args.dev, assets=assets)
+                    render_readme(self.config, dev_mode=self.cli_args.dev, assets=assets)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            follower.close()
+
+    def render_file(self, results: List[LogResult], assets: Dict[str, str]):
+        """
+        Renders the results of a log file.
+        """
+        # A file without a complete log (e.g., it is still being written) has no results and no page
+        if not results:
+            return
+        with span("render", begin_time=results[0].begin_time.isoformat()) as render_span:
+            render_log(results, self.config, dev_mode=self.cli_args.dev, assets=assets, window=self.window)
+            render_span.add_events(sum([len(result.encounters) for result in results]))
+
     def run(self):
-        # Copy the web resources (javascript and css) to target dir.
-        copy_tree(str(self.project_root / self.config.web.resource_path), self.config.export.path)
+        start_time = time.perf_counter()
+        # Copy the changed web resources (javascript and css) to target dir.
+        assets = sync_web_resources(self.project_root / self.config.web.resource_path, self.config.export.path)
+
+        if self.cli_args.follow:
+            assert self.input_dir.is_file(), f"Only a single log file can be followed, but {self.input_dir} is not a file."
+            self.follow(self.input_dir, self.cli_args.interval, assets)
+            return
 
         if self.input_dir.is_file():
             input_files = [self.input_dir]
         else:
-            input_files = list([file for file in self.input_dir.iterdir() if file.is_file() and file.suffix == self.__LOG_FILE_SUFFIX])
-
-        for file in input_files:
-            logs = load_log(file, self.read_multiple_logs_in_file, self.config)
-            render_log(encounter_log=logs, config=self.config, dev_mode=self.cli_args.dev)
-
-        render_readme(self.config, dev_mode=self.cli_args.dev)
+            input_files = list([file for file in self.input_dir.iterdir() if file.is_file() and any([file.name.endswith(suffix) for suffix in self.__LOG_FILE_SUFFIXES])])
+
+        trial_ids = set(self.cli_args.trial) if self.cli_args.trial else None
+        if self.cli_args.catalog or trial_ids is not None or self.cli_args.since is not None or self.cli_args.until is not None:
+            catalog = LogCatalog(self.project_root / self.config.cache.path if self.analysis_cache is not None else None)
+            entries = LogCatalog.select(catalog.scan(input_files), trial_ids, self.cli_args.since, self.cli_args.until)
+            if self.cli_args.catalog:
+                print(format_catalog(sorted(entries, key=lambda entry: entry.begin_time)))
+                return
+            # Only the files containing a selected log are loaded
+            selected_files = set([entry.file for entry in entries])
+            input_files = [file for file in input_files if str(file) in selected_files]
+
+        # Analyze the next files while the results of the previous files are rendered
+        pipeline_config = self.config.pipeline
+        num_analysis_processes = (pipeline_config.num_analysis_processes if pipeline_config is not None else None) or 1
+        num_render_threads = (pipeline_config.num_render_threads if pipeline_config is not None else None) or 1
+        queue_size = (pipeline_config.queue_size if pipeline_config is not None else None) or 2
+        pipeline = Pipeline(stages=[
+            Stage(name="analyze", function=self.analyze_file, num_workers=num_analysis_processes, use_processes=True),
+            Stage(name="render", function=partial(self.render_file, assets=assets), num_workers=num_render_threads)
+        ], queue_size=queue_size)
+        pipeline.run(input_files)
+
+        render_readme(self.config, dev_mode=self.cli_args.dev, assets=assets)
+        log_suppressed_messages()
+
+        spans = collect_spans()
+        if self.cli_args.profile_report is not None:
+            write_report(self.cli_args.profile_report, spans, time.perf_counter() - start_time)
+            print(f"Wrote profile report to {self.cli_args.profile_report}")
+        if self.cli_args.profile is not None:
+            print(write_profiles(spans, self.cli_args.profile_dir, top=self.cli_args.profile_top))
 
         # TODO: trial profiles that can be used/configured via config
         # TODO: gather gear changed events for player before each combat encounter and dynamically check who is using Z'ens to compute its uptime
@@ -0,0 +1,13 @@
+from .archive_loader import ArchiveLoader
+from .archive_reader import ArchiveReader
+from .archive_writer import ArchiveWriter
+from .conversion import convert_log
+from .format import ARCHIVE_SUFFIX
+
+__all__ = [
+    ArchiveLoader.__name__,
+    ArchiveReader.__name__,
+    ArchiveWriter.__name__,
+    convert_log.__name__,
+    "ARCHIVE_SUFFIX"
+]
@@ -0,0 +1,150 @@
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Union, Dict, Type, Iterable, List, Optional, Set, Tuple
+
+from .archive_reader import ArchiveReader
+from ..instrumentation import span
+from ..loading.event_filter import EventFilter
+from ..loading.time_window import TimeWindow
+from ..models import Base
+from ..models.data import EncounterLog
+from ..models.data.event_index import EventIndex
+from ..models.data.events import Event, ErrorEventStub, TargetEvent, AbilityInfo, EndLog
+from ..utils import tqdm, parse_epoch_time
+
+
+class ArchiveLoader(Base):
+
+    def __init__(self,
+                 file: Union[str, Path],
+                 multiple: bool = False,
+                 event_filter: EventFilter = None,
+                 projection: Dict[Type[TargetEvent], Iterable[str]] = None,
+                 window: TimeWindow = None):
+        """
+        Loads the encounter logs of an archive created by the ArchiveWriter. The events are created from the stored columns without parsing any csv
+        lines, and partitions of event types that are not loaded are not even decompressed.
+        @param file: The archive file.
+        @param multiple: If set to True, all logs of the archive are loaded. Otherwise, only the first log is loaded.
+        @param event_filter: If set, only the events passing the filter are loaded.
+        @param projection: If set, only the listed unit state attributes are loaded for events of the given types.
+        @param window: If set, only the events in this time window and the preamble events before it are loaded.
+        """
+        super().__init__()
+        self.file = Path(file).absolute()
+        assert self.file.exists() and self.file.is_file(), f"File {file} does not exist or is not a file!"
+        self.multiple = multiple
+        self.event_filter = event_filter
+        self.window = window
+        self.__preamble_event_types = {event_type.event_type for event_type in TimeWindow.PREAMBLE_EVENTS}
+        self.projection = None
+        if projection is not None:
+            self.projection = {event_type.event_type: event_type.projected_columns(attributes) for event_type, attributes in projection.items()}
+
+    def __create_event(self, line: int, encounter_log: EncounterLog, event_id: int, event_type: str, fields: Tuple[str, ...]) -> Event:
+        try:
+            return Event.create(line, encounter_log, event_id, event_type, *fields, projection=self.projection)
+        except ValueError as e:
+            return ErrorEventStub(line, encounter_log, event_id, e, [event_type, *fields])
+
+    def __resolve_ability_ids(self, reader: ArchiveReader, logs: List[dict]) -> Dict[str, Set[str]]:
+        """
+        Resolves the ability names of the event filter using the ability info events of the loaded logs.
+        """
+        ability_infos = []
+        for log in logs:
+            for partition in log["partitions"]:
+                if partition["event_type"] != AbilityInfo.event_type:
+                    continue
+                for block in partition["blocks"]:
+                    # Ability info events start with the ability id followed by its name
+                    ability_infos.extend(zip(reader.read_string_column(block["columns"][0]), reader.read_string_column(block["columns"][1])))
+        return self.event_filter.resolve_ability_ids(ability_infos)
+
+    def __accepted_rows(self, reader: ArchiveReader, partition: dict, block: dict, ability_ids: Dict[str, Set[str]]) -> Optional[List[int]]:
+        """
+        Applies the ability filter of the event filter to the events of a block, by reading only their ability id column.
+        @return: The rows of the block that are loaded or None, if all rows are loaded.
+        """
+        event_type = partition["event_type"]
+        if event_type not in ability_ids:
+            return None
+        column = self.event_filter.ability_id_columns[event_type]
+        if column >= partition["num_fields"]:
+            return []
+
+        ability_id_values = reader.read_string_column(block["columns"][column])
+        accepted_ids = ability_ids[event_type]
+        return [row for row, ability_id in enumerate(ability_id_values) if ability_id in accepted_ids]
+
+    def __window_event_ids(self, log_entry: dict) -> Optional[Tuple[int, int]]:
+        """
+        @return: The first and last event id of the log in the window or None, if the log does not overlap the window.
+        """
+        combats = [(combat["begin_event_id"], combat["end_event_id"]) for combat in log_entry["combats"]]
+        return self.window.event_ids(parse_epoch_time(log_entry["epoch_time"]), log_entry["event_id"], log_entry["end_event_id"], combats)
+
+    def __load_partition(self, reader: ArchiveReader, partition: dict, encounter_log: EncounterLog, store: List[Optional[Event]],
+                         ability_ids: Dict[str, Set[str]], event_ids_window: Optional[Tuple[int, int]]):
+        event_type = partition["event_type"]
+        for block in partition["blocks"]:
+            rows = self.__accepted_rows(reader, partition, block, ability_ids) if self.event_filter is not None else None
+            lines = reader.read_int_column(block["lines"])
+            event_ids = reader.read_int_column(block["event_ids"])
+            if event_ids_window is not None and event_type != EndLog.event_type:
+                first, last = event_ids_window
+                # Preamble events before the window define the state of the log at its beginning
+                is_preamble = event_type in self.__preamble_event_types
+                window_rows = [row for row, event_id in enumerate(event_ids) if first <= event_id <= last or (is_preamble and event_id < first)]
+                rows = window_rows if rows is None else sorted(set(rows).intersection(window_rows))
+            if rows is not None:
+                lines = [lines[row] for row in rows]
+                event_ids = [event_ids[row] for row in rows]
+            columns = [reader.read_string_column(column, rows) for column in block["columns"]]
+            # Events without fields (e.g., begin combat events) have no columns
+            rows_fields = zip(*columns) if columns else repeat(())
+
+            for line, event_id, fields in zip(lines, event_ids, rows_fields):
+                store[line] = self.__create_event(line, encounter_log, event_id, event_type, fields)
+
+    def _load_log(self) -> List[EncounterLog]:
+        with ArchiveReader(self.file) as reader:
+            log_entries = reader.logs
+            windows = [None] * len(log_entries)
+            if self.window is not None:
+                windows = [self.__window_event_ids(log_entry) for log_entry in log_entries]
+                log_entries = [log_entry for log_entry, window in zip(log_entries, windows) if window is not None]
+                windows = [window for window in windows if window is not None]
+            if not self.multiple:
+                log_entries, windows = log_entries[:1], windows[:1]
+            ability_ids = self.__resolve_ability_ids(reader, log_entries) if self.event_filter is not None else {}
+
+            # Contains the events of all logs in the archive at the index of their line
+            store: List[Optional[Event]] = [None] * (log_entries[-1]["end_line"] if log_entries else 0)
+            logs = []
+            for log_entry, window in tqdm(list(zip(log_entries, windows)), desc=f"Loading archive {self.file}"):
+                current_log = EncounterLog()
+                for partition in log_entry["partitions"]:
+                    if self.event_filter is None or self.event_filter.accepts_event_type(partition["event_type"]):
+                        self.__load_partition(reader, partition, current_log, store, ability_ids, window)
+
+                # The partitions are loaded one after another, so the events are indexed in the order of the log afterwards
+                begin, end = log_entry["begin_line"], log_entry["end_line"]
+                current_index = EventIndex()
+                current_index.extend(event for event in islice(store, begin, end) if event is not None)
+                current_log.assign_events(store, begin, end, current_index)
+                logs.append(current_log)
+        return logs
+
+    def parse_log(self) -> Union[EncounterLog, List[EncounterLog]]:
+        """
+        Loads the logs of the archive.
+        @return: A single or multiple encounter log objects, depending on the number of logs that are loaded.
+        """
+        with span("load", loader=self.__class__.__name__):
+            logs = self._load_log()
+        with span("initialize"):
+            for log in logs:
+                log.initialize()
+
+        return logs if self.multiple else logs[0]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import zlib
+from array import array
+from pathlib import Path
+from typing import Union, List, Sequence, BinaryIO
+
+from .columns import decode_int_column, decode_string_dictionary, decode_string_indices
+from .format import MAGIC, VERSION, TRAILER
+from ..models import Base
+
+
+class ArchiveReader(Base):
+
+    def __init__(self, file: Union[str, Path]):
+        """
+        Reads the index and the columns of an archive created by the ArchiveWriter.
+        @param file: The archive file.
+        """
+        super().__init__()
+        self.file = Path(file)
+        self.__file: BinaryIO = open(self.file, "rb")
+        try:
+            assert self.__file.read(len(MAGIC)) == MAGIC, f"{self.file} is not an archive"
+            self.__file.seek(-TRAILER.size, 2)
+            footer_size, magic = TRAILER.unpack(self.__file.read(TRAILER.size))
+            assert magic == MAGIC, f"Archive {self.file} is incomplete"
+            self.__file.seek(-TRAILER.size - footer_size, 2)
+            footer = json.loads(zlib.decompress(self.__file.read(footer_size)))
+            assert footer["version"] == VERSION, f"Archive {self.file} has version {footer['version']}, but only version {VERSION} is supported"
+        except Exception:
+            self.__file.close()
+            raise
+
+        self.num_lines: int = footer["num_lines"]
+        # Index of each log with the location of its partitions, its trials and its combats
+        self.logs: List[dict] = footer["logs"]
+
+    def __enter__(self) -> ArchiveReader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.__file.close()
+
+    def __read(self, location: List[int]) -> bytes:
+        offset, size = location
+        self.__file.seek(offset)
+        return self.__file.read(size)
+
+    def read_int_column(self, location: List[int]) -> List[int]:
+        return decode_int_column(self.__read(location))
+
+    def read_string_indices(self, column: dict) -> array:
+        """
+        Reads the dictionary indices of the values of a string column.
+        """
+        return decode_string_indices(self.__read(column["indices"]), column["typecode"])
+
+    def read_string_column(self, column: dict, rows: Sequence[int] = None) -> List[str]:
+        """
+        Reads the values of a string column.
+        @param column: Location of the column in a block of a partition.
+        @param rows: If set, only the values of these rows are returned.
+        """
+        dictionary = decode_string_dictionary(self.__read(column["dictionary"]))
+        indices = self.read_string_indices(column)
+        if rows is not None:
+            return [dictionary[indices[row]] for row in rows]
+        return [dictionary[index] for index in indices]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+from typing import Union, List, Dict, Tuple, BinaryIO
+
+from .columns import encode_int_column, encode_string_column
+from .format import MAGIC, VERSION, TRAILER
+from ..models import Base
+from ..models.data.events import BeginLog, EndLog, BeginCombat, EndCombat, BeginTrial, EndTrial, TrialInit
+
+
+class ArchiveWriter(Base):
+
+    def __init__(self, file: Union[str, Path], block_rows: int = 1 << 16):
+        """
+        Writes encounter logs into an archive. The events of each log are partitioned by their type and number of columns. The columns of each
+        partition are stored separately in compressed blocks, so that a loader only needs to decompress the columns of the events it loads.
+        A footer indexes the logs of the archive with their trials and combats, so that they can be listed without loading any events.
+        @param file: The archive file that is created.
+        @param block_rows: Maximum number of events of a partition that are stored in a single block.
+        """
+        super().__init__()
+        self.file = Path(file)
+        self.block_rows = block_rows
+        self.__file: BinaryIO = open(self.file, "wb")
+        self.__file.write(MAGIC)
+        self.__logs: List[dict] = []
+        self.num_lines = 0
+        self.__begin_log()
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __begin_log(self):
+        self.__log = {
+            "begin_line": self.num_lines,
+            "begin_offset": self.__file.tell(),
+            # Trials the log was recorded in, including trials that were entered after they began
+            "trial_ids": [],
+            "trials": [],
+            "combats": []
+        }
+        # Rows of each partition that were not written yet. Each partition has the line numbers, event ids and columns of its rows.
+        self.__partitions: Dict[Tuple[str, int], Tuple[List[int], List[int], List[List[str]]]] = {}
+        # Blocks of each partition that were written
+        self.__blocks: Dict[Tuple[str, int], List[dict]] = {}
+
+    def add_line(self, row: List[str]):
+        """
+        Adds the next line of the log file.
+        @param row: The columns of the line.
+        """
+        line = self.num_lines
+        self.num_lines += 1
+        if len(row) < 2:
+            # Empty lines are not loaded
+            return
+        try:
+            event_id = int(row[0])
+        except ValueError:
+            self.logger.error(f"Skipping line {line} with invalid event id: {row}")
+            return
+        event_type, fields = row[1], row[2:]
+
+        key = (event_type, len(fields))
+        if key not in self.__partitions:
+            self.__partitions[key] = ([], [], [[] for _ in fields])
+        lines, event_ids, columns = self.__partitions[key]
+        lines.append(line)
+        event_ids.append(event_id)
+        for column, value in zip(columns, fields):
+            column.append(value)
+        if len(lines) >= self.block_rows:
+            self.__write_block(key)
+
+        self.__index_line(line, event_id, event_type, fields)
+
+    def __index_line(self, line: int, event_id: int, event_type: str, fields: List[str]):
+        """
+        Adds the structure of the log (i.e., its trials and combats) to the index in the footer.
+        """
+        log = self.__log
+        if event_type in [BeginTrial.event_type, TrialInit.event_type] and int(fields[0]) not in log["trial_ids"]:
+            log["trial_ids"].append(int(fields[0]))
+
+        if event_type == BeginLog.event_type:
+            log.update(epoch_time=int(fields[0]), event_id=event_id, server=fields[2])
+        elif event_type == BeginTrial.event_type:
+            log["trials"].append({"trial_id": int(fields[0]), "begin_line": line, "end_line": None, "success": None})
+        elif event_type == EndTrial.event_type:
+            for trial in reversed(log["trials"]):
+                if trial["trial_id"] == int(fields[0]) and trial["end_line"] is None:
+                    trial.update(end_line=line, success=fields[2] == "T")
+                    break
+        elif event_type == BeginCombat.event_type:
+            log["combats"].append({"begin_line": line, "begin_event_id": event_id, "end_line": None, "end_event_id": None})
+        elif event_type == EndCombat.event_type and log["combats"]:
+            log["combats"][-1].update(end_line=line, end_event_id=event_id)
+        elif event_type == EndLog.event_type:
+            log["end_event_id"] = event_id
+            self.__end_log()
+
+    def __write_data(self, data: bytes) -> List[int]:
+        """
+        @return: Offset and size of the data in the archive.
+        """
+        offset = self.__file.tell()
+        self.__file.write(data)
+        return [offset, len(data)]
+
+    def __write_block(self, key: Tuple[str, int]):
+        lines, event_ids, columns = self.__partitions.pop(key)
+        block = {
+            "rows": len(lines),
+            "lines": self.__write_data(encode_int_column(lines)),
+            "event_ids": self.__write_data(encode_int_column(event_ids)),
+            "columns": []
+        }
+        for column in columns:
+            dictionary, indices, typecode = encode_string_column(column)
+            block["columns"].append({"dictionary": self.__write_data(dictionary), "indices": self.__write_data(indices), "typecode": typecode})
+        self.__blocks.setdefault(key, []).append(block)
+
+    def __end_log(self):
+        for key in list(self.__partitions.keys()):
+            self.__write_block(key)
+        self.__log["end_line"] = self.num_lines
+        self.__log["size"] = self.__file.tell() - self.__log.pop("begin_offset")
+        self.__log["partitions"] = [{"event_type": event_type, "num_fields": num_fields, "blocks": blocks}
+                                    for (event_type, num_fields), blocks in self.__blocks.items()]
+        self.__logs.append(self.__log)
+        self.__begin_log()
+
+    def close(self):
+        """
+        Writes the footer and closes the archive. Lines after the last end log event are not written, since they belong to an incomplete log.
+        """
+        if self.__file is None:
+            return
+        num_incomplete_lines = self.num_lines - self.__log["begin_line"]
+        if num_incomplete_lines > 0:
+            self.logger.warning(f"Discarding {num_incomplete_lines} lines of an incomplete log at the end of {self.file}")
+
+        footer = zlib.compress(json.dumps({"version": VERSION, "num_lines": self.__log["begin_line"], "logs": self.__logs}).encode("utf-8"))
+        self.__file.write(footer)
+        self.__file.write(TRAILER.pack(len(footer), MAGIC))
+        self.__file.close()
+        self.__file = None
+
+    @property
+    def logs(self) -> List[dict]:
+        """
+        Index entries of the logs that were written.
+        """
+        return self.__logs
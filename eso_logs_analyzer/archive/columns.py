@@ -0,0 +1,48 @@
+import zlib
+from array import array
+from itertools import accumulate
+from typing import List, Sequence, Tuple
+
+# Separates the values in the dictionary of a string column. Log lines never contain it.
+__SEPARATOR: str = "\x00"
+__COMPRESSION_LEVEL: int = 6
+
+
+def encode_int_column(values: Sequence[int]) -> bytes:
+    """
+    Encodes a column of integers as the differences between consecutive values, which are small for line numbers and event ids.
+    """
+    deltas = array("q", [value - previous for previous, value in zip([0] + list(values[:-1]), values)])
+    return zlib.compress(deltas.tobytes(), __COMPRESSION_LEVEL)
+
+
+def decode_int_column(data: bytes) -> List[int]:
+    deltas = array("q")
+    deltas.frombytes(zlib.decompress(data))
+    return list(accumulate(deltas))
+
+
+def encode_string_column(values: Sequence[str]) -> Tuple[bytes, bytes, str]:
+    """
+    Encodes a column of strings using a dictionary of its distinct values. Most columns of a log only contain few distinct values (e.g., unit ids,
+    ability ids and enum values), so each value is stored as the smallest possible index into the dictionary.
+    @return: The compressed dictionary, the compressed indices and the type code of the indices.
+    """
+    dictionary = {}
+    indices = [dictionary.setdefault(value, len(dictionary)) for value in values]
+    assert not any([__SEPARATOR in value for value in dictionary]), "Column values must not contain the separator"
+    dictionary_data = __SEPARATOR.join(dictionary.keys())
+    typecode = "B" if len(dictionary) <= 0xFF else "H" if len(dictionary) <= 0xFFFF else "I"
+    return (zlib.compress(dictionary_data.encode("utf-8"), __COMPRESSION_LEVEL),
+            zlib.compress(array(typecode, indices).tobytes(), __COMPRESSION_LEVEL),
+            typecode)
+
+
+def decode_string_dictionary(data: bytes) -> List[str]:
+    return zlib.decompress(data).decode("utf-8").split(__SEPARATOR)
+
+
+def decode_string_indices(data: bytes, typecode: str) -> array:
+    indices = array(typecode)
+    indices.frombytes(zlib.decompress(data))
+    return indices
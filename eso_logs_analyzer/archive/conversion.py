@@ -0,0 +1,25 @@
+from pathlib import Path
+from typing import Union
+
+from .archive_writer import ArchiveWriter
+from ..loading.compression import get_log_size
+from ..loading.utils import read_csv
+from ..progress import progress_bar
+
+
+def convert_log(source: Union[str, Path], target: Union[str, Path], block_rows: int = 1 << 16) -> ArchiveWriter:
+    """
+    Converts a log file into an archive.
+    @param source: The log file. May be compressed.
+    @param target: The archive file that is created.
+    @param block_rows: Maximum number of events of a type that are stored in a single block.
+    @return: The writer of the archive, which contains the index of the archived logs.
+    """
+    # Progress is tracked by the bytes read from the log instead of counting its lines in advance
+    progress = progress_bar(f"Converting {source}", total=get_log_size(source))
+    with ArchiveWriter(target, block_rows=block_rows) as writer:
+        for row in read_csv(str(source), has_header=False, progress=progress):
+            writer.add_line(row)
+    if progress is not None:
+        progress.close()
+    return writer
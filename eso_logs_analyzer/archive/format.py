@@ -0,0 +1,10 @@
+import struct
+
+# Suffix of archive files
+ARCHIVE_SUFFIX: str = ".esoarc"
+# Identifies archive files. Written at the beginning and the end of the file.
+MAGIC: bytes = b"ESOLOGS\x01"
+# Increase when the layout of the archive changes
+VERSION: int = 2
+# The archive ends with the size of the compressed footer followed by the magic bytes
+TRAILER: struct.Struct = struct.Struct("<Q8s")
@@ -0,0 +1,11 @@
+from .catalog_entry import CatalogEntry
+from .log_catalog import LogCatalog, format_catalog, parse_trial_id
+from .scanning import scan_log
+
+__all__ = [
+    CatalogEntry.__name__,
+    LogCatalog.__name__,
+    format_catalog.__name__,
+    parse_trial_id.__name__,
+    scan_log.__name__
+]
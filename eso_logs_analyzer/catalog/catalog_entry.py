@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+
+
+class CatalogEntry:
+    def __init__(self, file: str, index: int, begin_time: datetime, end_time: Optional[datetime], server: str, trial_ids: List[str], size: int):
+        """
+        Describes a single encounter log in a log file without loading its events.
+        @param file: Path of the log file.
+        @param index: Index of the log in the file.
+        @param begin_time: Time at which the log started.
+        @param end_time: Time at which the log ended or None, if the log is incomplete (e.g., it is still being written).
+        @param server: Server on which the log was recorded.
+        @param trial_ids: Ids of the trials the log was recorded in.
+        @param size: Number of bytes of the log in the file.
+        """
+        self.file = file
+        self.index = index
+        self.begin_time = begin_time
+        self.end_time = end_time
+        self.server = server
+        self.trial_ids = trial_ids
+        self.size = size
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(file={self.file}, index={self.index}, begin_time={self.begin_time}, end_time={self.end_time})"
+
+    __repr__ = __str__
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        return self.end_time - self.begin_time if self.end_time is not None else None
+
+    def matches(self, trial_ids: Set[str] = None, since: datetime = None, until: datetime = None) -> bool:
+        """
+        Checks if the log was recorded in one of the trials and overlaps the time window.
+        @param trial_ids: If set, the log has to contain one of these trials.
+        @param since: If set, the log has to end after this time.
+        @param until: If set, the log has to begin before this time.
+        """
+        if trial_ids is not None and not trial_ids.intersection(self.trial_ids):
+            return False
+        # Only complete logs can be loaded in a time window, since the regions of the window are located by the end log events
+        if (since is not None or until is not None) and self.end_time is None:
+            return False
+        if since is not None and self.end_time < since:
+            return False
+        if until is not None and self.begin_time > until:
+            return False
+        return True
+
+    def to_dict(self) -> dict:
+        return {
+            "file": self.file,
+            "index": self.index,
+            "begin_time": self.begin_time.isoformat(),
+            "end_time": self.end_time.isoformat() if self.end_time is not None else None,
+            "server": self.server,
+            "trial_ids": self.trial_ids,
+            "size": self.size
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CatalogEntry:
+        return cls(file=data["file"],
+                   index=data["index"],
+                   begin_time=datetime.fromisoformat(data["begin_time"]),
+                   end_time=datetime.fromisoformat(data["end_time"]) if data["end_time"] is not None else None,
+                   server=data["server"],
+                   trial_ids=data["trial_ids"],
+                   size=data["size"])
@@ -0,0 +1,114 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Union, List, Dict, Iterable, Set
+
+from .catalog_entry import CatalogEntry
+from .scanning import scan_log
+from ..models import Base
+from ..models.data.events.enums import TrialId
+
+
+class LogCatalog(Base):
+    __CATALOG_FILE: str = "catalog.json"
+    # Has to be increased whenever the scanned information changes, so that outdated catalogs are scanned again
+    __VERSION: int = 1
+
+    def __init__(self, cache_path: Union[str, Path] = None):
+        """
+        Lists the logs contained in log files by only reading their begin log, end log and trial lines. The entries of each file are stored in the
+        cache directory (if set), so that only new or changed files are scanned again. A file is considered changed if its size or modification
+        time changed.
+        @param cache_path: Directory in which the catalog is stored.
+        """
+        super().__init__()
+        self.catalog_path = Path(cache_path) / self.__CATALOG_FILE if cache_path is not None else None
+        # Scanned files with their size, modification time and entries by absolute path
+        self.__files: Dict[str, dict] = self.__read()
+
+    def __read(self) -> Dict[str, dict]:
+        if self.catalog_path is None or not self.catalog_path.exists():
+            return {}
+        try:
+            with open(self.catalog_path, "r", encoding="utf-8") as catalog_file:
+                data = json.load(catalog_file)
+            if data["version"] != self.__VERSION:
+                return {}
+            return data["files"]
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring invalid log catalog {self.catalog_path}: {e}")
+            return {}
+
+    def __write(self):
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first to never leave an incomplete catalog behind
+        temp_path = self.catalog_path.with_name(f".{self.catalog_path.name}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as temp_file:
+            json.dump({"version": self.__VERSION, "files": self.__files}, temp_file)
+        os.replace(temp_path, self.catalog_path)
+
+    def scan(self, files: Iterable[Union[str, Path]]) -> List[CatalogEntry]:
+        """
+        Lists the logs of the files. Only files that were not scanned before or that changed since are read.
+        @param files: The log files. May be compressed or archives.
+        @return: The entries of all logs in the order of the files.
+        """
+        entries = []
+        changed = False
+        for file in files:
+            path = str(Path(file).absolute())
+            stat = os.stat(file)
+            cached = self.__files.get(path)
+            if cached is not None and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime_ns:
+                entries.extend([CatalogEntry.from_dict(entry) for entry in cached["entries"]])
+                continue
+
+            self.logger.info(f"Scanning log file {file}")
+            file_entries = scan_log(file)
+            self.__files[path] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "entries": [entry.to_dict() for entry in file_entries]}
+            entries.extend(file_entries)
+            changed = True
+
+        if changed and self.catalog_path is not None:
+            self.__write()
+        return entries
+
+    @staticmethod
+    def select(entries: Iterable[CatalogEntry], trial_ids: Set[str] = None, since: datetime = None, until: datetime = None) -> List[CatalogEntry]:
+        """
+        Selects the entries of the logs that were recorded in one of the trials and overlap the time window.
+        """
+        return [entry for entry in entries if entry.matches(trial_ids, since, until)]
+
+
+def parse_trial_id(trial: str) -> str:
+    """
+    Parses a trial given by its name (e.g., "rockgrove") or by its id (e.g., "15").
+    @return: The id of the trial.
+    """
+    if trial.upper() in TrialId.__members__:
+        return TrialId[trial.upper()].value
+    return TrialId(trial).value
+
+
+def format_catalog(entries: List[CatalogEntry]) -> str:
+    """
+    Formats the entries as a table with a row per log.
+    """
+    def trial_name(trial_id: str) -> str:
+        try:
+            return TrialId(trial_id).name.lower()
+        except ValueError:
+            return trial_id
+
+    header = ["File", "Log", "Begin", "Duration", "Server", "Trials", "Size (MB)"]
+    rows = [[Path(entry.file).name,
+             str(entry.index),
+             entry.begin_time.strftime("%Y-%m-%d %H:%M:%S"),
+             str(entry.duration).split(".")[0] if entry.duration is not None else "incomplete",
+             entry.server,
+             ", ".join([trial_name(trial_id) for trial_id in entry.trial_ids]) or "-",
+             f"{entry.size / (1 << 20):.1f}"] for entry in entries]
+    widths = [max([len(row[column]) for row in [header] + rows]) for column in range(len(header))]
+    return "\n".join(["  ".join([value.ljust(width) for value, width in zip(row, widths)]).rstrip() for row in [header] + rows])
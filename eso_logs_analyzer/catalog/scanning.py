@@ -0,0 +1,78 @@
+import csv
+from datetime import timedelta
+from pathlib import Path
+from typing import Union, List
+
+from .catalog_entry import CatalogEntry
+from ..archive import ArchiveReader, ARCHIVE_SUFFIX
+from ..loading.utils import find_event_lines
+from ..models.data.events import BeginLog, EndLog, BeginTrial, TrialInit
+from ..utils import parse_epoch_time
+
+# Event types that describe which logs and trials a file contains
+__MARKERS: List[str] = [BeginLog.event_type, EndLog.event_type, BeginTrial.event_type, TrialInit.event_type]
+
+
+def scan_log(file: Union[str, Path]) -> List[CatalogEntry]:
+    """
+    Describes the logs in a log file without loading their events.
+    @param file: The log file. May be compressed or an archive.
+    @return: An entry for each log in the file.
+    """
+    if Path(file).suffix == ARCHIVE_SUFFIX:
+        return __scan_archive(file)
+    return __scan_text_log(file)
+
+
+def __scan_archive(file: Union[str, Path]) -> List[CatalogEntry]:
+    """
+    Reads the log index in the footer of an archive.
+    """
+    entries = []
+    with ArchiveReader(file) as reader:
+        for index, log in enumerate(reader.logs):
+            begin_time = parse_epoch_time(log["epoch_time"])
+            entries.append(CatalogEntry(file=str(file),
+                                        index=index,
+                                        begin_time=begin_time,
+                                        end_time=begin_time + timedelta(milliseconds=log["end_event_id"] - log["event_id"]),
+                                        server=log["server"],
+                                        trial_ids=[str(trial_id) for trial_id in dict.fromkeys(log["trial_ids"])],
+                                        size=log["size"]))
+    return entries
+
+
+def __scan_text_log(file: Union[str, Path]) -> List[CatalogEntry]:
+    marker_lines, file_size = find_event_lines(file, __MARKERS)
+    entries = []
+    current = None
+    for line_begin, line_end, line in marker_lines:
+        columns = next(csv.reader([line]))
+        event_id, event_type, fields = int(columns[0]), columns[1], columns[2:]
+        if event_type == BeginLog.event_type:
+            if len(fields) < 3:
+                # Invalid lines are not loaded either
+                continue
+            if current is not None:
+                entries.append(__entry(file, len(entries), current, None, line_begin))
+            # Begin log lines have the format "<event id>,BEGIN_LOG,<epoch time>,<log version>,<server>,..."
+            current = {"begin_offset": line_begin, "event_id": event_id, "begin_time": parse_epoch_time(fields[0]), "server": fields[2], "trial_ids": []}
+        elif current is None:
+            # Lines before the first log
+            continue
+        elif event_type in [BeginTrial.event_type, TrialInit.event_type]:
+            if fields and fields[0] not in current["trial_ids"]:
+                current["trial_ids"].append(fields[0])
+        elif event_type == EndLog.event_type:
+            entries.append(__entry(file, len(entries), current, current["begin_time"] + timedelta(milliseconds=event_id - current["event_id"]), line_end))
+            current = None
+
+    if current is not None:
+        # The last log is still being written
+        entries.append(__entry(file, len(entries), current, None, file_size))
+    return entries
+
+
+def __entry(file: Union[str, Path], index: int, log: dict, end_time, end_offset: int) -> CatalogEntry:
+    return CatalogEntry(file=str(file), index=index, begin_time=log["begin_time"], end_time=end_time, server=log["server"], trial_ids=log["trial_ids"],
+                        size=end_offset - log["begin_offset"])
@@ -0,0 +1,5 @@
+from .log_generator import LogGenerator
+
+__all__ = [
+    LogGenerator.__name__
+]
@@ -0,0 +1,210 @@
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Union, List, Tuple
+
+from ..analysis.analysis import DEBUFFS
+from ..models.data.events.enums import TrialId, ClassId, RaceId
+from ..trials import Rockgrove
+
+
+class LogGenerator:
+    # Ids of the abilities the players use. The debuffs get the ids after them.
+    __PLAYER_ABILITIES: List[Tuple[int, str]] = [(16688, "Light Attack"), (16691, "Heavy Attack"), (38745, "Elemental Weapon"),
+                                                  (61919, "Merciless Resolve"), (40317, "Ritual of Retribution"), (22269, "Radiant Oppression")]
+    __HEAL_ABILITY: Tuple[int, str] = (40079, "Radiating Regeneration")
+    __DEBUFF_ID_OFFSET: int = 100000
+    # Adds that are spawned with each boss
+    __ADD_NAME: str = "Havocrel Annihilator"
+    # Only the bosses that are supported by the analysis are pulled
+    __BOSS_NAMES: List[str] = [boss.value for boss in Rockgrove]
+    __BOSS_HEALTH: int = 10000000
+    __ADD_HEALTH: int = 1000000
+    # Share of each kind of line in a pull
+    __DAMAGE_SHARE: float = 0.4
+    __EFFECT_SHARE: float = 0.25
+    __CAST_SHARE: float = 0.1
+    __REGEN_SHARE: float = 0.15
+
+    def __init__(self,
+                 seed: int = 0,
+                 num_logs: int = 1,
+                 num_pulls: int = 10,
+                 events_per_pull: int = 5000,
+                 group_size: int = 12,
+                 num_adds: int = 2,
+                 wipe_rate: float = 0.3,
+                 begin_time: datetime = datetime(2023, 6, 1, 20, 0)):
+        """
+        Generates syntactically valid encounterlogs of Rockgrove raids. The generated lines are only determined by the parameters, so the same
+        seed always produces the same file.
+        @param seed: Seed of the random number generator.
+        @param num_logs: Number of logs in the file. Each log is recorded one day after the previous one.
+        @param num_pulls: Number of boss pulls in each log.
+        @param events_per_pull: Number of combat lines in each pull.
+        @param group_size: Number of players in the group.
+        @param num_adds: Number of hostile units that are spawned with each boss.
+        @param wipe_rate: Share of the pulls in which the group dies before the boss is killed.
+        @param begin_time: Time at which the first log begins.
+        """
+        assert num_logs >= 1 and num_pulls >= 1 and events_per_pull >= 1 and group_size >= 1, "The generated logs need at least one log, pull, event and player"
+        self.seed = seed
+        self.num_logs = num_logs
+        self.num_pulls = num_pulls
+        self.events_per_pull = events_per_pull
+        self.group_size = group_size
+        self.num_adds = num_adds
+        self.wipe_rate = wipe_rate
+        self.begin_time = begin_time
+        self.debuffs = [(self.__DEBUFF_ID_OFFSET + index, name) for index, name in enumerate(DEBUFFS)]
+
+    def __str__(self):
+        return (f"{self.__class__.__name__}(seed={self.seed}, num_logs={self.num_logs}, num_pulls={self.num_pulls}, "
+                f"events_per_pull={self.events_per_pull}, group_size={self.group_size})")
+
+    __repr__ = __str__
+
+    @classmethod
+    def events_per_pull_for_size(cls, num_lines: int, num_logs: int, num_pulls: int) -> int:
+        """
+        Computes the number of combat lines of each pull, so that a file has approximately the given number of lines.
+        """
+        # Casts consist of two lines
+        lines_per_event = 1 + cls.__CAST_SHARE
+        return max(int(num_lines / (num_logs * num_pulls) / lines_per_event), 1)
+
+    def write(self, file: Union[str, Path]) -> int:
+        """
+        Writes the generated logs into a file.
+        @return: The number of written lines.
+        """
+        num_lines = 0
+        with open(file, "w", encoding="utf-8", newline="") as log_file:
+            for line in self.lines():
+                log_file.write(line)
+                num_lines += 1
+        return num_lines
+
+    def lines(self) -> Iterator[str]:
+        """
+        @return: The lines of all logs including their line breaks.
+        """
+        rng = random.Random(self.seed)
+        for index in range(self.num_logs):
+            yield from self.__log_lines(rng, self.begin_time + timedelta(days=index))
+
+    @staticmethod
+    def __unit_state(health: int, max_health: int, rng: random.Random) -> str:
+        """
+        Formats the state of a unit: health, magicka, stamina, ultimate, werewolf ultimate, shield and position.
+        """
+        return f"{health}/{max_health},30000/30000,30000/30000,{rng.randint(0, 500)}/500,0/1000,0,{rng.random():.4f},{rng.random():.4f},{rng.random() * 6.28:.4f}"
+
+    def __log_lines(self, rng: random.Random, begin_time: datetime) -> Iterator[str]:
+        event_id = 0
+        epoch_time = int(begin_time.timestamp() * 1000)
+        trial_id = TrialId.ROCKGROVE.value
+        players = list(range(1, self.group_size + 1))
+        classes = [class_id.value for class_id in ClassId if class_id != ClassId.INVALID]
+        races = [race_id.value for race_id in RaceId if race_id != RaceId.INVALID]
+        abilities = self.__PLAYER_ABILITIES + [self.__HEAL_ABILITY]
+
+        yield f'{event_id},BEGIN_LOG,{epoch_time},15,"EU Megaserver","en","eso.live.9.0.5"\n'
+        yield f'{event_id},ZONE_CHANGED,1263,"Rockgrove","VETERAN"\n'
+        yield f'{event_id},MAP_CHANGED,1809,"Rockgrove","Art/maps/reapersmarch/rockgrove_base.dds"\n'
+        for player in players:
+            is_local_player = "T" if player == 1 else "F"
+            yield (f'{event_id},UNIT_ADDED,{player},PLAYER,{is_local_player},{player},0,F,{rng.choice(classes)},{rng.choice(races)},'
+                   f'"Player {player}","@account{player}",{1000 + player},50,{rng.randint(160, 3600)},0,PLAYER_ALLY,T\n')
+        for ability_id, name in abilities + self.debuffs:
+            yield f'{event_id},ABILITY_INFO,{ability_id},"{name}","/esoui/art/icons/ability_{ability_id}.dds",F,T\n'
+        for ability_id, _ in self.debuffs:
+            yield f"{event_id},EFFECT_INFO,{ability_id},DEBUFF,NONE,NEVER\n"
+        yield f"{event_id},TRIAL_INIT,{trial_id},F,F,0,0,F,0\n"
+        yield f"{event_id},BEGIN_TRIAL,{trial_id},{epoch_time}\n"
+
+        unit_id = self.group_size
+        cast_effect_id = 0
+        for pull in range(self.num_pulls):
+            # The group walks to the next boss
+            event_id += rng.randint(30000, 120000)
+            boss_name = self.__BOSS_NAMES[pull % len(self.__BOSS_NAMES)]
+            unit_id += 1
+            boss = unit_id
+            yield f'{event_id},UNIT_ADDED,{boss},MONSTER,F,0,{90000 + pull % len(self.__BOSS_NAMES)},T,0,0,"{boss_name}","",0,50,0,0,HOSTILE,F\n'
+            adds = []
+            for _ in range(self.num_adds):
+                unit_id += 1
+                adds.append(unit_id)
+                yield f'{event_id},UNIT_ADDED,{unit_id},MONSTER,F,0,90100,F,0,0,"{self.__ADD_NAME}","",0,50,0,0,HOSTILE,F\n'
+
+            event_id += rng.randint(100, 1000)
+            for player in players:
+                bar = ",".join([str(ability_id) for ability_id, _ in rng.sample(self.__PLAYER_ABILITIES, 3)])
+                yield f"{event_id},PLAYER_INFO,{player},[{bar}],[1,1,1],[[HEAD,94779,T,16,ARMOR_DIVINES,5,{rng.randint(1, 600)},INVALID,F,0,0]],[{bar}],[{bar}]\n"
+            yield f"{event_id},BEGIN_COMBAT\n"
+
+            # Units that die in the pull
+            health = {boss: self.__BOSS_HEALTH, **{add: self.__ADD_HEALTH for add in adds}}
+            max_health = dict(health)
+            is_wipe = rng.random() < self.wipe_rate
+            active_debuffs = set()
+            damage_per_hit = int(self.__BOSS_HEALTH / (self.events_per_pull * self.__DAMAGE_SHARE) * (0.5 if is_wipe else 1.2)) + 1
+            for _ in range(self.events_per_pull):
+                event_id += rng.randint(0, 40)
+                player = rng.choice(players)
+                player_state = self.__unit_state(30000, 30000, rng)
+                kind = rng.random()
+                cast_effect_id += 1
+                if kind < self.__DAMAGE_SHARE:
+                    alive_targets = [unit for unit, unit_health in health.items() if unit_health > 0]
+                    if not alive_targets:
+                        continue
+                    target = boss if boss in alive_targets and rng.random() < 0.8 else rng.choice(alive_targets)
+                    damage = min(health[target], rng.randint(damage_per_hit // 2, damage_per_hit * 3 // 2))
+                    health[target] -= damage
+                    ability_id = rng.choice(self.__PLAYER_ABILITIES)[0]
+                    yield (f"{event_id},COMBAT_EVENT,DAMAGE,PHYSICAL,0,{damage},0,{cast_effect_id},{ability_id},{player},{player_state},{target},"
+                           f"{self.__unit_state(health[target], max_health[target], rng)}\n")
+                elif kind < self.__DAMAGE_SHARE + self.__EFFECT_SHARE:
+                    ability_id = rng.choice(self.debuffs)[0]
+                    target = boss if rng.random() < 0.8 else rng.choice(adds or [boss])
+                    key = (ability_id, target, player)
+                    # Debuffs fade before they are applied again by the same player
+                    status = "FADED" if key in active_debuffs else "GAINED"
+                    if status == "FADED":
+                        active_debuffs.remove(key)
+                    else:
+                        active_debuffs.add(key)
+                    yield (f"{event_id},EFFECT_CHANGED,{status},1,{cast_effect_id},{ability_id},{player},{player_state},{target},"
+                           f"{self.__unit_state(health[target], max_health[target], rng)}\n")
+                elif kind < self.__DAMAGE_SHARE + self.__EFFECT_SHARE + self.__CAST_SHARE:
+                    ability_id = rng.choice(self.__PLAYER_ABILITIES)[0]
+                    yield f"{event_id},BEGIN_CAST,0,F,{cast_effect_id},{ability_id},{player},{player_state},*\n"
+                    yield f"{event_id},END_CAST,COMPLETED,{cast_effect_id},{ability_id}\n"
+                elif kind < self.__DAMAGE_SHARE + self.__EFFECT_SHARE + self.__CAST_SHARE + self.__REGEN_SHARE:
+                    yield f"{event_id},HEALTH_REGEN,{rng.randint(100, 1000)},{player},{player_state}\n"
+                else:
+                    target = rng.choice(players)
+                    yield (f"{event_id},COMBAT_EVENT,HEAL,MAGIC,1,{rng.randint(1000, 10000)},0,{cast_effect_id},{self.__HEAL_ABILITY[0]},{player},"
+                           f"{player_state},{target},{self.__unit_state(30000, 30000, rng)}\n")
+
+            if not is_wipe:
+                # The last hits kill the remaining units
+                for unit, unit_health in health.items():
+                    if unit_health > 0:
+                        event_id += rng.randint(0, 40)
+                        yield (f"{event_id},COMBAT_EVENT,DAMAGE,PHYSICAL,0,{unit_health},0,{cast_effect_id},{self.__PLAYER_ABILITIES[0][0]},1,"
+                               f"{self.__unit_state(30000, 30000, rng)},{unit},{self.__unit_state(0, max_health[unit], rng)}\n")
+            for ability_id, target, player in sorted(active_debuffs):
+                yield (f"{event_id},EFFECT_CHANGED,FADED,1,{cast_effect_id},{ability_id},{player},{self.__unit_state(30000, 30000, rng)},{target},"
+                       f"{self.__unit_state(health[target], max_health[target], rng)}\n")
+            event_id += rng.randint(500, 2000)
+            yield f"{event_id},END_COMBAT\n"
+            event_id += rng.randint(1000, 5000)
+            for unit in [boss] + adds:
+                yield f"{event_id},UNIT_REMOVED,{unit}\n"
+
+        event_id += rng.randint(1000, 10000)
+        yield f"{event_id},END_TRIAL,{trial_id},{event_id},T,{rng.randint(50000, 150000)},36\n"
+        yield f"{event_id},END_LOG\n"
@@ -0,0 +1,23 @@
+from .instrumentation import enable_instrumentation, is_instrumentation_enabled, span, current_span, collect_spans, add_spans, call_with_spans, \
+    init_worker
+from .profiling import enable_profiling, is_profiling_enabled, merge_profiles, write_profiles
+from .report import write_report, build_report
+from .span import Span
+
+__all__ = [
+    Span.__name__,
+    enable_instrumentation.__name__,
+    is_instrumentation_enabled.__name__,
+    span.__name__,
+    current_span.__name__,
+    collect_spans.__name__,
+    add_spans.__name__,
+    call_with_spans.__name__,
+    init_worker.__name__,
+    enable_profiling.__name__,
+    is_profiling_enabled.__name__,
+    merge_profiles.__name__,
+    write_profiles.__name__,
+    write_report.__name__,
+    build_report.__name__
+]
@@ -0,0 +1,130 @@
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional, List, Iterator, Callable, Any, Tuple
+
+from .profiling import start_profile, stop_profile, reset_profile
+from .span import Span
+
+__ENABLED = False
+__TRACE_MEMORY = False
+__LOCK = threading.Lock()
+# Finished spans that were not collected yet
+__SPANS: List[Span] = []
+# Spans of all threads that are open, whose memory peaks are updated
+__OPEN_SPANS: List[Span] = []
+# Stack of the open spans of each thread
+__THREAD_STATE = threading.local()
+
+
+def enable_instrumentation(trace_memory: bool = False):
+    """
+    Starts recording spans. Has to be called before any worker processes are created, since they inherit the setting.
+    @param trace_memory: If set, the peak of the memory allocated by Python is recorded for each span using tracemalloc. Slows down the analysis
+           considerably.
+    """
+    global __ENABLED, __TRACE_MEMORY
+    __ENABLED = True
+    __TRACE_MEMORY = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def is_instrumentation_enabled() -> bool:
+    return __ENABLED
+
+
+def __stack() -> List[Span]:
+    if not hasattr(__THREAD_STATE, "stack"):
+        __THREAD_STATE.stack = []
+    return __THREAD_STATE.stack
+
+
+def __update_peak_memory():
+    """
+    Passes the memory peak since the last update to all open spans. The peak is reset afterwards, so that spans that are opened later don't
+    receive peaks that happened before.
+    """
+    _, peak_memory = tracemalloc.get_traced_memory()
+    for open_span in __OPEN_SPANS:
+        open_span.update_peak_memory(peak_memory)
+    tracemalloc.reset_peak()
+
+
+def current_span() -> Optional[Span]:
+    """
+    @return: The innermost open span of the current thread.
+    """
+    stack = __stack()
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def span(name: str, parent: Span = None, **attributes) -> Iterator[Span]:
+    """
+    Measures the step of the analysis that is executed in the context. The span is only recorded if instrumentation is enabled.
+    @param name: Name of the step.
+    @param parent: The span of the step this step is part of. Defaults to the innermost open span of the current thread. Has to be passed
+           explicitly to spans of other threads.
+    @param attributes: Describe what is processed in this step.
+    @return: The span, which can be used to count the processed events.
+    """
+    stack = __stack()
+    new_span = Span(name, parent=parent if parent is not None else current_span(), **attributes)
+    if not __ENABLED:
+        yield new_span
+        return
+
+    if __TRACE_MEMORY:
+        with __LOCK:
+            __update_peak_memory()
+            __OPEN_SPANS.append(new_span)
+    stack.append(new_span)
+    start_profile(new_span)
+    try:
+        yield new_span
+    finally:
+        stop_profile(new_span)
+        stack.pop()
+        new_span.finish()
+        with __LOCK:
+            if __TRACE_MEMORY:
+                __update_peak_memory()
+                __OPEN_SPANS.remove(new_span)
+            __SPANS.append(new_span)
+
+
+def collect_spans() -> List[Span]:
+    """
+    @return: The spans that were finished since the spans were collected last.
+    """
+    global __SPANS
+    with __LOCK:
+        spans, __SPANS = __SPANS, []
+    return spans
+
+
+def add_spans(spans: List[Span]):
+    """
+    Adds the spans that were recorded in another process.
+    """
+    with __LOCK:
+        __SPANS.extend(spans)
+
+
+def init_worker():
+    """
+    Discards the state a forked worker process inherited from its parent process: the spans the parent had not collected and its profiler.
+    """
+    collect_spans()
+    reset_profile()
+
+
+def call_with_spans(function: Callable, *args, **kwargs) -> Tuple[Any, List[Span]]:
+    """
+    Calls a function in a worker process and returns the spans it recorded together with its result, so that they can be added to the spans of the
+    parent process.
+    """
+    init_worker()
+    result = function(*args, **kwargs)
+    return result, collect_spans()
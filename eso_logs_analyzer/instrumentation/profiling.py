@@ -0,0 +1,130 @@
+import cProfile
+import io
+import pstats
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Set, Optional, List, Dict, Union, Iterable
+
+from .span import Span
+
+# Steps whose spans are profiled
+__PROFILED_STAGES: Set[str] = set()
+# The profiler of each thread. Only a single profiler can be active in a thread.
+__THREAD_STATE = threading.local()
+
+
+def enable_profiling(stages: Iterable[str]):
+    """
+    Profiles the steps with the given span names using cProfile. The steps below them are included in their profile, even if they are executed in
+    worker processes or threads.
+    """
+    global __PROFILED_STAGES
+    __PROFILED_STAGES = set(stages)
+
+
+def is_profiling_enabled() -> bool:
+    return len(__PROFILED_STAGES) > 0
+
+
+def __profiled_stage(span: Span) -> Optional[str]:
+    """
+    @return: The outermost profiled step the span is part of.
+    """
+    for name in span.path.split("/"):
+        if name in __PROFILED_STAGES:
+            return name
+    return None
+
+
+def start_profile(span: Span):
+    """
+    Starts profiling the span if it is part of a profiled step and no other span is profiled in the current thread.
+    """
+    if getattr(__THREAD_STATE, "profiler", None) is not None:
+        return
+    stage = __profiled_stage(span)
+    if stage is None:
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12 and later only allow a single active profiler per process, which may be used by another thread
+        return
+    __THREAD_STATE.profiler = profiler
+    __THREAD_STATE.span = span
+    span.profile_stage = stage
+
+
+def stop_profile(span: Span):
+    """
+    Stops profiling the span, if it is profiled, and stores the statistics of the profile in the span, so that they can be sent to the parent
+    process like the span.
+    """
+    if getattr(__THREAD_STATE, "span", None) is not span:
+        return
+    profiler = __THREAD_STATE.profiler
+    profiler.disable()
+    profiler.create_stats()
+    span.profile = profiler.stats
+    __THREAD_STATE.profiler = None
+    __THREAD_STATE.span = None
+
+
+def reset_profile():
+    """
+    Stops the profiler that a forked worker process inherited from the thread of the parent process that created it.
+    """
+    profiler = getattr(__THREAD_STATE, "profiler", None)
+    if profiler is not None:
+        profiler.disable()
+    __THREAD_STATE.profiler = None
+    __THREAD_STATE.span = None
+
+
+def __stats(profile: dict) -> pstats.Stats:
+    stats = pstats.Stats()
+    stats.stats = profile
+    stats.get_top_level_stats()
+    return stats
+
+
+def merge_profiles(spans: List[Span]) -> Dict[str, pstats.Stats]:
+    """
+    Merges the profiles of all spans (including those of worker processes) by their profiled step.
+    @return: The statistics of each profiled step.
+    """
+    profiles: Dict[str, List[dict]] = defaultdict(list)
+    for span in spans:
+        if span.profile is not None:
+            profiles[span.profile_stage].append(span.profile)
+
+    stage_stats = {}
+    for stage, stage_profiles in sorted(profiles.items()):
+        stats = __stats(stage_profiles[0])
+        for profile in stage_profiles[1:]:
+            stats.add(__stats(profile))
+        stage_stats[stage] = stats
+    return stage_stats
+
+
+def write_profiles(spans: List[Span], directory: Union[str, Path], top: int = 20) -> str:
+    """
+    Writes the merged profile of each profiled step to a .pstats file, which can be inspected with pstats or tools like snakeviz.
+    @param spans: The spans of the analysis.
+    @param directory: Directory the files are written to.
+    @param top: Number of functions with the highest own time that are listed for each step in the summary.
+    @return: Summary of the functions each step spent the most time in.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    summary = io.StringIO()
+    for stage, stats in merge_profiles(spans).items():
+        file = directory / f"{stage}.pstats"
+        stats.dump_stats(file)
+        summary.write(f"Profile of {stage} written to {file}\n")
+        stats.stream = summary
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    return summary.getvalue()
@@ -0,0 +1,82 @@
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Union, Iterable, Tuple
+
+from .span import Span
+
+# Increase when the format of the report changes
+REPORT_VERSION = 1
+
+
+def __aggregate(spans: Iterable[Span]) -> Dict[str, dict]:
+    """
+    Sums the metrics of the spans with the same path.
+    """
+    metrics: Dict[str, dict] = {}
+    for span in spans:
+        if span.path not in metrics:
+            metrics[span.path] = {"count": 0, "wall_time": 0.0, "cpu_time": 0.0, "events": None, "peak_memory_mb": None}
+        path_metrics = metrics[span.path]
+        path_metrics["count"] += 1
+        path_metrics["wall_time"] += span.wall_time
+        path_metrics["cpu_time"] += span.cpu_time
+        if span.events is not None:
+            path_metrics["events"] = (path_metrics["events"] or 0) + span.events
+        if span.peak_memory is not None:
+            path_metrics["peak_memory_mb"] = max(path_metrics["peak_memory_mb"] or 0.0, span.peak_memory / (1 << 20))
+    return dict(sorted(metrics.items()))
+
+
+def __worker_metrics(spans: List[Span]) -> List[dict]:
+    """
+    Sums the metrics of the tasks that each worker of a parallel task processed.
+    """
+    workers: Dict[Tuple, List[Span]] = defaultdict(list)
+    for span in spans:
+        if "worker" in span.attributes and span.name == "worker":
+            workers[(span.path, span.attributes.get("file"), span.attributes["worker"], span.pid, span.thread)].append(span)
+
+    metrics = []
+    for (path, file, worker, pid, thread), worker_spans in sorted(workers.items(), key=lambda t: tuple(str(value) for value in t[0])):
+        events = [span.events for span in worker_spans if span.events is not None]
+        metrics.append({
+            "path": path,
+            "file": file,
+            "worker": worker,
+            "pid": pid,
+            "thread": thread,
+            "tasks": len(worker_spans),
+            "wall_time": sum([span.wall_time for span in worker_spans]),
+            "cpu_time": sum([span.cpu_time for span in worker_spans]),
+            "events": sum(events) if events else None
+        })
+    return metrics
+
+
+def build_report(spans: List[Span], wall_time: float) -> dict:
+    """
+    Summarizes the recorded spans by stage, by file and by worker.
+    @param spans: The spans of the analysis.
+    @param wall_time: Total wall time of the analysis.
+    """
+    files: Dict[str, List[Span]] = defaultdict(list)
+    for span in spans:
+        if "file" in span.attributes:
+            files[span.attributes["file"]].append(span)
+
+    return {
+        "version": REPORT_VERSION,
+        "created": datetime.now().isoformat(),
+        "wall_time": wall_time,
+        "stages": __aggregate(spans),
+        "files": {file: __aggregate(file_spans) for file, file_spans in sorted(files.items())},
+        "workers": __worker_metrics(spans),
+        "spans": [span.to_dict() for span in spans]
+    }
+
+
+def write_report(file: Union[str, Path], spans: List[Span], wall_time: float):
+    with open(file, "w", encoding="utf-8") as report_file:
+        json.dump(build_report(spans, wall_time), report_file, indent=2)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Optional, Dict, Any
+
+
+class Span(object):
+
+    def __init__(self, name: str, parent: Optional[Span] = None, **attributes):
+        """
+        Measures the wall and CPU time of a step of the analysis. Spans are nested, so that the time of a step can be attributed to the step it is
+        part of. The CPU time is measured for the current thread, so the time spent in other threads or processes is not included.
+        @param name: Name of the step.
+        @param parent: The span of the step this step is part of.
+        @param attributes: Describe what is processed in this step (e.g., the file). The attributes of the parent are inherited.
+        """
+        self.name = name
+        self.path = f"{parent.path}/{name}" if parent is not None else name
+        self.attributes: Dict[str, Any] = {**parent.attributes, **attributes} if parent is not None else dict(attributes)
+        self.pid = os.getpid()
+        self.thread = threading.current_thread().name
+        # Number of events (or other items) processed in this step, if it is known
+        self.events: Optional[int] = None
+        self.wall_time: Optional[float] = None
+        self.cpu_time: Optional[float] = None
+        # Peak of the memory allocated by Python while the span was open, if memory allocations are traced
+        self.peak_memory: Optional[int] = None
+        # Stage the step was profiled for and the statistics of the profile, if it was profiled
+        self.profile_stage: Optional[str] = None
+        self.profile: Optional[dict] = None
+        self.__wall_start = time.perf_counter()
+        self.__cpu_start = time.thread_time()
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(path={self.path}, attributes={self.attributes}, wall_time={self.wall_time}, cpu_time={self.cpu_time})"
+
+    __repr__ = __str__
+
+    def add_events(self, num_events: int):
+        self.events = (self.events or 0) + num_events
+
+    def update_peak_memory(self, peak_memory: int):
+        self.peak_memory = max(self.peak_memory or 0, peak_memory)
+
+    def finish(self):
+        self.wall_time = time.perf_counter() - self.__wall_start
+        self.cpu_time = time.thread_time() - self.__cpu_start
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "attributes": self.attributes,
+            "pid": self.pid,
+            "thread": self.thread,
+            "events": self.events,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "peak_memory": self.peak_memory
+        }
@@ -1,5 +1,11 @@
+from .event_filter import EventFilter
+from .log_follower import LogFollower
 from .loading import load_log
+from .time_window import TimeWindow
 
 __all__ = [
-    load_log.__name__
+    EventFilter.__name__,
+    LogFollower.__name__,
+    load_log.__name__,
+    TimeWindow.__name__
 ]
@@ -1,5 +1,8 @@
 from pathlib import Path
-from typing import Tuple, List
+from typing import Tuple, List, Optional
+
+from .compression import open_log, get_log_size
+from ..progress import progress_bar
 
 
 class ChunkMetadata:
@@ -18,27 +21,43 @@ class ChunkMetadata:
         return self.chunk_end - self.chunk_begin
 
     @classmethod
-    def load_from_log(cls, path: Path, chunks: List[Tuple[int, int]]):
-        from tqdm import tqdm
-
+    def load_from_log(cls, path: Path, chunks: List[Tuple[int, int]], offset: int = 0, line_marker: str = None,
+                      marked_lines: Optional[List[str]] = None):
+        """
+        Computes the byte offset of each chunk by reading the lines of the log up to the start of the last chunk.
+        @param path: The log file.
+        @param chunks: The chunks of lines [begin, end) in order.
+        @param offset: Byte offset of the first line of the first chunk.
+        @param line_marker: If set, the lines of all chunks containing the marker are appended to the marked lines while reading them. Requires
+               reading the last chunk as well.
+        @param marked_lines: Receives the lines containing the line marker.
+        @return: The metadata of each chunk.
+        """
         data = []
         offset_lines = {chunk[0]: chunk for chunk in chunks}
-        # The last chunk ends on the last line
-        num_lines = chunks[-1][1]
+        # The lines after the start of the last chunk don't need to be read, unless the marked lines are collected
+        num_lines = chunks[-1][1] if line_marker is not None else chunks[-1][0]
+
+        # The bytes read from the log are counted once per block instead of updating the progress once per line
+        size = get_log_size(path)
+        progress = progress_bar(f"Generating metadata for {path}", total=size - offset if size is not None else None)
 
-        with open(path, "r") as log_file:
-            progress_bar = tqdm(desc=f"Generating metadata for {path}", total=num_lines)
+        with open_log(path, "r", progress=progress) as log_file:
+            log_file.seek(offset)
 
             # Add the "offset" for the first line
-            data.append(ChunkMetadata(offset_lines[0], 0))
+            data.append(ChunkMetadata(offset_lines[0], offset))
 
             line = log_file.readline()
             line_number = 1
-            while line:
+            while line and line_number <= num_lines:
+                if line_marker is not None and line_marker in line:
+                    marked_lines.append(line)
                 if line_number in offset_lines:
                     data.append(ChunkMetadata(offset_lines[line_number], log_file.tell()))
                 line_number += 1
-                progress_bar.update(1)
                 line = log_file.readline()
 
+        if progress is not None:
+            progress.close()
         return data
@@ -0,0 +1,98 @@
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import Union, IO, Optional
+
+from .gzip_index import GzipIndex
+from .indexed_gzip_reader import IndexedGzipReader
+from ..progress import ProgressBar, CountingReader
+
+GZIP_SUFFIX: str = ".gz"
+XZ_SUFFIX: str = ".xz"
+# Size of the blocks read from a log file whose read bytes are counted
+COUNTED_BLOCK_SIZE: int = 1 << 16
+
+
+def is_compressed(file: Union[str, Path]) -> bool:
+    return Path(file).suffix in [GZIP_SUFFIX, XZ_SUFFIX]
+
+
+def has_random_access(file: Union[str, Path]) -> bool:
+    """
+    Checks if parts of a file can be read without reading the file from its beginning. This is required to load a file in parallel chunks.
+    Plain files and gzip files consisting of multiple members (see compress_log) support random access.
+    """
+    suffix = Path(file).suffix
+    if suffix == GZIP_SUFFIX:
+        return GzipIndex.load(file).has_random_access
+    return suffix != XZ_SUFFIX
+
+
+def get_log_size(file: Union[str, Path]) -> Optional[int]:
+    """
+    @return: Number of uncompressed bytes of a log file or None, if it is unknown without decompressing the file.
+    """
+    suffix = Path(file).suffix
+    if suffix == GZIP_SUFFIX:
+        return GzipIndex.load(file).uncompressed_size
+    if suffix == XZ_SUFFIX:
+        return None
+    return Path(file).stat().st_size
+
+
+def open_log(file: Union[str, Path], mode: str = "r", progress: ProgressBar = None) -> IO:
+    """
+    Opens a log file that may be compressed. Offsets passed to seek and returned by tell are positions in the uncompressed data.
+    Seeking in an xz file or a gzip file consisting of a single member decompresses the file from its beginning.
+    @param file: The log file. Files ending with .gz or .xz are decompressed while reading them.
+    @param mode: Either "r" to read text or "rb" to read bytes.
+    @param progress: If set, the number of uncompressed bytes read from the file is added to the progress bar once per block.
+    @return: The opened file.
+    """
+    assert mode in ["r", "rb"], f"Unsupported mode {mode} for log files"
+    suffix = Path(file).suffix
+    if suffix == GZIP_SUFFIX:
+        binary_file = io.BufferedReader(IndexedGzipReader(GzipIndex.load(file)))
+    elif suffix == XZ_SUFFIX:
+        binary_file = lzma.open(file, "rb")
+    elif progress is None:
+        return open(file, mode)
+    else:
+        binary_file = open(file, "rb")
+
+    if progress is not None:
+        # The bytes are counted once per block instead of once per line
+        binary_file = io.BufferedReader(CountingReader(binary_file, progress), buffer_size=COUNTED_BLOCK_SIZE)
+    return binary_file if mode == "rb" else io.TextIOWrapper(binary_file)
+
+
+def compress_log(source: Union[str, Path], target: Union[str, Path], block_size: int = 1 << 24) -> GzipIndex:
+    """
+    Compresses a log file into a gzip file consisting of independent members of about the block size. The members start at the beginning of a line,
+    so that the compressed log can still be loaded in parallel chunks. The file can be decompressed by any gzip tool.
+    @param source: The log file. May be compressed itself.
+    @param target: The gzip file that is created.
+    @param block_size: Number of uncompressed bytes in each member.
+    @return: The index of the created file, which is stored next to it.
+    """
+    blocks = []
+    compressed_offset = 0
+    uncompressed_offset = 0
+    with open_log(source, "rb") as source_file, open(target, "wb") as target_file:
+        while True:
+            block = source_file.read(block_size)
+            if not block:
+                break
+            # Complete the last line of the block
+            block += source_file.readline()
+            # Set the modification time, so that compressing the same log always creates the same file
+            member = gzip.compress(block, mtime=0)
+            target_file.write(member)
+            blocks.append((compressed_offset, uncompressed_offset))
+            compressed_offset += len(member)
+            uncompressed_offset += len(block)
+
+    index = GzipIndex(target, blocks or [(0, 0)], uncompressed_offset)
+    index.store()
+    return index
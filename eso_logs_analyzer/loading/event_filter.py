@@ -0,0 +1,148 @@
+import csv
+import hashlib
+from typing import Iterable, Type, Dict, Set, Callable, Tuple
+
+from ..models import Base
+from ..models.data.events import Event, BeginLog, EndLog, UnitAdded, UnitChanged, UnitRemoved, BeginCombat, EndCombat, BeginTrial, EndTrial, TrialInit, \
+    AbilityInfo, EffectInfo, ZoneChanged, MapChanged
+
+
+class EventFilter(Base):
+    # Events that describe the structure of a log. They are cheap to load and always kept, since no other event can be interpreted without them.
+    STRUCTURAL_EVENTS: Set[Type[Event]] = {BeginLog, EndLog, UnitAdded, UnitChanged, UnitRemoved, BeginCombat, EndCombat, BeginTrial, EndTrial, TrialInit,
+                                           AbilityInfo, EffectInfo, ZoneChanged, MapChanged}
+    # Contained in the lines of ability info events, which have the format "<event id>,ABILITY_INFO,<ability id>,<name>,..."
+    ABILITY_INFO_MARKER: str = f",{AbilityInfo.event_type},"
+
+    def __init__(self,
+                 event_types: Iterable[Type[Event]],
+                 ability_ids: Dict[Type[Event], Iterable[int]] = None,
+                 ability_names: Dict[Type[Event], Iterable[str]] = None):
+        """
+        Declares the events an analysis consumes, so that the loaders can skip every other line of a log without parsing it.
+        @param event_types: Event types that are loaded in addition to the structural events of the log.
+        @param ability_ids: Restricts the loaded events of a type to the given ability ids.
+        @param ability_names: Restricts the loaded events of a type to the given ability names. The names are resolved to ability ids using the
+               ability info events of the log file.
+        """
+        super().__init__()
+        self.event_types: Set[str] = {event_type.event_type for event_type in event_types}
+        self.ability_ids: Dict[str, Set[int]] = {event_type.event_type: set(ids) for event_type, ids in (ability_ids or {}).items()}
+        self.ability_names: Dict[str, Set[str]] = {event_type.event_type: set(names) for event_type, names in (ability_names or {}).items()}
+        self.ability_id_columns: Dict[str, int] = {}
+
+        for event_type in list(self.ability_ids.keys()) + list(self.ability_names.keys()):
+            assert event_type in self.event_types, f"Ability filter for event type {event_type} that is not loaded"
+            event_class = [subclass for subclass in event_types if subclass.event_type == event_type][0]
+            assert event_class.ability_id_column is not None, f"Events of type {event_type} can't be filtered by their ability"
+            self.ability_id_columns[event_type] = event_class.ability_id_column
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(event_types={sorted(self.event_types)}, ability_ids={self.ability_ids}, ability_names={self.ability_names})"
+
+    __repr__ = __str__
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Identifies the events that pass this filter. Results computed from filtered logs are only valid for filters with the same fingerprint.
+        """
+        fingerprint = hashlib.sha256()
+        for event_type in sorted(self.event_types):
+            ability_ids = sorted(self.ability_ids.get(event_type, []))
+            ability_names = sorted(self.ability_names.get(event_type, []))
+            fingerprint.update(f"{event_type}:{ability_ids}:{ability_names};".encode("utf-8"))
+        return fingerprint.hexdigest()[:16]
+
+    @property
+    def has_ability_names(self) -> bool:
+        """
+        Checks if ability names need to be resolved to ability ids using the ability info events of the loaded logs.
+        """
+        return bool(self.ability_names)
+
+    def resolve_ability_ids(self, ability_infos: Iterable[Tuple[str, str]]) -> Dict[str, Set[str]]:
+        """
+        Computes the accepted ability ids for each event type. The ids are compared to the raw column values, so they are returned as strings.
+        @param ability_infos: The id and name of each ability info of the loaded logs. Used to resolve the ability names to ids.
+        @return: Accepted ability ids for each event type with an ability filter.
+        """
+        ability_ids = {event_type: {str(ability_id) for ability_id in ids} for event_type, ids in self.ability_ids.items()}
+        if not self.ability_names:
+            return ability_ids
+
+        for ability_id, name in ability_infos:
+            for event_type, names in self.ability_names.items():
+                if name in names:
+                    ability_ids.setdefault(event_type, set()).add(ability_id)
+
+        for event_type, names in self.ability_names.items():
+            self.logger.info(f"Resolved {len(names)} ability names for {event_type} to {len(ability_ids.get(event_type, []))} ability ids")
+            # Events with names that don't occur in the log are never loaded
+            ability_ids.setdefault(event_type, set())
+        return ability_ids
+
+    def accepts_event_type(self, event_type: str) -> bool:
+        """
+        Checks if events of a type are loaded. Events of types with an ability filter are only loaded if they pass the filter as well.
+        """
+        return event_type in self.event_types or event_type in {structural_event.event_type for structural_event in self.STRUCTURAL_EVENTS}
+
+    def line_filter(self, ability_info_lines: Iterable[str] = ()) -> Callable[[str], bool]:
+        """
+        Creates a function that decides for each raw line of the log file if it is loaded. The lines may be passed in any order.
+        @param ability_info_lines: The raw ability info lines of the loaded logs. Required to resolve ability names to the ability ids used in the
+               file. Loaders collect them while scanning the file for other purposes (e.g., the chunk offsets), so the file is not read again.
+        @return: Function that returns True for lines that should be loaded.
+        """
+        # Ability info lines have the format "<event id>,ABILITY_INFO,<ability id>,<name>,..."
+        ability_infos = ((columns[2], columns[3]) for columns in csv.reader(ability_info_lines)) if self.ability_names else []
+        return self.__line_filter(self.resolve_ability_ids(ability_infos), resolve_ability_names=False)
+
+    def incremental_line_filter(self) -> Callable[[str], bool]:
+        """
+        Creates a function that decides for each raw line of a log file that is still being written if it is loaded. Ability names are resolved
+        using the ability info lines passed to the function, since the ability info of an ability is logged before it is used. Thus, the lines need
+        to be passed in the order of the file.
+        @return: Function that returns True for lines that should be loaded.
+        """
+        ability_ids = {event_type: {str(ability_id) for ability_id in ids} for event_type, ids in self.ability_ids.items()}
+        for event_type in self.ability_names.keys():
+            ability_ids.setdefault(event_type, set())
+        return self.__line_filter(ability_ids, resolve_ability_names=bool(self.ability_names))
+
+    def __line_filter(self, ability_ids: Dict[str, Set[str]], resolve_ability_names: bool) -> Callable[[str], bool]:
+        """
+        @param ability_ids: Accepted ability ids for each event type with an ability filter.
+        @param resolve_ability_names: If set, the ids of the ability info lines with accepted ability names are added to the accepted ability ids.
+        """
+        structural_event_types = {event_type.event_type for event_type in self.STRUCTURAL_EVENTS}
+        event_types = self.event_types
+        ability_names = self.ability_names
+        ability_id_columns = self.ability_id_columns
+
+        def accepts(line: str) -> bool:
+            # Lines start with the event id followed by the event type
+            type_begin = line.find(",") + 1
+            type_end = line.find(",", type_begin)
+            event_type = line[type_begin:type_end] if type_end != -1 else line[type_begin:].rstrip()
+
+            if event_type in structural_event_types:
+                if resolve_ability_names and event_type == AbilityInfo.event_type:
+                    # Ability info lines have the format "<event id>,ABILITY_INFO,<ability id>,<name>,..."
+                    ability_info = next(csv.reader([line]))
+                    for names_event_type, names in ability_names.items():
+                        if ability_info[3] in names:
+                            ability_ids[names_event_type].add(ability_info[2])
+                return True
+            if event_type not in event_types:
+                return False
+            if event_type not in ability_ids:
+                return True
+
+            # The ability id precedes any quoted fields, so the line can be split without parsing it as csv
+            column = ability_id_columns[event_type]
+            columns = line[type_end + 1:].split(",", column + 1)
+            return len(columns) > column and columns[column] in ability_ids[event_type]
+
+        return accepts
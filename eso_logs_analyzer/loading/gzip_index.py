@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Union, List, Tuple, Optional
+
+from ..models import Base
+
+
+class GzipIndex(Base):
+    __INDEX_SUFFIX: str = ".idx"
+    __INDEX_VERSION: int = 1
+    # Number of compressed bytes that are read at once while building the index
+    __READ_SIZE: int = 1 << 20
+
+    def __init__(self, file: Union[str, Path], blocks: List[Tuple[int, int]], uncompressed_size: int):
+        """
+        Index of the members of a gzip file. Each member of a gzip file can be decompressed independently, so a file consisting of many members can
+        be read starting at any member. A file compressed by common tools consists of a single member and can only be read from its beginning.
+        @param file: The gzip file.
+        @param blocks: The offsets of each member in the compressed file and in the uncompressed data in order.
+        @param uncompressed_size: Size of the uncompressed data.
+        """
+        super().__init__()
+        self.file = Path(file)
+        self.blocks = blocks
+        self.uncompressed_size = uncompressed_size
+        self.__uncompressed_offsets = [uncompressed_offset for _, uncompressed_offset in blocks]
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(file={self.file}, blocks={len(self.blocks)}, uncompressed_size={self.uncompressed_size})"
+
+    __repr__ = __str__
+
+    @property
+    def has_random_access(self) -> bool:
+        return len(self.blocks) > 1
+
+    def block(self, offset: int) -> Tuple[int, int]:
+        """
+        Finds the member containing an offset in the uncompressed data.
+        @return: The offsets of the beginning of the member in the compressed file and in the uncompressed data.
+        """
+        return self.blocks[max(bisect_right(self.__uncompressed_offsets, offset) - 1, 0)]
+
+    @classmethod
+    def index_path(cls, file: Union[str, Path]) -> Path:
+        file = Path(file)
+        return file.with_name(f"{file.name}{cls.__INDEX_SUFFIX}")
+
+    @classmethod
+    def load(cls, file: Union[str, Path]) -> GzipIndex:
+        """
+        Loads the index of a gzip file. The index is built once by decompressing the whole file and stored next to it.
+        @param file: The gzip file.
+        @return: The index of the file.
+        """
+        index = cls.__read(file)
+        if index is None:
+            index = cls.build(file)
+            index.store()
+        return index
+
+    @classmethod
+    def __read(cls, file: Union[str, Path]) -> Optional[GzipIndex]:
+        """
+        Reads the stored index of a file, if it was built for the current version of the file.
+        """
+        index_path = cls.index_path(file)
+        if not index_path.exists():
+            return None
+        stat = Path(file).stat()
+        try:
+            with open(index_path, "r") as index_file:
+                data = json.load(index_file)
+            if data["version"] != cls.__INDEX_VERSION or data["size"] != stat.st_size or data["mtime"] != stat.st_mtime_ns:
+                return None
+            return cls(file, [(compressed, uncompressed) for compressed, uncompressed in data["blocks"]], data["uncompressed_size"])
+        except (OSError, ValueError, KeyError) as e:
+            cls.logger.warning(f"Ignoring invalid gzip index {index_path}: {e}")
+            return None
+
+    def store(self):
+        """
+        Stores the index next to the gzip file. The index is only kept in memory, if the directory of the file is not writable.
+        """
+        stat = self.file.stat()
+        index_path = self.index_path(self.file)
+        data = {
+            "version": self.__INDEX_VERSION,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "uncompressed_size": self.uncompressed_size,
+            "blocks": self.blocks
+        }
+        try:
+            # Write to a temporary file first, since the index may be read by other processes at the same time
+            temp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+            with open(temp_path, "w") as index_file:
+                json.dump(data, index_file)
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            self.logger.warning(f"Could not store gzip index {index_path}: {e}")
+
+    @classmethod
+    def build(cls, file: Union[str, Path]) -> GzipIndex:
+        """
+        Builds the index of a gzip file by decompressing it once and recording where each member begins.
+        @param file: The gzip file.
+        @return: The index of the file.
+        """
+        cls.logger.info(f"Building gzip index of {file}")
+        blocks = [(0, 0)]
+        compressed_offset = 0
+        uncompressed_offset = 0
+        member_ended = False
+        # Decompresses a single gzip member (wbits 16 + 15 expects a gzip header)
+        decompressor = zlib.decompressobj(31)
+        pending = b""
+        with open(file, "rb") as compressed_file:
+            while True:
+                data = pending or compressed_file.read(cls.__READ_SIZE)
+                if not data:
+                    break
+                if member_ended:
+                    # The previous member ended and another one follows
+                    blocks.append((compressed_offset, uncompressed_offset))
+                    decompressor = zlib.decompressobj(31)
+                    member_ended = False
+
+                uncompressed_offset += len(decompressor.decompress(data))
+                if decompressor.eof:
+                    pending = decompressor.unused_data
+                    compressed_offset += len(data) - len(pending)
+                    member_ended = True
+                else:
+                    pending = b""
+                    compressed_offset += len(data)
+
+        return cls(file, blocks, uncompressed_offset)
@@ -0,0 +1,57 @@
+import gzip
+import io
+from typing import Optional
+
+from .gzip_index import GzipIndex
+
+
+class IndexedGzipReader(io.RawIOBase):
+
+    def __init__(self, index: GzipIndex):
+        """
+        Reads the uncompressed data of a gzip file. Seeking only decompresses the data from the beginning of the member containing the new position,
+        instead of decompressing the whole file up to that position.
+        @param index: Index of the members of the gzip file.
+        """
+        super().__init__()
+        self.index = index
+        self.__file = open(index.file, "rb")
+        self.__position = 0
+        # Decompresses the file from the beginning of a member. Created lazily after seeking.
+        self.__stream: Optional[gzip.GzipFile] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += self.index.uncompressed_size
+        if offset != self.__position:
+            self.__position = max(offset, 0)
+            self.__stream = None
+        return self.__position
+
+    def readinto(self, buffer) -> int:
+        if self.__stream is None:
+            compressed_offset, uncompressed_offset = self.index.block(self.__position)
+            self.__file.seek(compressed_offset)
+            # Reads all members from this one until the end of the file
+            self.__stream = gzip.GzipFile(fileobj=self.__file, mode="rb")
+            self.__stream.seek(self.__position - uncompressed_offset)
+        num_bytes = self.__stream.readinto(buffer)
+        self.__position += num_bytes
+        return num_bytes
+
+    def close(self):
+        if not self.closed:
+            self.__stream = None
+            self.__file.close()
+        super().close()
@@ -1,19 +1,56 @@
 from pathlib import Path
-from typing import Union
+from typing import Union, Dict, Type, Iterable
 
 from python_json_config import Config
 
+from .compression import has_random_access
+from .event_filter import EventFilter
 from .log_loader import LogLoader
 from .parallel_loader import ParallelLoader
+from .time_window import TimeWindow
+from .window_loader import WindowLoader
+from ..archive import ArchiveLoader, ARCHIVE_SUFFIX
+from ..models.data.events import TargetEvent
+from ..utils import is_gil_enabled
 
 
-def load_log(file: Union[str, Path], multiple: bool, config: Config):
-    if config.parallel is not None and config.parallel.num_processes > 1:
+def load_log(file: Union[str, Path],
+             multiple: bool,
+             config: Config,
+             event_filter: EventFilter = None,
+             projection: Dict[Type[TargetEvent], Iterable[str]] = None,
+             offset: int = 0,
+             end: int = None,
+             window: TimeWindow = None):
+    if Path(file).suffix == ARCHIVE_SUFFIX:
+        # Archives are loaded without parsing any lines
+        assert offset == 0 and end is None, f"Archives can only be loaded completely"
+        return ArchiveLoader(file=file, multiple=multiple, event_filter=event_filter, projection=projection, window=window).parse_log()
+
+    if window is not None:
+        # Only the lines in the window are parsed, which is faster than loading the whole file in parallel
+        assert offset == 0 and end is None, f"Logs can either be loaded from an offset or in a time window"
+        return WindowLoader(file=file, window=window, multiple=multiple, event_filter=event_filter, projection=projection).parse_log()
+
+    use_parallel_loader = config.parallel is not None and config.parallel.num_processes > 1
+    if use_parallel_loader and not has_random_access(file):
+        # Each chunk would have to decompress the file from its beginning
+        ParallelLoader.logger.warning(f"Log {file} can't be loaded in parallel chunks, since it is compressed without an index of independent blocks. "
+                                      f"Loading it sequentially instead. Use convert.py to compress it into blocks.")
+        use_parallel_loader = False
+
+    if use_parallel_loader:
         loader_class = ParallelLoader
-        loader_kwargs = dict(num_processes=config.parallel.num_processes, num_chunks=config.parallel.num_chunks)
+        backend = config.parallel.backend or ParallelLoader.PROCESS_BACKEND
+        if backend == ParallelLoader.THREAD_BACKEND and is_gil_enabled():
+            # Threads would only load the chunks one after another
+            ParallelLoader.logger.warning(f"The {backend} loader backend requires a free-threaded Python build. Using the "
+                                          f"{ParallelLoader.PROCESS_BACKEND} backend instead.")
+            backend = ParallelLoader.PROCESS_BACKEND
+        loader_kwargs = dict(num_processes=config.parallel.num_processes, num_chunks=config.parallel.num_chunks, backend=backend)
     else:
         loader_class = LogLoader
         loader_kwargs = dict()
 
-    loader = loader_class(file=file, multiple=multiple, **loader_kwargs)
+    loader = loader_class(file=file, multiple=multiple, event_filter=event_filter, projection=projection, offset=offset, end=end, **loader_kwargs)
     return loader.parse_log()
@@ -0,0 +1,191 @@
+import csv
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Union, Dict, Type, Iterable, List, Optional, BinaryIO
+
+from .event_filter import EventFilter
+from .log_loader import LogLoader
+from ..models.data import EncounterLog
+from ..models.data.cast_matcher import CastMatcher
+from ..models.data.combat_matcher import CombatMatcher
+from ..models.data.events import Event, TargetEvent, BeginLog, EndLog, AbilityInfo, EffectInfo, UnitAdded
+from ..models.data.events.enums import UnitType
+from ..models.data.trial_matcher import TrialMatcher
+from ..models.data.unit_registry import UnitRegistry
+from ..models.postprocessing import CombatEncounter, EncounterTracker
+
+
+class LogFollower(LogLoader):
+    # Maximum number of bytes that are read from the file at once
+    __BLOCK_SIZE: int = 1 << 24
+
+    def __init__(self,
+                 file: Union[str, Path],
+                 event_filter: EventFilter = None,
+                 projection: Dict[Type[TargetEvent], Iterable[str]] = None):
+        """
+        Follows an encounterlog file that is still being written. The file is kept open and the appended lines are parsed each time it is polled.
+        The state of the log that is being written (units, trials and combat) is updated with each event, so that combat encounters can be
+        analyzed as soon as they are complete.
+        @param file: File containing the encounter log data.
+        @param event_filter: If set, only the events passing the filter are loaded.
+        @param projection: If set, only the listed unit state attributes are loaded for events of the given types.
+        """
+        super().__init__(file=file, multiple=True, event_filter=event_filter, projection=projection)
+        self.__file: Optional[BinaryIO] = None
+        self.__reset()
+
+    def __reset(self):
+        """
+        Starts reading the file from the beginning.
+        """
+        if self.__file is not None:
+            self.__file.close()
+        self.__file = open(self.file, "rb")
+        # Ability names are resolved while reading the file, since the ability infos of a file that is being written are not known in advance
+        self.__line_filter = self.event_filter.incremental_line_filter() if self.event_filter is not None else None
+        # Bytes after the last complete line that was read
+        self.__partial_line = b""
+        # Events of the file by line. The events of finished logs are removed from the store.
+        self.__store: List[Optional[Event]] = []
+        # Logs that ended during the last poll
+        self.__ended_logs: List[EncounterLog] = []
+        self.__last_event: Optional[Event] = None
+        self.__last_event_read_time = time.monotonic()
+        self.__begin_log()
+
+    def __begin_log(self):
+        """
+        Starts a new log after the last line of the store.
+        """
+        self.current_log = EncounterLog()
+        self.current_log.assign_events(self.__store, len(self.__store), len(self.__store))
+        self.current_log.units = UnitRegistry()
+        self.current_log.ability_infos = {}
+        self.current_log.valid_ability_names = set()
+        self.current_log.effect_infos = {}
+        self.current_log.player_unit_added = {}
+        self.__cast_matcher = CastMatcher()
+        self.__combat_matcher = CombatMatcher()
+        self.__trial_matcher = TrialMatcher()
+        self.__encounter_tracker = EncounterTracker(self.current_log)
+
+    def __remove_ended_logs(self):
+        """
+        Removes the events of the logs that ended from the store. Their encounters were already returned and analyzed.
+        """
+        for log in self.__ended_logs:
+            events = log.events
+            self.__store[events.begin:events.end] = [None] * (events.end - events.begin)
+        self.__ended_logs = []
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    def __read_lines(self) -> List[str]:
+        """
+        Reads the complete lines that were appended to the file since the last read.
+        """
+        if self.file.stat().st_size < self.__file.tell():
+            # The file was truncated or replaced
+            self.logger.warning(f"File {self.file} shrank. Reading it from the beginning.")
+            self.__reset()
+
+        lines = []
+        while True:
+            data = self.__file.read(self.__BLOCK_SIZE)
+            if not data:
+                break
+            data = self.__partial_line + data
+            # The last line may still be written
+            *complete_lines, self.__partial_line = data.split(b"\n")
+            lines.extend([line.decode("utf-8", errors="replace") + "\n" for line in complete_lines])
+        return lines
+
+    def __index_event(self, event: Event):
+        """
+        Gathers the events of the current log by their identifying ids, which is done for the whole log when it is initialized otherwise.
+        """
+        log = self.current_log
+        if isinstance(event, BeginLog):
+            # Event times are computed using the begin log event
+            log.begin_log = event
+        elif isinstance(event, EndLog):
+            log.end_log = event
+            log.begin_log.end_log = event
+            event.begin_log = log.begin_log
+        elif isinstance(event, AbilityInfo):
+            log.ability_infos[event.ability_id] = event
+            log.valid_ability_names.add(event.name)
+        elif isinstance(event, EffectInfo):
+            log.effect_infos[event.ability_id] = event
+        elif isinstance(event, UnitAdded) and event.unit_type == UnitType.PLAYER:
+            log.player_unit_added[event.unit_id] = event
+
+    def __add_line(self, line: str) -> List[CombatEncounter]:
+        """
+        Parses the next line of the file and updates the state of the current log.
+        @return: The encounters that were completed by the event of the line.
+        """
+        if self.__line_filter is not None and not self.__line_filter(line):
+            self.__store.append(None)
+            return []
+
+        current_id = len(self.__store)
+        try:
+            event = self._load_line(current_id, self.current_log, next(csv.reader([line])))
+        except (IndexError, StopIteration) as e:
+            self.logger.error(f"Error {e} parsing line {current_id}: {line}")
+            event = None
+        self.__store.append(event)
+        if event is None:
+            return []
+
+        self.__last_event = event
+        self.current_log.events.extend_to(len(self.__store))
+        self.__index_event(event)
+        self.current_log.units.add_event(event)
+        self.__cast_matcher.add(event)
+        self.__combat_matcher.add(event)
+        self.__trial_matcher.add(event)
+        encounter = self.__encounter_tracker.add(event)
+        encounters = [encounter] if encounter is not None else []
+
+        if isinstance(event, EndLog):
+            self.__cast_matcher.close()
+            encounter = self.__encounter_tracker.close()
+            if encounter is not None:
+                encounters.append(encounter)
+            self.__ended_logs.append(self.current_log)
+            self.__begin_log()
+        return encounters
+
+    def poll(self) -> List[CombatEncounter]:
+        """
+        Parses the lines that were appended to the file since the last poll. The events of logs that ended are kept until the next poll, so that
+        the returned encounters can be analyzed.
+        @return: The encounters that were completed since the last poll.
+        """
+        self.__remove_ended_logs()
+
+        completed = []
+        lines = self.__read_lines()
+        for line in lines:
+            completed.extend(self.__add_line(line))
+        if lines:
+            self.__last_event_read_time = time.monotonic()
+
+        if self.__last_event is not None and self.__last_event.encounter_log is self.current_log and self.current_log.begin_log is not None:
+            # The log continues while no lines are written, so the current encounter may be complete even if no further events were logged
+            log_time = self.__last_event.time + timedelta(seconds=time.monotonic() - self.__last_event_read_time)
+            encounter = self.__encounter_tracker.expire(log_time)
+            if encounter is not None:
+                completed.append(encounter)
+
+        return completed
@@ -1,61 +1,154 @@
+import re
+from itertools import islice
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Dict, Type, Iterable, Optional
 
-from eso_logs_analyzer.loading.utils import get_num_lines, read_csv
+from eso_logs_analyzer.loading.event_filter import EventFilter
+from eso_logs_analyzer.instrumentation import span
+from eso_logs_analyzer.loading.compression import get_log_size
+from eso_logs_analyzer.loading.utils import get_num_lines, read_csv, find_first_line, find_last_line_end
 from eso_logs_analyzer.models import Base
 from eso_logs_analyzer.models.data import EncounterLog
-from eso_logs_analyzer.models.data.events import Event, ErrorEventStub, EndLog
-from eso_logs_analyzer.utils import tqdm
+from eso_logs_analyzer.models.data.event_index import EventIndex
+from eso_logs_analyzer.models.data.events import Event, ErrorEventStub, EndLog, TargetEvent
+from eso_logs_analyzer.progress import ProgressBar, progress_bar
 
 
 class LogLoader(Base):
-    def __init__(self, file: Union[str, Path], multiple: bool = False, *args, **kwargs):
+    # Matches the line of an end log event. The lookbehind ensures the match starts at the beginning of a line.
+    __END_LOG_PATTERN: re.Pattern = re.compile(rb"(?<![^\n])\d+," + EndLog.event_type.encode("utf-8") + rb"\r?\n")
+
+    def __init__(self,
+                 file: Union[str, Path],
+                 multiple: bool = False,
+                 event_filter: EventFilter = None,
+                 projection: Dict[Type[TargetEvent], Iterable[str]] = None,
+                 offset: int = 0,
+                 end: int = None,
+                 *args, **kwargs):
         """
         Loads an encounterlog file into one or multiple logs.
         @param file: File containing the encounter log data. Loads the file in parallel chunks.
         @param multiple: If set to True, if multiple logs are in a single file, they will be loaded and their encounters chained together.
+        @param event_filter: If set, only the events passing the filter are loaded. Lines of all other events are skipped without parsing them and
+               are None in the event store of the file.
+        @param projection: If set, only the listed unit state attributes (e.g., "target_current_health") are loaded for events of the given types.
+               Accessing any other unit state attribute of these events raises an error.
+        @param offset: Byte offset of the first line that is loaded. Has to be the beginning of a log. Allows loading only the logs that were
+               appended to a file since it was loaded last. The ids of the events are the line numbers counted from this offset.
+        @param end: If set, byte offset after the last line that is loaded.
         """
         super().__init__(*args, **kwargs)
 
         self.file = Path(file).absolute()
         assert self.file.exists() and self.file.is_file(), f"File {file} does not exist or is not a file!"
-        self.num_lines = get_num_lines(self.file)
+        self.offset = offset
+        self.end = end
+        self.num_lines = get_num_lines(self.file, offset=offset, end=end)
         self.multiple = multiple
 
+        # If only the first log is read, the lines after its end don't need to be loaded
+        self.num_loaded_lines = self.num_lines
+        if not self.multiple:
+            end_log_line = find_first_line(self.file, self.__END_LOG_PATTERN, offset=offset)
+            if end_log_line is not None:
+                self.num_loaded_lines = end_log_line + 1
+        self.event_filter = event_filter
+        self.projection = None
+        if projection is not None:
+            self.projection = {event_type.event_type: event_type.projected_columns(attributes) for event_type, attributes in projection.items()}
+
+    @classmethod
+    def find_end_of_last_log(cls, file: Union[str, Path], offset: int = 0) -> Optional[int]:
+        """
+        Finds the end of the last complete log in a file. Lines after it belong to a log that is still being written, if there are any.
+        @param file: File containing the encounter log data.
+        @param offset: Byte offset at which the search stops.
+        @return: Byte offset after the last end log event or None, if no log ends after the offset.
+        """
+        return find_last_line_end(file, cls.__END_LOG_PATTERN, offset=offset)
+
     @property
     def _description(self):
         return f"Parsing log {self.file}"
 
-    def _load_line(self, current_id, current_log, line) -> Event:
+    @property
+    def _num_bytes(self) -> Optional[int]:
+        """
+        @return: Number of bytes from the offset to the end of the lines that may be loaded or None, if the size of the file is unknown.
+        """
+        if self.end is not None:
+            return self.end - self.offset
+        size = get_log_size(self.file)
+        return size - self.offset if size is not None else None
+
+    def _progress_bar(self) -> Optional[ProgressBar]:
+        """
+        @return: A progress bar tracking the bytes read while loading the log or None, if progress bars are disabled.
+        """
+        return progress_bar(self._description, total=self._num_bytes)
+
+    def _line_filter(self):
+        if self.event_filter is None:
+            return None
+        # The lines are read in order and the ability info of an ability is logged before it is used, so ability names are resolved while reading
+        # the lines instead of reading the file twice
+        return self.event_filter.incremental_line_filter()
+
+    def _load_line(self, current_id, current_log, line) -> Optional[Event]:
+        # Lines that were skipped by the event filter are empty
+        if not line:
+            return None
         try:
-            return Event.create(current_id, current_log, int(line[0]), line[1], *line[2:])
+            return Event.create(current_id, current_log, int(line[0]), line[1], *line[2:], projection=self.projection)
         except ValueError as e:
-            return ErrorEventStub(current_id, None, int(line[0]), e, line[1:])
+            return ErrorEventStub(current_id, current_log, int(line[0]), e, line[1:])
+
+    def _read_rows(self, progress: ProgressBar = None) -> Iterable[List[str]]:
+        """
+        @param progress: If set, the bytes read from the file are added to the progress bar.
+        @return: The parsed lines that are loaded. Lines rejected by the event filter are empty.
+        """
+        csv_file = read_csv(str(self.file), has_header=False, line_filter=self._line_filter(), offset=self.offset, progress=progress)
+        if self.end is not None:
+            # Lines after the end may belong to a log that is still being written
+            csv_file = islice(csv_file, self.num_loaded_lines)
+        return csv_file
 
     def _load_log(self) -> List[EncounterLog]:
-        csv_file = read_csv(str(self.file), has_header=False)
-        events = []
-        current_id = 0
+        # Progress is tracked by the bytes read from the file, which are counted once per block instead of once per line
+        progress = self._progress_bar()
+        csv_file = self._read_rows(progress)
+        # Contains the events of all logs in the file at the index of their line
+        store = []
+        log_begin = 0
         logs = []
 
         current_log = EncounterLog()
+        # Index the events while loading them instead of iterating through them again when initializing the log
+        current_index = EventIndex()
 
-        for line in tqdm(csv_file, desc=self._description, total=self.num_lines):
-            event = self._load_line(current_id, current_log, line)
-            events.append(event)
-            current_id += 1
+        for line in csv_file:
+            event = self._load_line(len(store), current_log, line)
+            store.append(event)
+            if event is None:
+                continue
+            current_index.add(event)
 
             # Separate logs into different objects if there are multiple logs in the file
             if isinstance(event, EndLog):
-                current_log.events = events
+                current_log.assign_events(store, log_begin, len(store), current_index)
                 logs.append(current_log)
                 if self.multiple:
                     # We have a separate log starting after this line
-                    events = []
-                    current_id = 0
+                    log_begin = len(store)
                     current_log = EncounterLog()
+                    current_index = EventIndex()
                 else:
                     break
+
+        if progress is not None:
+            progress.close()
         return logs
 
     def parse_log(self) -> Union[EncounterLog, List[EncounterLog]]:
@@ -63,17 +156,14 @@ class LogLoader(Base):
         Parses an encounterlog file into one or multiple logs depending on the passed parameters and how many logs are contained in the file.
         @return: A single or multiple encounter log objects, depending on the number of logs in the input file.
         """
-        logs = self._load_log()
+        with span("load", loader=self.__class__.__name__) as load_span:
+            logs = self._load_log()
+            load_span.add_events(self.num_loaded_lines)
 
         # Initialize log by processing all the events in the log.
         # If this step is skipped, the log object contains no useful data.
-        for log in logs:
-            log.initialize()
-
-        # Make sure that the index for each event equals the event's id.
-        self.logger.info("Validating event indices")
-        for log in logs:
-            assert all([event.id == index for index, event in enumerate(log.events)]), f"Not all event ids equal the indices of the events " \
-                                                                                       f"for log {log}"
+        with span("initialize"):
+            for log in logs:
+                log.initialize()
 
         return logs if self.multiple else logs[0]
@@ -1,28 +1,51 @@
 from pathlib import Path
-from typing import Union, List, Tuple, Dict
+from typing import Union, List, Tuple, Dict, Type, Iterable, Optional
 
 from .chunk_metadata import ChunkMetadata
+from .event_filter import EventFilter
 from .log_loader import LogLoader
 from .utils import read_csv_chunk
+from ..instrumentation import span
 from ..models.data import EncounterLog
-from ..models.data.events import Event, EndLog
-from ..parallel import ResultCollector, ParallelTask
+from ..models.data.event_index import EventIndex
+from ..models.data.log_segment import LogSegment
+from ..models.data.events import Event, EndLog, TargetEvent
+from ..parallel import ResultCollector, ParallelTask, ThreadedTask
+
+
+class LogChunk(object):
+    """
+    Events loaded from a chunk of a log file.
+    """
+
+    def __init__(self, chunk: Tuple[int, int], events: List[Optional[Event]], segments: List[Tuple[LogSegment, Optional[int], EventIndex]]):
+        """
+        @param chunk: The lines [begin, end) of the chunk.
+        @param events: The event of each line in the chunk or None if the line was not loaded.
+        @param segments: The parts of the logs in the chunk in order. Each log segment is passed to the events of its lines, since the complete log
+               object can't be created while loading a single chunk. Contains the index after the end log event, if the log ends in this chunk, and
+               the partial index of the events of the segment.
+        """
+        self.chunk = chunk
+        self.events = events
+        self.segments = segments
 
 
 class ChunkIterator(object):
     """
-    Iterates through events that are separated into multiple chunks.
-    Allows iteration through chunks without having to copy the events into a separate unified list.
+    Iterates through the chunks of a log file in order.
     """
 
-    def __init__(self, chunks: List[Tuple[int, int]], event_chunks: Dict[Tuple[int, int], List[Event]]):
+    def __init__(self, chunks: List[Tuple[int, int]], event_chunks: Dict[Tuple[int, int], LogChunk]):
         self.chunks = sorted(chunks, key=lambda t: t[0])
         self.event_chunks = event_chunks
 
     def __iter__(self):
         for chunk in self.chunks:
-            for event in self.event_chunks[chunk]:
-                yield event
+            # Chunks after the first log are not loaded if only the first log is read
+            if chunk not in self.event_chunks:
+                return
+            yield self.event_chunks[chunk]
 
 
 class LogCollector(ResultCollector):
@@ -30,40 +53,77 @@ class LogCollector(ResultCollector):
     Collects chunks of an encounter log loaded in parallel and aggregates the results.
     """
 
-    def __init__(self, chunks: List[Tuple[int, int]]):
+    def __init__(self, chunks: List[Tuple[int, int]], multiple: bool = True):
+        """
+        @param chunks: The chunks that are loaded.
+        @param multiple: If set to False, the collection is completed as soon as the first log was collected completely.
+        """
         super().__init__()
-        self.event_chunks: Dict[Tuple[int, int], List[Event]] = {}
+        self.event_chunks: Dict[Tuple[int, int], LogChunk] = {}
         # Create a copy of the chunks list to make sure we are using a different object.
-        self.chunks = list(chunks)
+        self.chunks = sorted(chunks, key=lambda t: t[0])
+        self.multiple = multiple
 
-    def collect_result(self, result):
-        result_chunk, result_events = result
-        self.event_chunks[result_chunk] = result_events
+    def collect_result(self, result: LogChunk):
+        self.event_chunks[result.chunk] = result
 
     def aggregated_result(self):
         return ChunkIterator(self.chunks, self.event_chunks)
 
     def is_completed(self) -> bool:
-        return all([chunk in self.event_chunks for chunk in self.chunks])
+        for chunk in self.chunks:
+            if chunk not in self.event_chunks:
+                return False
+            if not self.multiple and any([log_end is not None for _, log_end, _ in self.event_chunks[chunk].segments]):
+                # The first log ends in this chunk and all previous chunks were collected. The remaining chunks are not needed.
+                return True
+        return True
 
 
 class ParallelLoader(LogLoader):
-
-    def __init__(self, file: Union[str, Path], multiple: bool = False, num_processes: int = 8, num_chunks: int = 64):
+    # Chunks are loaded in separate processes and the events are pickled to the main process
+    PROCESS_BACKEND: str = "process"
+    # Chunks are loaded in threads that share the events with the main thread. Requires a free-threaded Python build to run in parallel.
+    THREAD_BACKEND: str = "thread"
+
+    def __init__(self,
+                 file: Union[str, Path],
+                 multiple: bool = False,
+                 event_filter: EventFilter = None,
+                 projection: Dict[Type[TargetEvent], Iterable[str]] = None,
+                 num_processes: int = 8,
+                 num_chunks: int = 64,
+                 backend: str = PROCESS_BACKEND,
+                 offset: int = 0,
+                 end: int = None):
         """
         Loads an encounterlog file into one or multiple logs in parallel.
         @param file: File containing the encounter log data. Loads the file in parallel chunks.
         @param multiple: If set to True, if multiple logs are in a single file, they will be loaded and their encounters chained together.
-        @param num_processes: How many processes should be used.
+        @param event_filter: If set, only the events passing the filter are loaded.
+        @param projection: If set, only the listed unit state attributes are loaded for events of the given types.
+        @param num_processes: How many processes (or threads) should be used.
         @param num_chunks: In how many parts the input file should be read. Should always be higher than the number of processes for performance reasons.
+        @param backend: Either PROCESS_BACKEND or THREAD_BACKEND.
+        @param offset: Byte offset of the first line that is loaded. Has to be the beginning of a log.
+        @param end: If set, byte offset after the last line that is loaded.
         """
-        super().__init__(file=file, multiple=multiple)
+        super().__init__(file=file, multiple=multiple, event_filter=event_filter, projection=projection, offset=offset, end=end)
+        assert backend in [self.PROCESS_BACKEND, self.THREAD_BACKEND], f"Unknown loader backend {backend}"
         self.num_processes = num_processes
         self.num_chunks = num_chunks
+        self.backend = backend
 
         self.input_chunks = self.compute_chunks()
+        # The chunks are parsed in any order, so ability names can't be resolved while parsing them. The ability info lines are collected while
+        # scanning the file for the chunk offsets instead.
+        self.__ability_info_lines: List[str] = []
+        line_marker = EventFilter.ABILITY_INFO_MARKER if self.event_filter is not None and self.event_filter.has_ability_names else None
         # TODO: load from cache
-        self.chunk_metadata: List[ChunkMetadata] = ChunkMetadata.load_from_log(self.file, self.input_chunks)
+        with span("chunk_metadata", file=str(self.file)) as metadata_span:
+            self.chunk_metadata: List[ChunkMetadata] = ChunkMetadata.load_from_log(self.file, self.input_chunks, offset=self.offset,
+                                                                                   line_marker=line_marker, marked_lines=self.__ability_info_lines)
+            metadata_span.add_events(len(self.input_chunks))
 
     def compute_chunks(self) -> List[Tuple[int, int]]:
         """
@@ -71,64 +131,116 @@ class ParallelLoader(LogLoader):
         May produce one more chunk than defined, if the number of lines is not divisible by the number of chunks.
         @return: List of consecutive chunks.
         """
-        chunk_size = int(self.num_lines / self.num_chunks)
+        # Only lines that are loaded are split into chunks
+        chunk_size = max(int(self.num_loaded_lines / self.num_chunks), 1)
         input_chunks = []
         id_offset = 0
-        while id_offset < self.num_lines:
-            chunk_end = min(id_offset + chunk_size, self.num_lines)
+        while id_offset < self.num_loaded_lines:
+            chunk_end = min(id_offset + chunk_size, self.num_loaded_lines)
             input_chunks.append((id_offset, chunk_end))
             id_offset = chunk_end
 
         return input_chunks
 
+    def _line_filter(self):
+        if self.event_filter is None:
+            return None
+        return self.event_filter.line_filter(self.__ability_info_lines)
+
     def _load_log(self) -> List[EncounterLog]:
-        def read_log_chunk(chunk: ChunkMetadata, path: Path):
-            csv_chunk = read_csv_chunk(str(path), chunk=chunk)
+        # Resolve the filter once instead of in every chunk
+        line_filter = self._line_filter()
+        # Created before the workers, so that they add the bytes they read to the same bar
+        progress = self._progress_bar()
+
+        def read_log_chunk(chunk: ChunkMetadata, path: Path) -> LogChunk:
+            with span("parse_chunk", chunk=chunk.chunk_begin) as chunk_span:
+                log_chunk = parse_log_chunk(chunk, path)
+                chunk_span.add_events(chunk.chunk_end - chunk.chunk_begin)
+            return log_chunk
+
+        def parse_log_chunk(chunk: ChunkMetadata, path: Path) -> LogChunk:
+            csv_chunk = read_csv_chunk(str(path), chunk=chunk, line_filter=line_filter, progress=progress)
             current_id = chunk.chunk_begin
             events = []
+            # The lines of the chunk may belong to multiple logs
+            current_segment = LogSegment()
+            # The events are indexed while loading them, so that the parent process only needs to merge the indexes of the chunks
+            current_index = EventIndex(partial=True)
+            segments = [(current_segment, None, current_index)]
 
             for line in csv_chunk:
                 try:
-                    # We don't have a log to pass to the event yet.
-                    events.append(self._load_line(current_id, None, line))
+                    event = self._load_line(current_id, current_segment, line)
                 except IndexError as e:
                     self.logger.error(f"Error {e} parsing line {current_id}: {line}")
-                finally:
-                    current_id += 1
-
-            return (chunk.chunk_begin, chunk.chunk_end), events
-
-        read_log_task = ParallelTask(description=self._description,
-                                     num_processes=self.num_processes,
-                                     input_objects=self.chunk_metadata,
-                                     task_function=read_log_chunk,
-                                     result_collector=LogCollector(self.input_chunks),
-                                     task_function_kwargs={
-                                         "path": self.file
-                                     })
+                    event = None
+                events.append(event)
+                current_id += 1
+                if event is None:
+                    continue
+                current_index.add(event)
+
+                if isinstance(event, EndLog):
+                    # A separate log starts after this line
+                    segments[-1] = (current_segment, current_id, current_index)
+                    current_segment = LogSegment()
+                    current_index = EventIndex(partial=True)
+                    segments.append((current_segment, None, current_index))
+
+            return LogChunk((chunk.chunk_begin, chunk.chunk_end), events, segments)
+
+        if self.backend == self.THREAD_BACKEND:
+            read_log_task = ThreadedTask(description=self._description,
+                                         num_threads=self.num_processes,
+                                         input_objects=self.chunk_metadata,
+                                         task_function=read_log_chunk,
+                                         result_collector=LogCollector(self.input_chunks, multiple=self.multiple),
+                                         task_function_kwargs={
+                                             "path": self.file
+                                         },
+                                         progress=progress)
+        else:
+            read_log_task = ParallelTask(description=self._description,
+                                         num_processes=self.num_processes,
+                                         input_objects=self.chunk_metadata,
+                                         task_function=read_log_chunk,
+                                         result_collector=LogCollector(self.input_chunks, multiple=self.multiple),
+                                         task_function_kwargs={
+                                             "path": self.file
+                                         },
+                                         progress=progress)
         chunk_iterator = read_log_task.execute()
-        events = []
+        if progress is not None:
+            progress.close()
+        # Contains the events of all logs in the file at the index of their line
+        store = []
 
         logs = []
-        id_offset = 0
-        current_log = EncounterLog()
+        log_begin = 0
+        current_log: EncounterLog = None
+        current_index: EventIndex = None
         self.logger.info("Aggregating events")
-        for index, event in enumerate(chunk_iterator):
-            # Reset the ids to 0 starting at each begin log event to ensure that the ids equal their index in the event list.
-            event.id = event.id - id_offset
-            # Set the log object, since it could not be done when reading the file and creating the object.
-            event.encounter_log = current_log
-            events.append(event)
-
-            # Separate logs into different objects if there are multiple logs in the file
-            if isinstance(event, EndLog):
-                current_log.events = events[id_offset:index + 1]
-                logs.append(current_log)
-                if self.multiple:
-                    # We have a separate log starting after this line
-                    events = []
-                    id_offset = index + 1
+        for log_chunk in chunk_iterator:
+            store.extend(log_chunk.events)
+
+            for segment, log_end, segment_index in log_chunk.segments:
+                if current_log is None:
                     current_log = EncounterLog()
-                else:
-                    break
+                    current_index = EventIndex()
+                # Point the segment to its log instead of passing the log to each of the segment's events, so that the events of all segments
+                # resolve the same log object
+                segment.log = current_log
+                # Stitch the index of the segment to the index of the preceding segments of the log
+                current_index.merge(segment_index)
+
+                # Separate logs into different objects if there are multiple logs in the file
+                if log_end is not None:
+                    current_log.assign_events(store, log_begin, log_end, current_index)
+                    logs.append(current_log)
+                    if not self.multiple:
+                        return logs
+                    # We have a separate log starting after this line
+                    log_begin = log_end
+                    current_log = None
         return logs
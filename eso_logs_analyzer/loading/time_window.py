@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, List, Tuple, Set, Type
+
+from .event_filter import EventFilter
+from ..models.data.events import Event, BeginCombat, EndCombat, EndLog
+from ..models.postprocessing import EncounterTracker
+
+
+class TimeWindow:
+    # Format of the times in the name of the window
+    __NAME_TIME_FORMAT: str = "%Y_%m_%d_%H_%M_%S"
+    # Events before the window that are loaded as well, since they define the state of the log at the beginning of the window (e.g., its units,
+    # abilities and trials)
+    PREAMBLE_EVENTS: Set[Type[Event]] = EventFilter.STRUCTURAL_EVENTS - {BeginCombat, EndCombat, EndLog}
+
+    def __init__(self, since: datetime = None, until: datetime = None):
+        """
+        Restricts the loaded events of a log to a period of time. Event ids are the milliseconds since the begin log event, so the period maps to a
+        range of event ids in each log. Combat encounters overlapping the period are loaded completely.
+        @param since: If set, events before this time are not loaded.
+        @param until: If set, events after this time are not loaded.
+        """
+        assert since is None or until is None or since <= until, f"Time window begins at {since} after it ends at {until}"
+        self.since = since
+        self.until = until
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(since={self.since}, until={self.until})"
+
+    __repr__ = __str__
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Identifies the window. Results computed from logs loaded in a window are only valid for windows with the same fingerprint.
+        """
+        since = self.since.isoformat() if self.since is not None else None
+        until = self.until.isoformat() if self.until is not None else None
+        return f"{since}/{until}"
+
+    @property
+    def name(self) -> str:
+        """
+        Identifies the window in file names, e.g., "since_2023_06_15_22_00_00_until_2023_06_16_00_00_00".
+        """
+        parts = []
+        if self.since is not None:
+            parts.append(f"since_{self.since.strftime(self.__NAME_TIME_FORMAT)}")
+        if self.until is not None:
+            parts.append(f"until_{self.until.strftime(self.__NAME_TIME_FORMAT)}")
+        return "_".join(parts)
+
+    def event_ids(self,
+                  begin_time: datetime,
+                  begin_event_id: int,
+                  end_event_id: int,
+                  combats: List[Tuple[int, Optional[int]]]) -> Optional[Tuple[int, int]]:
+        """
+        Computes the event ids of a log that are loaded.
+        @param begin_time: Time of the begin log event of the log.
+        @param begin_event_id: Event id of the begin log event.
+        @param end_event_id: Event id of the end log event.
+        @param combats: The event ids of the begin and end combat events of the log in order. The end is None for combats that did not end.
+        @return: The first and last event id that is loaded or None, if the log does not overlap the window.
+        """
+        first = begin_event_id + int((self.since - begin_time).total_seconds() * 1000) if self.since is not None else begin_event_id
+        last = begin_event_id + int((self.until - begin_time).total_seconds() * 1000) if self.until is not None else end_event_id
+        if first > end_event_id or last < begin_event_id:
+            return None
+
+        for encounter_begin, encounter_end in self.__encounters(combats, end_event_id):
+            if encounter_begin <= last and encounter_end >= first:
+                first = min(first, encounter_begin)
+                last = max(last, encounter_end)
+        return max(first, begin_event_id), min(last, end_event_id)
+
+    @staticmethod
+    def __encounters(combats: List[Tuple[int, Optional[int]]], end_event_id: int) -> List[Tuple[int, int]]:
+        """
+        Groups the combats into encounters the same way the encounter tracker does.
+        @return: The event ids of the beginning and end of each encounter.
+        """
+        phase_delta = int(EncounterTracker.COMBAT_PHASE_DELTA.total_seconds() * 1000)
+        encounters = []
+        for combat_begin, combat_end in combats:
+            combat_end = combat_end if combat_end is not None else end_event_id
+            if encounters and combat_begin - encounters[-1][1] < phase_delta:
+                encounters[-1] = (encounters[-1][0], combat_end)
+            else:
+                encounters.append((combat_begin, combat_end))
+        return encounters
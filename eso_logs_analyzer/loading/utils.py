@@ -1,24 +1,253 @@
 import csv
+import hashlib
 import platform
+import re
 import sys
 from pathlib import Path
-from typing import Set, Generator, Union
+from typing import Set, Generator, Union, Callable, Iterable, Optional, List, Tuple
 
+from .compression import open_log, has_random_access
+from ..progress import ProgressBar
 
-def get_num_lines(file_name: Union[str, Path]) -> int:
+
+def get_num_lines(file_name: Union[str, Path], offset: int = 0, end: int = None) -> int:
     """
     Fast counting of the number of lines in large files (https://stackoverflow.com/a/9631635).
+    @param file_name: Name of the file.
+    @param offset: Byte offset at which counting starts. Has to be the beginning of a line.
+    @param end: If set, byte offset at which counting stops.
     """
 
     def blocks(file, size=65536):
-        while True:
-            b = file.read(size)
+        remaining = end - offset if end is not None else None
+        while remaining is None or remaining > 0:
+            b = file.read(size if remaining is None else min(size, remaining))
             if not b:
                 break
+            if remaining is not None:
+                remaining -= len(b)
             yield b
 
-    with open(file_name, "r", encoding="utf-8", errors="ignore") as f:
-        return sum(bl.count("\n") for bl in blocks(f))
+    with open_log(file_name, "rb") as f:
+        f.seek(offset)
+        return sum(bl.count(b"\n") for bl in blocks(f))
+
+
+def find_first_line(file_name: Union[str, Path], pattern: re.Pattern, block_size: int = 1 << 20, offset: int = 0) -> Optional[int]:
+    """
+    Finds the first line matching a pattern by searching the raw bytes of the file, which is much faster than reading the file line by line.
+    @param file_name: Name of the file.
+    @param pattern: Bytes pattern that has to match a whole line including its line break.
+    @param block_size: Number of bytes that are read at once.
+    @param offset: Byte offset at which the search starts. Has to be the beginning of a line. Lines are counted from this offset.
+    @return: Index of the first matching line or None, if no line matches.
+    """
+    num_lines = 0
+    remainder = b""
+    with open_log(file_name, "rb") as file:
+        file.seek(offset)
+        while True:
+            block = file.read(block_size)
+            # Add a line break to the last line of the file, if it does not end with one
+            data = remainder + (block if block else b"\n")
+            match = pattern.search(data)
+            if match is not None:
+                return num_lines + data.count(b"\n", 0, match.start())
+            if not block:
+                return None
+
+            # Search the incomplete last line again with the next block
+            last_line_break = data.rfind(b"\n") + 1
+            num_lines += data.count(b"\n", 0, last_line_break)
+            remainder = data[last_line_break:]
+
+
+def find_last_line_end(file_name: Union[str, Path], pattern: re.Pattern, block_size: int = 1 << 20, offset: int = 0) -> Optional[int]:
+    """
+    Finds the last line matching a pattern by searching the raw bytes of the file backwards from its end.
+    @param file_name: Name of the file.
+    @param pattern: Bytes pattern that has to match a whole line including its line break.
+    @param block_size: Number of bytes that are read at once.
+    @param offset: Byte offset at which the search stops. Has to be the beginning of a line.
+    @return: Byte offset after the line break of the last matching line or None, if no line matches.
+    """
+    if not has_random_access(file_name):
+        # Reading the file backwards would decompress it from its beginning for each block
+        return __find_last_line_end_forward(file_name, pattern, block_size, offset)
+
+    remainder = b""
+    with open_log(file_name, "rb") as file:
+        block_end = file.seek(0, 2)
+        while block_end > offset:
+            block_begin = max(offset, block_end - block_size)
+            file.seek(block_begin)
+            data = file.read(block_end - block_begin) + remainder
+            # The first line of the block may be incomplete, unless the block starts at the offset. Search it again with the previous block.
+            lines_begin = data.find(b"\n") + 1 if block_begin > offset else 0
+            last_match = None
+            for last_match in pattern.finditer(data, lines_begin):
+                pass
+            if last_match is not None:
+                return block_begin + last_match.end()
+            remainder = data[:lines_begin]
+            block_end = block_begin
+    return None
+
+
+def __find_last_line_end_forward(file_name: Union[str, Path], pattern: re.Pattern, block_size: int, offset: int) -> Optional[int]:
+    """
+    Finds the last line matching a pattern by searching the whole file from the offset.
+    """
+    last_end = None
+    remainder_offset = offset
+    remainder = b""
+    with open_log(file_name, "rb") as file:
+        file.seek(offset)
+        while True:
+            block = file.read(block_size)
+            if not block:
+                return last_end
+            data = remainder + block
+            # Search the incomplete last line again with the next block
+            last_line_break = data.rfind(b"\n") + 1
+            for match in pattern.finditer(data, 0, last_line_break):
+                last_end = remainder_offset + match.end()
+            remainder_offset += last_line_break
+            remainder = data[last_line_break:]
+
+
+def find_event_lines(file_name: Union[str, Path],
+                     event_types: Iterable[str],
+                     block_size: int = 1 << 24,
+                     offset: int = 0,
+                     end: int = None) -> Tuple[List[Tuple[int, int, str]], int]:
+    """
+    Finds the lines of the given event types by searching the raw bytes of the file for their event types, which is much faster than reading the
+    file line by line.
+    @param file_name: Name of the file.
+    @param event_types: Event types of the lines.
+    @param block_size: Number of bytes that are read at once.
+    @param offset: Byte offset at which the search starts. Has to be the beginning of a line.
+    @param end: If set, byte offset at which the search stops. Has to be the beginning of a line.
+    @return: The byte offsets of the beginning and the end of each found line with the line itself in the order of the file and the byte offset at
+             which the search stopped.
+    """
+    markers = [f",{event_type}".encode("utf-8") for event_type in event_types]
+    lines = []
+    # Byte offset of the data in the file
+    data_offset = offset
+    remainder = b""
+    with open_log(file_name, "rb") as file:
+        file.seek(offset)
+        while True:
+            remaining = end - data_offset - len(remainder) if end is not None else block_size
+            block = file.read(min(block_size, remaining)) if remaining > 0 else b""
+            # Add a line break to the last line of the file, if it does not end with one
+            data = remainder + (block if block else b"\n")
+            # Search the incomplete last line again with the next block
+            complete = data.rfind(b"\n") + 1
+            for marker in markers:
+                position = data.find(marker, 0, complete)
+                while position != -1:
+                    line_begin = data.rfind(b"\n", 0, position) + 1
+                    line_end = data.find(b"\n", position, complete) + 1
+                    # The marker has to be the event type of the line, which directly follows the event id
+                    if data[line_begin:position].isdigit() and data[position + len(marker):position + len(marker) + 1] in [b",", b"\r", b"\n"]:
+                        lines.append((data_offset + line_begin, data_offset + line_end, data[line_begin:line_end].decode("utf-8", errors="replace")))
+                    position = data.find(marker, line_end, complete)
+            if not block:
+                return sorted(lines, key=lambda line: line[0]), data_offset + len(remainder)
+            data_offset += complete
+            remainder = data[complete:]
+
+
+def __read_event_id(file) -> Tuple[int, Optional[int]]:
+    """
+    Reads the next line with a valid event id.
+    @return: The byte offset of the line and its event id or None, if there is no further line.
+    """
+    while True:
+        line_begin = file.tell()
+        line = file.readline()
+        if not line:
+            return line_begin, None
+        try:
+            return line_begin, int(line[:line.find(b",")])
+        except ValueError:
+            continue
+
+
+def find_event_offset(file_name: Union[str, Path], event_id: int, begin: int, end: int, linear_search_size: int = 1 << 16) -> int:
+    """
+    Finds the first line with an event id that is at least as large as the given event id using a binary search over the byte offsets of the
+    lines. The lines between the offsets have to be ordered by their event ids (i.e., they have to belong to the same log).
+    @param file_name: Name of the file.
+    @param event_id: The event id.
+    @param begin: Byte offset of the first line that is searched.
+    @param end: Byte offset after the last line that is searched.
+    @param linear_search_size: Number of bytes below which the lines are searched one after another.
+    @return: Byte offset of the line or the end, if all lines have smaller event ids.
+    """
+    # Begin is always the beginning of a line with a smaller event id and end the beginning of a line with a larger or equal event id
+    with open_log(file_name, "rb") as file:
+        if has_random_access(file_name):
+            while end - begin > linear_search_size:
+                file.seek((begin + end) // 2)
+                # Skip the rest of the line in which the search position is
+                file.readline()
+                line_begin, line_event_id = __read_event_id(file)
+                if line_event_id is None or line_begin >= end:
+                    break
+                if line_event_id < event_id:
+                    begin = line_begin
+                else:
+                    end = line_begin
+
+        file.seek(begin)
+        while file.tell() < end:
+            line_begin, line_event_id = __read_event_id(file)
+            if line_event_id is None or line_begin >= end:
+                break
+            if line_event_id >= event_id:
+                return line_begin
+    return end
+
+
+def prefix_fingerprint(file_name: Union[str, Path], size: int, sample_size: int = 1 << 20) -> str:
+    """
+    Computes a fingerprint of the beginning of a file without reading all of it. The fingerprint consists of the size of the prefix and the hash
+    of the data at its beginning and end. It does not change if data is appended to the file.
+    @param file_name: Name of the file.
+    @param size: Number of bytes at the beginning of the file that are identified.
+    @param sample_size: Number of bytes that are hashed at the beginning and end of the prefix.
+    @return: Hex digest identifying the beginning of the file.
+    """
+    fingerprint = hashlib.sha256(f"{size}".encode("utf-8"))
+    with open_log(file_name, "rb") as file:
+        fingerprint.update(file.read(min(size, sample_size)))
+        if size > sample_size:
+            file.seek(max(sample_size, size - sample_size))
+            fingerprint.update(file.read(size - max(sample_size, size - sample_size)))
+    return fingerprint.hexdigest()
+
+
+def file_fingerprint(file_name: Union[str, Path], sample_size: int = 1 << 20) -> str:
+    """
+    Computes a fingerprint of a file without reading all of its contents. The fingerprint consists of the size and modification time of the file
+    and the hash of the data at its beginning and end.
+    @param file_name: Name of the file.
+    @param sample_size: Number of bytes that are hashed at the beginning and end of the file.
+    @return: Hex digest identifying the file.
+    """
+    path = Path(file_name)
+    stat = path.stat()
+    fingerprint = hashlib.sha256(f"{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    with open(path, "rb") as file:
+        fingerprint.update(file.read(sample_size))
+        if stat.st_size > sample_size:
+            file.seek(max(sample_size, stat.st_size - sample_size))
+            fingerprint.update(file.read(sample_size))
+    return fingerprint.hexdigest()
 
 
 def __get_sys_max_size():
@@ -35,11 +264,22 @@ def __get_sys_max_size():
             return (1 << 31) - 1
 
 
+def __filter_lines(lines: Iterable[str], line_filter: Callable[[str], bool]) -> Generator[str, None, None]:
+    """
+    Replaces the lines rejected by the filter with empty lines, which the csv reader returns as empty rows without parsing them.
+    """
+    for line in lines:
+        yield line if line_filter(line) else "\n"
+
+
 def read_csv(file_name: str,
              delimiter: str = ",",
              quotechar: str = '"',
              has_header: bool = True,
-             columns_to_keep: Set[str] = None) -> Generator[Union[str, dict], None, None]:
+             columns_to_keep: Set[str] = None,
+             line_filter: Callable[[str], bool] = None,
+             offset: int = 0,
+             progress: ProgressBar = None) -> Generator[Union[str, dict], None, None]:
     """
     Reads a CSV file in sequence and returns the contents in the form of a generator.
     @param file_name: Name of the file.
@@ -47,11 +287,17 @@ def read_csv(file_name: str,
     @param quotechar: Character used to encapsulate strings.
     @param has_header: If set to true, the first line will be used as header and each row will be returned as dictionary with the header fields as keys.
     @param columns_to_keep: If non-empty, the returned rows only contain the data for these fields. May only be used with a header.
+    @param line_filter: If set, only the raw lines for which this function returns True are parsed. The rows of all other lines are empty, so that
+           the number of a row still equals its line number. Is applied to the header as well.
+    @param offset: Byte offset at which reading starts. Has to be the beginning of a line.
+    @param progress: If set, the bytes read from the file are added to the progress bar.
     @return: The parsed lines in the form of a generator.
     """
     csv.field_size_limit(__get_sys_max_size())
-    with open(file_name, 'r') as file:
-        data = csv.reader(file, delimiter=delimiter, quotechar=quotechar)
+    with open_log(file_name, "r", progress=progress) as file:
+        file.seek(offset)
+        lines = __filter_lines(file, line_filter) if line_filter is not None else file
+        data = csv.reader(lines, delimiter=delimiter, quotechar=quotechar)
         if has_header:
             header = next(data)
             for row in data:
@@ -67,13 +313,20 @@ def read_csv(file_name: str,
                 yield line
 
 
-def read_csv_chunk(file_name: str, chunk, delimiter: str = ",", quotechar: str = '"') -> Generator[Union[str, dict], None, None]:
+def read_csv_chunk(file_name: str,
+                   chunk,
+                   delimiter: str = ",",
+                   quotechar: str = '"',
+                   line_filter: Callable[[str], bool] = None,
+                   progress: ProgressBar = None) -> Generator[Union[str, dict], None, None]:
     """
     Reads part of a CSV file and returns the contents in the form of a generator.
     @param file_name: Name of the file.
     @param chunk: Chunk that defines part of the file that will be read.
     @param delimiter: The CSV delimiter.
     @param quotechar: Character used to encapsulate strings.
+    @param line_filter: If set, only the raw lines for which this function returns True are parsed. The rows of all other lines are empty.
+    @param progress: If set, the bytes read from the file are added to the progress bar.
     @return: The parsed lines in the defined chunk in the form of a generator.
     """
 
@@ -81,7 +334,7 @@ def read_csv_chunk(file_name: str, chunk, delimiter: str = ",", quotechar: str =
         """
         Reads part of a file and returns each line the form of a generator.
         """
-        with open(file, 'r') as file_obj:
+        with open_log(file, "r", progress=progress) as file_obj:
             file_obj.seek(chunk.offset)
             num_lines = 0
             while num_lines < chunk.num_lines:
@@ -89,6 +342,9 @@ def read_csv_chunk(file_name: str, chunk, delimiter: str = ",", quotechar: str =
                 num_lines += 1
 
     csv.field_size_limit(__get_sys_max_size())
-    data = csv.reader(line_generator(file_name), delimiter=delimiter, quotechar=quotechar)
+    lines = line_generator(file_name)
+    if line_filter is not None:
+        lines = __filter_lines(lines, line_filter)
+    data = csv.reader(lines, delimiter=delimiter, quotechar=quotechar)
     for line in data:
         yield line
@@ -0,0 +1,99 @@
+import csv
+from itertools import islice, chain
+from pathlib import Path
+from typing import Union, Dict, Type, Iterable, List, Tuple, Optional
+
+from .event_filter import EventFilter
+from .log_loader import LogLoader
+from .time_window import TimeWindow
+from .utils import find_event_lines, find_event_offset, get_num_lines, read_csv
+from ..models.data.events import TargetEvent, BeginLog, EndLog, BeginCombat, EndCombat
+from ..progress import ProgressBar
+from ..utils import parse_epoch_time
+
+
+class WindowLoader(LogLoader):
+    # Events that describe the logs of a file and the combats in them
+    __STRUCTURE_EVENT_TYPES: List[str] = [BeginLog.event_type, EndLog.event_type, BeginCombat.event_type, EndCombat.event_type]
+
+    def __init__(self,
+                 file: Union[str, Path],
+                 window: TimeWindow,
+                 multiple: bool = False,
+                 event_filter: EventFilter = None,
+                 projection: Dict[Type[TargetEvent], Iterable[str]] = None):
+        """
+        Loads only the events of an encounterlog file that are in a time window. The logs and combats of the file are found by searching its raw
+        bytes. The beginning and end of the window in each log are found by a binary search over the byte offsets of its lines, since the lines of a
+        log are ordered by their event ids. Only the lines in the window and the preamble lines before it are parsed. The ids of the events are
+        the indices of the loaded lines instead of their line numbers.
+        @param file: File containing the encounter log data.
+        @param window: The time window.
+        @param multiple: If set to True, all logs overlapping the window are loaded. Otherwise, only the first one is loaded.
+        @param event_filter: If set, only the events passing the filter are loaded.
+        @param projection: If set, only the listed unit state attributes are loaded for events of the given types.
+        """
+        super().__init__(file=file, multiple=multiple, event_filter=event_filter, projection=projection)
+        self.window = window
+        self.__regions = self.__find_regions()
+        if not self.__regions:
+            self.logger.warning(f"No log in {self.file} overlaps {self.window}")
+        if not self.multiple:
+            self.__regions = self.__regions[:1]
+        self.num_loaded_lines = sum([len(preamble) + num_lines + 1 for preamble, _, num_lines, _ in self.__regions])
+
+    @property
+    def _description(self):
+        return f"Parsing log {self.file} from {self.window.since} until {self.window.until}"
+
+    def __find_regions(self) -> List[Tuple[List[str], int, int, str]]:
+        """
+        Finds the part of each log that overlaps the window.
+        @return: The preamble lines, the byte offset and number of lines of the window and the end log line of each log overlapping the window.
+        """
+        structure_lines, _ = find_event_lines(self.file, self.__STRUCTURE_EVENT_TYPES)
+        preamble_event_types = [event_type.event_type for event_type in TimeWindow.PREAMBLE_EVENTS]
+        regions = []
+        log = None
+        for line_begin, line_end, line in structure_lines:
+            columns = next(csv.reader([line]))
+            event_id, event_type = int(columns[0]), columns[1]
+            if event_type == BeginLog.event_type:
+                # Begin log lines have the format "<event id>,BEGIN_LOG,<epoch time>,..."
+                log = {"begin": line_begin, "event_id": event_id, "time": parse_epoch_time(columns[2]), "combats": []}
+            elif log is None:
+                # Lines before the first log
+                continue
+            elif event_type == BeginCombat.event_type:
+                log["combats"].append((event_id, None))
+            elif event_type == EndCombat.event_type and log["combats"]:
+                log["combats"][-1] = (log["combats"][-1][0], event_id)
+            elif event_type == EndLog.event_type:
+                event_ids = self.window.event_ids(log["time"], log["event_id"], event_id, log["combats"])
+                if event_ids is not None:
+                    first, last = event_ids
+                    window_begin = find_event_offset(self.file, first, log["begin"], line_begin)
+                    # The end log line is loaded separately, since the window may end before it
+                    window_end = find_event_offset(self.file, last + 1, window_begin, line_begin)
+                    preamble, _ = find_event_lines(self.file, preamble_event_types, offset=log["begin"], end=window_begin)
+                    regions.append(([preamble_line for _, _, preamble_line in preamble],
+                                    window_begin,
+                                    get_num_lines(self.file, offset=window_begin, end=window_end),
+                                    line))
+                log = None
+        return regions
+
+    @property
+    def _num_bytes(self) -> Optional[int]:
+        # Only the lines of the windows are read
+        return None
+
+    def _read_rows(self, progress: ProgressBar = None) -> Iterable[List[str]]:
+        # Ability names are resolved while reading the lines, since only the ability info lines before the end of the window are read
+        line_filter = self.event_filter.incremental_line_filter() if self.event_filter is not None else None
+        for preamble, window_begin, num_window_lines, end_log_line in self.__regions:
+            # Preamble lines are structural events, which the event filter accepts, but ability info lines are needed to resolve ability names
+            preamble_lines = [line for line in preamble if line_filter is None or line_filter(line)]
+            window_rows = islice(read_csv(str(self.file), has_header=False, line_filter=line_filter, offset=window_begin,
+                                       progress=progress), num_window_lines)
+            yield from chain(csv.reader(preamble_lines), window_rows, csv.reader([end_log_line]))
@@ -1 +1 @@
-from .logger import init_loggers, get_logger, get_event_logger
+from .logger import init_loggers, get_logger, get_event_logger, repeat_key, log_suppressed_messages
@@ -0,0 +1,22 @@
+import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+
+
+class LogQueueHandler(QueueHandler):
+
+    def __init__(self, listener: QueueListener):
+        """
+        Passes the records of all loggers to the thread of a listener, which writes them with a single handler for each output. Records of forked
+        worker processes are written synchronously, since the thread of the listener only runs in the process that created it.
+        @param listener: Listener that handles the records.
+        """
+        super().__init__(listener.queue)
+        self.listener = listener
+        self.pid = os.getpid()
+
+    def emit(self, record: logging.LogRecord):
+        if os.getpid() == self.pid:
+            super().emit(record)
+        else:
+            self.listener.handle(record)
@@ -1,12 +1,24 @@
+import atexit
 import logging
+import os
+from logging.handlers import QueueListener
+from queue import SimpleQueue
+from typing import Hashable
 
 from python_json_config import Config
 from python_json_config.config_node import ConfigNode
 
 from .event_formatter import EventFormatter
+from .log_queue_handler import LogQueueHandler
+from .repeated_message_filter import RepeatedMessageFilter
 
 __LOG_INITIALIZED = False
 __LOG_CONFIG: ConfigNode = None
+# Writes the records of all loggers to the console and the log file in a separate thread
+__LOG_LISTENER: QueueListener = None
+# Shared by all loggers
+__QUEUE_HANDLER: LogQueueHandler = None
+__REPEATED_MESSAGE_FILTER: RepeatedMessageFilter = None
 
 
 def __empty_log_file():
@@ -23,8 +35,25 @@ def __log_formatter() -> logging.Formatter:
     return logging.Formatter("%(name)s - %(levelname)s - %(asctime)s - %(message)s")
 
 
+def __acquire_handlers():
+    # Forked processes write with copies of the handlers, which must not be in the middle of writing a record
+    for handler in __LOG_LISTENER.handlers:
+        handler.acquire()
+
+
+def __release_handlers():
+    for handler in __LOG_LISTENER.handlers:
+        handler.release()
+
+
+def __stop_listener():
+    # Forked processes don't run the thread of the listener
+    if __QUEUE_HANDLER.pid == os.getpid():
+        __LOG_LISTENER.stop()
+
+
 def init_loggers(config: Config):
-    global __LOG_INITIALIZED, __LOG_CONFIG
+    global __LOG_INITIALIZED, __LOG_CONFIG, __LOG_LISTENER, __QUEUE_HANDLER, __REPEATED_MESSAGE_FILTER
     if not __LOG_INITIALIZED:
         __LOG_INITIALIZED = True
         __LOG_CONFIG = config.logging
@@ -37,6 +66,24 @@ def init_loggers(config: Config):
         logging.basicConfig(level=logging.NOTSET)
         logging.root.handlers[0].setFormatter(__log_formatter())
 
+        stream_handler = logging.StreamHandler()
+        stream_handler.setLevel(logging.getLevelName(__LOG_CONFIG.console_level))
+        stream_handler.setFormatter(__log_formatter())
+        # Also log to the log file with a different level
+        file_handler = logging.FileHandler(__LOG_CONFIG.file)
+        file_handler.setLevel(logging.getLevelName(__LOG_CONFIG.file_level))
+        file_handler.setFormatter(__log_formatter())
+
+        __LOG_LISTENER = QueueListener(SimpleQueue(), stream_handler, file_handler, respect_handler_level=True)
+        __LOG_LISTENER.start()
+        # Write the remaining records before exiting
+        atexit.register(__stop_listener)
+        os.register_at_fork(before=__acquire_handlers, after_in_parent=__release_handlers)
+
+        __QUEUE_HANDLER = LogQueueHandler(__LOG_LISTENER)
+        __REPEATED_MESSAGE_FILTER = RepeatedMessageFilter(max_repeats=__LOG_CONFIG.max_repeats or 1)
+        __QUEUE_HANDLER.addFilter(__REPEATED_MESSAGE_FILTER)
+
 
 def __get_logger(name: str):
     """
@@ -52,6 +99,10 @@ def __get_logger(name: str):
 
 
 def get_logger(name: str, console_level=None, file_level=None):
+    """
+    Creates a logger that passes its records to the shared handlers of the console and the log file. The levels limit which records the logger
+    creates, while the levels of the config decide which records are written to each output.
+    """
     global __LOG_CONFIG
     assert __LOG_CONFIG is not None, f"Trying to load logger {name} before loggers were initialized."
 
@@ -62,21 +113,29 @@ def get_logger(name: str, console_level=None, file_level=None):
 
     logger = __get_logger(name=name)
     logger.setLevel(min(console_level, file_level))
-    # logger.handlers.clear()
-    stream_handler = logging.StreamHandler()
-    stream_handler.setLevel(console_level)
-    stream_handler.setFormatter(__log_formatter())
-    logger.addHandler(stream_handler)
-
-    # Also log to the log file with a different level
-    file_handler = logging.FileHandler(__LOG_CONFIG.file)
-    file_handler.setLevel(file_level)
-    file_handler.setFormatter(__log_formatter())
-    logger.addHandler(file_handler)
+    logger.addHandler(__QUEUE_HANDLER)
 
     return logger
 
 
+def repeat_key(key: Hashable) -> dict:
+    """
+    Limits how often a message is logged for the key (e.g., the unit id the message is about).
+    Usage: logger.error("No unit found with unit id %s", unit_id, extra=repeat_key(unit_id))
+    """
+    return {RepeatedMessageFilter.KEY_ATTRIBUTE: key}
+
+
+def log_suppressed_messages():
+    """
+    Logs how often each repeated message was suppressed since the last call.
+    """
+    if __REPEATED_MESSAGE_FILTER is None:
+        return
+    for name, level, message, key, count in __REPEATED_MESSAGE_FILTER.pop_suppressed():
+        logging.getLogger(name).log(level, "Suppressed %d repeats of message '%s' for %s", count, message, key)
+
+
 def get_event_logger(name: str, console_level=None):
     global __LOG_CONFIG
     assert __LOG_CONFIG is not None, f"Trying to load logger {name} before loggers were initialized."
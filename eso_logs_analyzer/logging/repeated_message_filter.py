@@ -0,0 +1,42 @@
+import logging
+import threading
+from typing import Dict, Tuple, Any, List, Hashable
+
+
+class RepeatedMessageFilter(logging.Filter):
+    # Name of the record attribute that identifies what a message is about (e.g., a unit id)
+    KEY_ATTRIBUTE: str = "repeat_key"
+
+    def __init__(self, max_repeats: int = 1):
+        """
+        Limits how often a message is logged for the same key. Messages are identified by their logger, level and unformatted message, so they have
+        to be logged with %-style arguments. Only messages passing a key via the 'extra' argument of the logger are limited.
+        Suppressed messages are counted, so that the number of suppressed messages can be logged instead.
+        @param max_repeats: Number of times a message is logged for each key.
+        """
+        super().__init__()
+        self.max_repeats = max_repeats
+        # Number of times each message was logged for each key
+        self.__counts: Dict[Tuple[str, int, str, Hashable], int] = {}
+        self.__lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, self.KEY_ATTRIBUTE, None)
+        if key is None:
+            return True
+
+        message_key = (record.name, record.levelno, record.msg, key)
+        with self.__lock:
+            count = self.__counts.get(message_key, 0) + 1
+            self.__counts[message_key] = count
+        return count <= self.max_repeats
+
+    def pop_suppressed(self) -> List[Tuple[str, int, str, Any, int]]:
+        """
+        Resets the counts of the messages.
+        @return: The logger name, level, message, key and number of suppressed repeats of each message that was suppressed.
+        """
+        with self.__lock:
+            counts, self.__counts = self.__counts, {}
+        return [(name, level, message, key, count - self.max_repeats) for (name, level, message, key), count in counts.items()
+                if count > self.max_repeats]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Tuple, Optional
+
+from .events import Event, BeginCast, EndCast, TrialInit, ZoneChanged
+from .events.enums import CastStatus
+from ..base import Base
+
+
+class CastMatcher(Base):
+    """
+    Matches casts that are separated into a begin and end cast event while iterating through the events of a log once.
+    Cast effect ids are only unique within a single instance, so the casts are partitioned by the zone changes and trial inits of the log. The casts
+    of a partition are matched as soon as the next partition starts, which keeps the number of casts that need to be stored small.
+    """
+
+    def __init__(self, defer_first_partition: bool = False):
+        """
+        @param defer_first_partition: If set, the casts before the first partition boundary are not matched, since the partition may have started
+               before the first added event. They are matched when this matcher is merged into the matcher of the preceding events (see merge).
+        """
+        super().__init__()
+        # Casts of the current partition in the format cast_effect_id -> ability_id -> (begin cast events, end cast events)
+        self.__casts: Dict[int, Dict[int, Tuple[List[BeginCast], List[EndCast]]]] = {}
+        self.__defer_first_partition = defer_first_partition
+        # Casts before the first partition boundary, if they are deferred and a boundary was found
+        self.__first_partition: Optional[Dict[int, Dict[int, Tuple[List[BeginCast], List[EndCast]]]]] = None
+
+        self.num_missing_begin_casts = 0
+        self.num_missing_end_casts = 0
+        self.num_unmatched_orphaned_end_casts = 0
+
+    def add(self, event: Event):
+        """
+        Processes the next event of the log.
+        """
+        event_type = event.event_type
+        if event_type == BeginCast.event_type:
+            self.__casts_for(event)[0].append(event)
+        elif event_type == EndCast.event_type:
+            self.__casts_for(event)[1].append(event)
+        elif event_type == ZoneChanged.event_type or event_type == TrialInit.event_type:
+            # The player entered a different instance, in which cast effect ids may be reused
+            self.match_partition()
+
+    def __casts_for(self, event: Event) -> Tuple[List[BeginCast], List[EndCast]]:
+        casts_for_ability = self.__casts.get(event.cast_effect_id)
+        if casts_for_ability is None:
+            casts_for_ability = self.__casts[event.cast_effect_id] = {}
+        casts = casts_for_ability.get(event.ability_id)
+        if casts is None:
+            casts = casts_for_ability[event.ability_id] = ([], [])
+        return casts
+
+    def __add_casts(self, casts: Dict[int, Dict[int, Tuple[List[BeginCast], List[EndCast]]]]):
+        """
+        Adds the casts of a partition that directly follow the casts of the current partition.
+        """
+        for cast_effect_id, casts_for_ability in casts.items():
+            current_casts_for_ability = self.__casts.get(cast_effect_id)
+            if current_casts_for_ability is None:
+                self.__casts[cast_effect_id] = casts_for_ability
+                continue
+            for ability_id, (begin_events, end_events) in casts_for_ability.items():
+                current_casts = current_casts_for_ability.get(ability_id)
+                if current_casts is None:
+                    current_casts_for_ability[ability_id] = (begin_events, end_events)
+                    continue
+                current_casts[0].extend(begin_events)
+                current_casts[1].extend(end_events)
+
+    def merge(self, other: CastMatcher):
+        """
+        Continues matching with the casts collected by another matcher for the events directly following the events added to this matcher. Allows
+        collecting the casts of consecutive parts of a log in parallel.
+        @param other: Matcher that deferred its first partition. It can't be used after merging.
+        """
+        assert other.__defer_first_partition, f"Can't merge {CastMatcher.__name__} that did not defer its first partition"
+        if other.__first_partition is not None:
+            # The first partition of the other matcher continues the current partition
+            self.__add_casts(other.__first_partition)
+            self.match_partition()
+        self.__add_casts(other.__casts)
+
+        self.num_missing_begin_casts += other.num_missing_begin_casts
+        self.num_missing_end_casts += other.num_missing_end_casts
+        self.num_unmatched_orphaned_end_casts += other.num_unmatched_orphaned_end_casts
+
+    def close(self):
+        """
+        Matches the casts of the last partition. Has to be called after the last event of the log was added.
+        """
+        self.match_partition()
+
+        if self.num_missing_begin_casts:
+            self.logger.debug(f"{self.num_missing_begin_casts} end cast events did not have matching begin cast events.")
+
+        if self.num_missing_end_casts:
+            self.logger.debug(f"{self.num_missing_end_casts} begin cast events did not have matching end cast events.")
+
+        if self.num_unmatched_orphaned_end_casts:
+            self.logger.debug(f"{self.num_unmatched_orphaned_end_casts} orphaned end cast events could not be matched to begin cast events with the same "
+                              f"cast effect id.")
+
+    @staticmethod
+    def __match_events(begin_cast: BeginCast, end_cast: EndCast):
+        """
+        Sets the appropriate fields to match two events
+        """
+        begin_cast.end_cast = end_cast
+        end_cast.begin_casts.append(begin_cast)
+
+    def match_partition(self):
+        """
+        Matches the casts of the current partition and starts a new partition.
+        """
+        casts = self.__casts
+        self.__casts = {}
+
+        if self.__defer_first_partition and self.__first_partition is None:
+            self.__first_partition = casts
+            return
+
+        # Contains end cast events for which there is no begin cast event with the same cast effect id and ability id
+        missing_ability_id_begin_casts: Dict[int, List[EndCast]] = defaultdict(list)
+
+        for cast_effect_id, casts_for_ability in casts.items():
+            if not any([begin_events for begin_events, _ in casts_for_ability.values()]):
+                # The begin cast event for this cast was not recorded.
+                self.num_missing_begin_casts += 1
+                continue
+
+            if not any([end_events for _, end_events in casts_for_ability.values()]):
+                # The end cast event for this cast was not recorded.
+                self.num_missing_end_casts += 1
+                continue
+
+            for ability_id, (begin_events, end_events) in casts_for_ability.items():
+                if not begin_events:
+                    # This case happens when a cast applies multiple ability ids that have separate end cast events.
+                    missing_ability_id_begin_casts[cast_effect_id].extend(end_events)
+                    continue
+
+                if not end_events:
+                    self.logger.error(f"No end cast event found for cast effect id {cast_effect_id} and ability id {ability_id}")
+                    continue
+
+                self.__match_ability_casts(cast_effect_id, ability_id, begin_events, end_events)
+
+        # Match end cast events for which there was no matching ability id with begin cast events of the same effect cast id but a different ability id.
+        # Only match up end cast events, if there is only a single viable begin cast event that it can be attached to.
+        for cast_effect_id, orphaned_end_casts in missing_ability_id_begin_casts.items():
+            ability_id_to_begin_cast_dict = {ability_id: begin_events for ability_id, (begin_events, _) in casts[cast_effect_id].items() if begin_events}
+            if len(ability_id_to_begin_cast_dict) == 1:
+                # Only match orphaned end cast event if there is only a single ability id in the begin casts dict for this cast effect id
+                ability_id, begin_cast_events = list(ability_id_to_begin_cast_dict.items())[0]
+                if len(begin_cast_events) == 1:
+                    # Only match orphaned end cast event if there is only a single begin cast event candidate
+                    begin_cast_event = begin_cast_events[0]
+                    begin_cast_event.orphaned_end_casts.extend(orphaned_end_casts)
+                    for end_cast_event in orphaned_end_casts:
+                        end_cast_event.begin_casts.append(begin_cast_event)
+                else:
+                    self.num_unmatched_orphaned_end_casts += 1
+                    self.logger.debug("Skipping orphaned end casts for cast effect id %s and ability id %s due to multiple viable begin cast events",
+                                      cast_effect_id, ability_id)
+            else:
+                self.num_unmatched_orphaned_end_casts += 1
+                self.logger.debug("Skipping orphaned end casts for cast effect id %s due to multiple viable begin cast ability ids", cast_effect_id)
+
+    def __match_ability_casts(self, cast_effect_id: int, ability_id: int, begin_events: List[BeginCast], end_events: List[EndCast]):
+        """
+        Matches the begin and end cast events with the same cast effect id and ability id.
+        """
+        if len(begin_events) == 1 and len(end_events) == 1:
+            # There is only a single begin event and a single end event for this cast and ability.
+            self.__match_events(begin_events[0], end_events[0])
+        elif len(begin_events) > 1 and len(end_events) == 1:
+            # There are multiple begin casts that share an end cast.
+            # This is the case with actions that trigger multiple cast events with different effects that all finished with the same state.
+            for begin_event in begin_events:
+                self.__match_events(begin_event, end_events[0])
+        elif len(begin_events) == 1 and len(end_events) > 1:
+            # Sometimes there are cancelled and completed end cast events for the same begin cast.
+            # Ignore the cancelled event cast in this case
+            completed_end_events = [event for event in end_events if event.status == CastStatus.COMPLETED]
+            if len(completed_end_events) > 0:
+                end_event = max(completed_end_events)
+                self.__match_events(begin_events[0], end_event)
+            else:
+                # This case should not happen, but handle it in case it does
+                self.logger.error(f"No completed cast event found for cast effect id {cast_effect_id} with multiple end events")
+                end_event = max(end_events)
+                self.__match_events(begin_events[0], end_event)
+        elif len(begin_events) == 2 and len(end_events) == 2:
+            # Two casts are triggered by the same action and they finish in different states.
+            # The begin cast event with the shorter cast duration was finished and the one with the longer duration was cancelled.
+            begin_events = sorted(begin_events, key=lambda e: e.duration)
+            completed_begin_event = begin_events[0]
+            cancelled_begin_event = begin_events[1]
+            try:
+                completed_end_event = [event for event in end_events if event.status == CastStatus.COMPLETED][0]
+                cancelled_end_event = [event for event in end_events if event.status != CastStatus.COMPLETED][0]
+                self.__match_events(completed_begin_event, completed_end_event)
+                self.__match_events(cancelled_begin_event, cancelled_end_event)
+            except IndexError as e:
+                self.logger.error(f"Error matching casts for effect cast id {cast_effect_id} and ability id {ability_id}: {e}")
+        elif len(begin_events) == len(end_events):
+            # There are more than two different finished states for the end cast events.
+            end_cast_states = [event.status for event in end_events]
+            self.logger.error(
+                f"End cast events have more than two different result states ({end_cast_states}) for cast effect id {cast_effect_id} and ability id {ability_id}")
+        else:
+            # There are different amounts of begin and end cast events. This should never occur
+            self.logger.error(f"Different amounts of begin and end cast events found for cast effect id {cast_effect_id} and ability id {ability_id}")
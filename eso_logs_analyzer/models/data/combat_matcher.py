@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from .events import Event, BeginCombat, EndCombat
+from ..base import Base
+
+
+class CombatMatcher(Base):
+    """
+    Matches begin combat events to their end events while iterating through the events of a log in order.
+    Since combat happens sequentially these events should always happen sequentially as well.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.current_encounter: BeginCombat = None
+
+    def add(self, event: Event):
+        """
+        Processes the next event of the log. Events that are not combat events are ignored.
+        """
+        if isinstance(event, BeginCombat):
+            if self.current_encounter is not None:
+                self.logger.error(f"Entering combat event {event} while already in combat event {self.current_encounter}")
+            self.current_encounter = event
+
+        elif isinstance(event, EndCombat):
+            if self.current_encounter is None:
+                self.logger.error(f"Leaving combat event {event} without being in combat")
+                return
+
+            event.begin_combat = self.current_encounter
+            self.current_encounter.end_combat = event
+            self.current_encounter = None
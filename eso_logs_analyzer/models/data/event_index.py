@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Iterable
+
+from .cast_matcher import CastMatcher
+from .events import Event
+from ..base import Base
+
+
+class EventIndex(Base):
+    """
+    Sorts the events of a log by their type and collects their casts for matching. Consecutive parts of a log can be indexed separately (e.g., in
+    the processes loading the chunks of a log file) and merged in their order afterwards.
+    """
+
+    def __init__(self, partial: bool = False):
+        """
+        @param partial: Set to True if the indexed events are only a part of a log that is merged into the index of the preceding events later on.
+        """
+        super().__init__()
+        self.partial = partial
+        # Events by their type in the order of the log
+        self.event_dict: Dict[str, List[Event]] = defaultdict(list)
+        # Casts that have not been matched yet
+        self.cast_matcher = CastMatcher(defer_first_partition=partial)
+
+    def add(self, event: Event):
+        """
+        Adds the next event of the log.
+        """
+        self.event_dict[event.event_type].append(event)
+        self.cast_matcher.add(event)
+
+    def extend(self, events: Iterable[Event]):
+        """
+        Adds the next events of the log.
+        """
+        event_dict = self.event_dict
+        cast_matcher = self.cast_matcher
+        for event in events:
+            event_dict[event.event_type].append(event)
+            cast_matcher.add(event)
+
+    def merge(self, other: EventIndex):
+        """
+        Adds the events of a partial index of the events directly following the events of this index.
+        @param other: Partial index. It can't be used after merging.
+        """
+        assert other.partial, f"Can only merge partial indexes"
+        for event_type, events in other.event_dict.items():
+            self.event_dict[event_type].extend(events)
+        self.cast_matcher.merge(other.cast_matcher)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import List, Optional, Iterator
+
+from .events import Event
+
+
+class EventView(object):
+    """
+    View of the events of a single log in the event store of a log file. The store is shared by all logs in the file and contains each event at
+    the index of its line. Lines that were not loaded (e.g., skipped by an event filter) are None in the store and are skipped by the view.
+    """
+
+    def __init__(self, store: List[Optional[Event]], begin: int, end: int):
+        """
+        @param store: Events of the log file by line.
+        @param begin: Index of the first line of the log in the store.
+        @param end: Index after the last line of the log in the store.
+        """
+        self.store = store
+        self.begin = begin
+        self.end = end
+        self.__num_events: int = None
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(begin={self.begin}, end={self.end})"
+
+    __repr__ = __str__
+
+    def extend_to(self, end: int):
+        """
+        Extends the view to lines that were added to the store after the view was created (e.g., while a log file is still being written).
+        @param end: Index after the last line of the view.
+        """
+        assert end >= self.end, f"Can't shrink {self} to end {end}"
+        self.end = end
+        self.__num_events = None
+
+    def __iter__(self) -> Iterator[Event]:
+        for event in islice(self.store, self.begin, self.end):
+            if event is not None:
+                yield event
+
+    def __len__(self):
+        if self.__num_events is None:
+            lines = self.store[self.begin:self.end]
+            self.__num_events = len(lines) - lines.count(None)
+        return self.__num_events
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Union
+
+from ..log_segment import LogSegment
 
 if TYPE_CHECKING:
     from ..encounter_log import EncounterLog
@@ -8,18 +10,37 @@ if TYPE_CHECKING:
 
 
 class AbstractEvent(object):
-    def __init__(self, id: int, encounter_log: EncounterLog, *args, **kwargs):
+    def __init__(self, id: int, encounter_log: Union[EncounterLog, LogSegment], *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Line number in the source log file. Represents index in list of events in encounterlog
+        # Line number in the source log file (starting at 0). Represents index in the event store of the log file.
         self.id = id
-        self.encounter_log = encounter_log
+        # Events loaded in a separate part of the file reference the segment of their log until the parts are merged
+        self._encounter_log = encounter_log
+
+    @property
+    def encounter_log(self) -> Optional[EncounterLog]:
+        encounter_log = self._encounter_log
+        return encounter_log.log if type(encounter_log) is LogSegment else encounter_log
+
+    @encounter_log.setter
+    def encounter_log(self, encounter_log: Union[EncounterLog, LogSegment]):
+        self._encounter_log = encounter_log
 
     @property
     def previous(self) -> Optional[Event]:
-        if self.id > 0:
-            return self.encounter_log.events[self.id - 1]
+        # Lines that were not loaded are None in the event store
+        events = self.encounter_log.events
+        index = self.id - 1
+        while index >= events.begin:
+            if events.store[index] is not None:
+                return events.store[index]
+            index -= 1
 
     @property
     def next(self) -> Optional[Event]:
-        if (self.id + 1) < len(self.encounter_log.events):
-            return self.encounter_log.events[self.id + 1]
+        events = self.encounter_log.events
+        index = self.id + 1
+        while index < events.end:
+            if events.store[index] is not None:
+                return events.store[index]
+            index += 1
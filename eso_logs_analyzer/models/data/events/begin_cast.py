@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, FrozenSet
 
 from .enums import CastStatus
 from .event import Event
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 
 class BeginCast(TargetEvent, SpanCast):
     event_type: str = "BEGIN_CAST"
+    ability_id_column: int = 3
 
     def __init__(self,
                  id: int,
@@ -43,7 +44,8 @@ class BeginCast(TargetEvent, SpanCast):
                  target_shield: str = None,
                  target_x_coord: str = None,
                  target_y_coord: str = None,
-                 target_heading_radians: str = None):
+                 target_heading_radians: str = None,
+                 projection: FrozenSet[str] = None):
         super(BeginCast, self).__init__(id=id,
                                         encounter_log=encounter_log,
                                         event_id=event_id,
@@ -67,7 +69,8 @@ class BeginCast(TargetEvent, SpanCast):
                                         target_shield=target_shield,
                                         target_x_coord=target_x_coord,
                                         target_y_coord=target_y_coord,
-                                        target_heading_radians=target_heading_radians)
+                                        target_heading_radians=target_heading_radians,
+                                        projection=projection)
 
         self.duration = timedelta(milliseconds=int(duration_in_ms))
         self.channeled = self._convert_boolean(channeled, field_name="channeled")
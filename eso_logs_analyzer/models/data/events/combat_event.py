@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, FrozenSet
 
 from .enums import CombatEventType, ResourceType, DamageType
 from .target_event import TargetEvent
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
 class CombatEvent(TargetEvent):
     event_type: str = "COMBAT_EVENT"
+    ability_id_column: int = 6
 
     def __init__(self,
                  id: int,
@@ -42,7 +43,8 @@ class CombatEvent(TargetEvent):
                  target_shield: str = None,
                  target_x_coord: str = None,
                  target_y_coord: str = None,
-                 target_heading_radians: str = None):
+                 target_heading_radians: str = None,
+                 projection: FrozenSet[str] = None):
         super(CombatEvent, self).__init__(id=id,
                                           encounter_log=encounter_log,
                                           event_id=event_id,
@@ -66,7 +68,8 @@ class CombatEvent(TargetEvent):
                                           target_shield=target_shield,
                                           target_x_coord=target_x_coord,
                                           target_y_coord=target_y_coord,
-                                          target_heading_radians=target_heading_radians)
+                                          target_heading_radians=target_heading_radians,
+                                          projection=projection)
         # Something like 'HOT_TICK', 'HOT_TICK_CRITICAL', 'QUEUED', 'ABILITY_ON_COOLDOWN'
         self.type: CombatEventType = CombatEventType(type)
         # Damage type for damage events, otherwise 'GENERIC' or 'INVALID'
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, FrozenSet
 
 from .enums import EffectChangedStatus
 from .target_event import TargetEvent
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
 class EffectChanged(TargetEvent):
     event_type: str = "EFFECT_CHANGED"
+    ability_id_column: int = 3
 
     def __init__(self,
                  id: int,
@@ -40,7 +41,8 @@ class EffectChanged(TargetEvent):
                  target_x_coord: str = None,
                  target_y_coord: str = None,
                  target_heading_radians: str = None,
-                 player_initiated_remove_cast_track_id: str = None):
+                 player_initiated_remove_cast_track_id: str = None,
+                 projection: FrozenSet[str] = None):
         super(EffectChanged, self).__init__(id=id,
                                             encounter_log=encounter_log,
                                             event_id=event_id,
@@ -64,7 +66,8 @@ class EffectChanged(TargetEvent):
                                             target_shield=target_shield,
                                             target_x_coord=target_x_coord,
                                             target_y_coord=target_y_coord,
-                                            target_heading_radians=target_heading_radians)
+                                            target_heading_radians=target_heading_radians,
+                                            projection=projection)
         self.status: EffectChangedStatus = EffectChangedStatus[status]
         self.stack_count = int(stack_count)
         # Unique id identifying the cast event that caused this effect changed event.
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
 
 class EndCast(Event, AbstractAbility):
     event_type: str = "END_CAST"
+    ability_id_column: int = 2
 
     def __init__(self,
                  id: int,
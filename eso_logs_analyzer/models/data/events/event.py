@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Type, Dict, TYPE_CHECKING, Tuple
+from typing import Type, Dict, TYPE_CHECKING, Tuple, FrozenSet
 
 from .abstract_event import AbstractEvent
 from .enums import BooleanType
@@ -19,6 +19,8 @@ class Event(Base, AbstractEvent):
     Details for the parameters can be found on: https://esoapi.uesp.net/current/src/ingame/slashcommands/slashcommands_shared.lua.html
     """
     event_type: str = None
+    # Index of the ability id in the arguments following the event type, if the event has one. Allows filtering lines without parsing them.
+    ability_id_column: int = None
     subclass_for_event_type: Dict[str, Type[Event]] = None
 
     def __init__(self, id: int, encounter_log: EncounterLog, event_id: int, *args):
@@ -29,7 +31,7 @@ class Event(Base, AbstractEvent):
         # Contains data fields that have not been parsed into named fields
         self.data = args
 
-        # Time of the event. Computed using the event id and the timestamp in the begin log event.
+        # Time of the event. Computed on first access using the event id and the timestamp in the begin log event.
         self._time: datetime = None
 
         # Previous event in order
@@ -39,6 +41,9 @@ class Event(Base, AbstractEvent):
 
     @property
     def time(self):
+        # The begin log event of the log is only known after the log was initialized
+        if self._time is None and self.encounter_log is not None and self.encounter_log.begin_log is not None:
+            self.compute_event_time(self.encounter_log)
         return self._time
 
     @time.setter
@@ -78,7 +83,7 @@ class Event(Base, AbstractEvent):
         return not self.__lt__(other)
 
     @classmethod
-    def create(cls, id: int, encounter_log: EncounterLog, event_id: int, event_type: str, *args):
+    def create(cls, id: int, encounter_log: EncounterLog, event_id: int, event_type: str, *args, projection: Dict[str, FrozenSet[str]] = None):
         if cls.subclass_for_event_type is None:
             cls.subclass_for_event_type = {subclass.event_type: subclass for subclass in all_subclasses(cls)}
 
@@ -88,7 +93,11 @@ class Event(Base, AbstractEvent):
             raise ValueError(f"No event class found for {event_type}")
 
         subclass = cls.subclass_for_event_type[event_type]
-        instance = subclass(id, encounter_log, event_id, *args)
+        if projection is not None and event_type in projection:
+            # Only the projected unit state columns of the event are converted and stored
+            instance = subclass(id, encounter_log, event_id, *args, projection=projection[event_type])
+        else:
+            instance = subclass(id, encounter_log, event_id, *args)
 
         # Hacky way to change the class of soul gem resurrection events, since they have a non-existing ability id
         if isinstance(instance, CombatEvent) and instance.ability_id == "0":
@@ -116,10 +125,10 @@ class Event(Base, AbstractEvent):
         """
         Set the epoch time for each event by computing the diff to the begin log event.
         """
-        if self.time is None:
-            self.time = encounter_log.begin_log.compute_offset_event_time(self.event_id)
+        if self._time is None:
+            self._time = encounter_log.begin_log.compute_offset_event_time(self.event_id)
         else:
-            self.logger.debug(f"Computing time for event {self} when it is already set")
+            self.logger.debug("Computing time for event %s when it is already set", self)
 
     def compute_offset_event_time(self, event_id: int) -> datetime:
         """
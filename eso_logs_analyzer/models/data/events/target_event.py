@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Tuple, FrozenSet, Iterable, Optional
 
 from .abstract_ability import AbstractAbility
 from .event import Event
+from ....logging import repeat_key
 
 if TYPE_CHECKING:
     from .unit_added import UnitAdded
@@ -11,6 +12,38 @@ if TYPE_CHECKING:
 
 
 class TargetEvent(Event, AbstractAbility):
+    # Columns containing the state of the source and target unit. Maps each column to the attributes it is stored in and whether it is a resource
+    # in the form "current/max" that is converted into two integers.
+    UNIT_STATE_COLUMNS: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+        "health": (("current_health", "max_health"), True),
+        "magicka": (("current_magicka", "max_magicka"), True),
+        "stamina": (("current_stamina", "max_stamina"), True),
+        "ultimate": (("ultimate", "max_ultimate"), True),
+        "werewolf_ultimate": (("werewolf_ultimate",), False),
+        "shield": (("shield",), False),
+        "x_coord": (("x_coord",), False),
+        "y_coord": (("y_coord",), False),
+        "heading_radians": (("heading_radians",), False),
+        "target_health": (("target_current_health", "target_maximum_health"), True),
+        "target_magicka": (("target_current_magicka", "target_maximum_magicka"), True),
+        "target_stamina": (("target_current_stamina", "target_maximum_stamina"), True),
+        "target_ultimate": (("target_ultimate", "target_max_ultimate"), True),
+        "target_werewolf_ultimate": (("target_werewolf_ultimate",), False),
+        "target_shield": (("target_shield",), False),
+        "target_x_coord": (("target_x_coord",), False),
+        "target_y_coord": (("target_y_coord",), False),
+        "target_heading_radians": (("target_heading_radians",), False),
+    }
+    __COLUMN_FOR_ATTRIBUTE: Dict[str, str] = {attribute: column for column, (attributes, _) in UNIT_STATE_COLUMNS.items() for attribute in attributes}
+
+    # Unit state columns that were loaded for this event. If None, all columns were loaded.
+    _projection: FrozenSet[str] = None
+
+    # Units of the event are resolved on first access
+    __UNRESOLVED = object()
+    _unit: Optional[UnitAdded] = __UNRESOLVED
+    _target_unit: Optional[UnitAdded] = __UNRESOLVED
+
     def __init__(self,
                  id: int,
                  encounter_log: EncounterLog,
@@ -35,12 +68,35 @@ class TargetEvent(Event, AbstractAbility):
                  target_shield: str = None,
                  target_x_coord: str = None,
                  target_y_coord: str = None,
-                 target_heading_radians: str = None):
+                 target_heading_radians: str = None,
+                 projection: FrozenSet[str] = None):
+        """
+        Event that is caused by a source unit and may target another unit.
+        @param projection: Unit state columns that are converted and stored. All other unit state columns are skipped. If None, all are stored.
+        """
         super(TargetEvent, self).__init__(id, encounter_log, event_id)
 
         # Source information
         self.unit_id = int(unit_id)
         self.ability_id = int(ability_id)
+        # Target information (if it exists)
+        self.target_unit_id = int(target_unit_id) if target_unit_id != "*" else None
+
+        if projection is not None:
+            self._projection = projection
+            values = (health, magicka, stamina, ultimate, werewolf_ultimate, shield, x_coord, y_coord, heading_radians,
+                      target_health, target_magicka, target_stamina, target_ultimate, target_werewolf_ultimate, target_shield, target_x_coord,
+                      target_y_coord, target_heading_radians)
+            for (column, (attributes, is_resource)), value in zip(self.UNIT_STATE_COLUMNS.items(), values):
+                if column not in projection or (self.target_unit_id is None and column.startswith("target_")):
+                    continue
+                if is_resource:
+                    current_value, max_value = self._convert_resource(value)
+                    setattr(self, attributes[0], current_value)
+                    setattr(self, attributes[1], max_value)
+                else:
+                    setattr(self, attributes[0], value)
+            return
 
         # These values occur in the form '42384/42384'
         self.current_health, self.max_health = self._convert_resource(health)
@@ -55,9 +111,7 @@ class TargetEvent(Event, AbstractAbility):
         self.y_coord = y_coord
         self.heading_radians = heading_radians
 
-        # Target information (if it exists)
-        if target_unit_id != "*":
-            self.target_unit_id = int(target_unit_id)
+        if self.target_unit_id is not None:
             self.target_current_health, self.target_maximum_health = self._convert_resource(target_health)
             self.target_current_magicka, self.target_maximum_magicka = self._convert_resource(target_magicka)
             self.target_current_stamina, self.target_maximum_stamina = self._convert_resource(target_stamina)
@@ -69,13 +123,55 @@ class TargetEvent(Event, AbstractAbility):
             self.target_x_coord = target_x_coord
             self.target_y_coord = target_y_coord
             self.target_heading_radians = target_heading_radians
-        else:
-            self.target_unit_id = None
 
-        # Unit that cast this event
-        self.unit: UnitAdded = None
-        # If set, unit that was targeted by this event
-        self.target_unit: UnitAdded = None
+    def __resolve_unit(self, unit_id: Optional[int]) -> Optional[UnitAdded]:
+        if unit_id is None:
+            return None
+        unit_added = self.encounter_log.units.resolve(unit_id, self.id)
+        if unit_added is None and unit_id:
+            # Events of units that are missing from the log would log an error each
+            self.logger.error("No unit found for event %s with unit id %s", self, unit_id, extra=repeat_key(unit_id))
+        return unit_added
+
+    @property
+    def unit(self) -> Optional[UnitAdded]:
+        """
+        Unit that cast this event.
+        """
+        if self._unit is self.__UNRESOLVED:
+            self._unit = self.__resolve_unit(self.unit_id)
+        return self._unit
+
+    @property
+    def target_unit(self) -> Optional[UnitAdded]:
+        """
+        If set, unit that was targeted by this event.
+        """
+        if self._target_unit is self.__UNRESOLVED:
+            self._target_unit = self.__resolve_unit(self.target_unit_id)
+        return self._target_unit
+
+    def __getattr__(self, name: str):
+        # Only called if the attribute does not exist. Explain missing attributes that were not loaded due to the projection.
+        column = self.__COLUMN_FOR_ATTRIBUTE.get(name)
+        if column is not None and self._projection is not None and column not in self._projection:
+            raise AttributeError(f"Attribute '{name}' of {self.__class__.__name__}(id={self.id}) was not loaded, since column '{column}' is not part of the projection "
+                                 f"{sorted(self._projection)}")
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+    @classmethod
+    def projected_columns(cls, attributes: Iterable[str]) -> FrozenSet[str]:
+        """
+        Computes the unit state columns that need to be loaded to access the given attributes.
+        @param attributes: Names of the unit state attributes that are read from the events.
+        @return: The columns that are part of the projection.
+        """
+        columns = set()
+        for attribute in attributes:
+            if attribute not in cls.__COLUMN_FOR_ATTRIBUTE:
+                raise ValueError(f"{attribute} is not a unit state attribute of {cls.__name__}. Valid attributes: {sorted(cls.__COLUMN_FOR_ATTRIBUTE)}")
+            columns.add(cls.__COLUMN_FOR_ATTRIBUTE[attribute])
+        return frozenset(columns)
 
     def filter_by_type_and_target(self, event_type, target: UnitAdded):
         return isinstance(self, event_type) and self.target_unit == target
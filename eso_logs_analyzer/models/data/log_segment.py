@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .encounter_log import EncounterLog
+
+
+class LogSegment(object):
+    """
+    Placeholder for the log of the events in a part of a log file that is loaded separately (e.g., a chunk loaded in a worker process). The complete
+    log object can't be created while loading the part, so its events reference the segment instead. Once the parts are merged, the segment is
+    pointed to the log it belongs to and the events resolve their log through it.
+    """
+
+    def __init__(self):
+        # The log this segment is part of. Unset until the segments of the log are merged.
+        self.log: Optional[EncounterLog] = None
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(log={self.log})"
+
+    __repr__ = __str__
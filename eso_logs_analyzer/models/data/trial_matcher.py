@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from .events import Event, BeginTrial, EndTrial, TrialInit, BeginCombat
+from .events.enums import TrialId
+from ..base import Base
+
+
+class TrialMatcher(Base):
+    """
+    Matches trial events to their respective end trial events while iterating through the events of a log in order.
+    If a trial was not finished, there won't be a matching end trial event.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.begin_trial_cache: Dict[TrialId, BeginTrial] = {}
+        # Trial init events are triggered even when entering already started trials (where we would miss the begin trial event).
+        # This event is needed for a combat encounter to know in which trial it happened.
+        self.last_trial_init: TrialInit = None
+
+    def add(self, event: Event):
+        """
+        Processes the next event of the log. Events that are neither trial nor begin combat events are ignored.
+        """
+        if isinstance(event, BeginTrial):
+            if event.trial_id in self.begin_trial_cache:
+                self.logger.info(
+                    f"Existing begin trial event at line {self.begin_trial_cache[event.trial_id].id + 1} for trial {event.trial_id} has no matching end trial event.")
+            self.begin_trial_cache[event.trial_id] = event
+        elif isinstance(event, EndTrial):
+            self.last_trial_init = None
+            if event.trial_id in self.begin_trial_cache:
+                begin_event = self.begin_trial_cache[event.trial_id]
+                event.begin_trial = begin_event
+                begin_event.end_trial = event
+            else:
+                self.logger.warning(f"No matching begin trial event found for end trial event at line {event.id + 1} for trial {event.trial_id}.")
+        elif isinstance(event, TrialInit):
+            self.last_trial_init = event
+        elif isinstance(event, BeginCombat):
+            if self.last_trial_init is None:
+                self.logger.warning(f"Combat {event} happened outside of a trial context")
+                return
+            event.trial_init = self.last_trial_init
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from .events import Event, UnitAdded, UnitRemoved, UnitChanged
+from ..base import Base
+from ...logging import repeat_key
+
+
+class UnitRegistry(Base):
+    """
+    Index of the lifetimes of the units in a log. Unit ids are reused after a unit was removed, so each unit id maps to the list of units that had the
+    id, ordered by the event id at which they were added. A unit is alive from its unit added event until its unit removed event.
+    Resolving the unit with an id at an event is a binary search over the units with the id, so events can resolve their units in any order.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Event ids of the unit added events for each unit id
+        self.__added_ids: Dict[int, List[int]] = {}
+        # Unit added events for each unit id, in the same order as the event ids
+        self.__units: Dict[int, List[UnitAdded]] = {}
+
+    def __len__(self):
+        return sum(len(units) for units in self.__units.values())
+
+    def add_event(self, event: Event):
+        """
+        Processes the next unit event of the log. Other events are ignored.
+        """
+        if isinstance(event, UnitAdded):
+            self.add(event)
+        elif isinstance(event, UnitRemoved):
+            self.remove(event)
+        elif isinstance(event, UnitChanged):
+            self.change(event)
+
+    def add(self, unit_added: UnitAdded) -> bool:
+        """
+        Registers a unit. Units have to be added and removed in the order of their events.
+        @return: False if a unit with the same id is still alive. The unit is not registered in this case.
+        """
+        units = self.__units.get(unit_added.unit_id)
+        if units is None:
+            self.__added_ids[unit_added.unit_id] = [unit_added.id]
+            self.__units[unit_added.unit_id] = [unit_added]
+            return True
+
+        if units[-1].unit_removed is None:
+            self.logger.error("Duplicate unit added event with id %s", unit_added.event_id, extra=repeat_key(unit_added.unit_id))
+            return False
+
+        self.__added_ids[unit_added.unit_id].append(unit_added.id)
+        units.append(unit_added)
+        return True
+
+    def remove(self, unit_removed: UnitRemoved) -> Optional[UnitAdded]:
+        """
+        Ends the lifetime of the unit that is alive with the id of the unit removed event and links both events.
+        @return: The removed unit or None if no unit with the id is alive.
+        """
+        units = self.__units.get(unit_removed.unit_id)
+        if not units or units[-1].unit_removed is not None:
+            self.logger.error("No unit found for unit removed event %s with unit id %s", unit_removed, unit_removed.unit_id,
+                              extra=repeat_key(unit_removed.unit_id))
+            return None
+
+        unit_added = units[-1]
+        unit_added.unit_removed = unit_removed
+        unit_removed.unit_added = unit_added
+        return unit_added
+
+    def change(self, unit_changed: UnitChanged) -> Optional[UnitAdded]:
+        """
+        Links a unit changed event to the unit that is alive with its unit id.
+        @return: The changed unit or None if no unit with the id is alive.
+        """
+        unit_added = self.resolve(unit_changed.unit_id, unit_changed.id)
+        if unit_added is None:
+            self.logger.error("No unit found for unit changed event %s with unit id %s", unit_changed, unit_changed.unit_id,
+                              extra=repeat_key(unit_changed.unit_id))
+            return None
+
+        unit_added.unit_changed.append(unit_changed)
+        unit_changed.unit_added = unit_added
+        return unit_added
+
+    def resolve(self, unit_id: int, event_id: int) -> Optional[UnitAdded]:
+        """
+        Finds the unit that had an id at the time of an event.
+        @param unit_id: Id of the unit.
+        @param event_id: Id of the event (i.e., the id attribute, not the event_id attribute of the event).
+        @return: The unit or None if no unit with the id was alive at the event.
+        """
+        added_ids = self.__added_ids.get(unit_id)
+        if added_ids is None:
+            return None
+
+        index = bisect_right(added_ids, event_id) - 1
+        if index < 0:
+            return None
+
+        unit_added = self.__units[unit_id][index]
+        if unit_added.unit_removed is not None and unit_added.unit_removed.id <= event_id:
+            return None
+        return unit_added
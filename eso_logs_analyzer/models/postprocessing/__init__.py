@@ -1,7 +1,9 @@
 from .combat_encounter import CombatEncounter
+from .encounter_tracker import EncounterTracker
 from .unit import Unit
 
 __all__ = [
     CombatEncounter.__name__,
+    EncounterTracker.__name__,
     Unit.__name__
 ]
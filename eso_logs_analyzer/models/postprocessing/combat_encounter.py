@@ -1,15 +1,14 @@
 from __future__ import annotations
 
-from datetime import timedelta
 from typing import TYPE_CHECKING, List, Dict, Optional
 
 from .unit import Unit
 from ..base import Base
 from ..data import EncounterLog, EventSpan
-from ..data.events import UnitAdded, EndCombat, BeginCombat, Event, CombatEvent, UnitChanged, EffectChanged
+from ..data.events import UnitAdded, BeginCombat, Event, CombatEvent, UnitChanged, EffectChanged
 from ..data.events.enums import Hostility, TrialId
+from ...progress import track
 from ...trials import get_boss_for_trial
-from ...utils import tqdm
 
 if TYPE_CHECKING:
     pass
@@ -87,34 +86,19 @@ class CombatEncounter(Base):
         @param encounter_log: The log object containing the parsed encounterlog data.
         @return: List of combat encounters occurring in the input log.
         """
+        from .encounter_tracker import EncounterTracker
+        tracker = EncounterTracker(encounter_log)
+
         encounters = []
-        begin_encounter: BeginCombat = None
-        last_end_combat: EndCombat = None
-        # The time difference between an end combat and begin combat event needs to be larger than this delta for them to be considered different
-        # combat encounters.
-        combat_phase_delta: timedelta = timedelta(seconds=2)
-
-        for event in tqdm(encounter_log.events, desc="Creating combat encounters"):
-            if isinstance(event, BeginCombat):
-                if begin_encounter is None:
-                    begin_encounter = event
-                elif last_end_combat is not None and (event.time - last_end_combat.time) < combat_phase_delta:
-                    # The time delta between this begin combat and the last end combat is too small.
-                    # The encounter is still ongoing
-                    continue
-                else:
-                    # This is a new encounter. We can save the data for the last encounter.
-                    encounters.append(CombatEncounter(begin_encounter, last_end_combat, encounter_log))
-
-                    # Reset the variables determining the combat encounters
-                    begin_encounter = event
-                    last_end_combat = None
-            elif isinstance(event, EndCombat):
-                last_end_combat = event
-
-        if begin_encounter is not None and last_end_combat is not None:
-            # Create the last encounter
-            encounter = CombatEncounter(begin_encounter, last_end_combat, encounter_log)
+        # Progress is updated once per batch of events, since the loop is run for every event of the log
+        for event in track(encounter_log.events, "Creating combat encounters", total=len(encounter_log.events)):
+            encounter = tracker.add(event)
+            if encounter is not None:
+                encounters.append(encounter)
+
+        # Create the last encounter
+        encounter = tracker.close()
+        if encounter is not None:
             encounters.append(encounter)
 
         return encounters
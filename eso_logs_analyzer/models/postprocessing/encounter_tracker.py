@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import timedelta, datetime
+from typing import Optional
+
+from .combat_encounter import CombatEncounter
+from ..base import Base
+from ..data import EncounterLog
+from ..data.events import Event, BeginCombat, EndCombat
+
+
+class EncounterTracker(Base):
+    # The time difference between an end combat and begin combat event needs to be larger than this delta for them to be considered different
+    # combat encounters.
+    COMBAT_PHASE_DELTA: timedelta = timedelta(seconds=2)
+
+    def __init__(self, encounter_log: EncounterLog):
+        """
+        Groups the combat phases of a log into combat encounters while iterating through the events of the log in order. An encounter is returned as
+        soon as it is known to be complete.
+        @param encounter_log: The log the events belong to.
+        """
+        super().__init__()
+        self.encounter_log = encounter_log
+        self.begin_encounter: BeginCombat = None
+        self.last_end_combat: EndCombat = None
+        # Set between a begin combat event and its end combat event. The encounter can't be complete while a combat phase is ongoing.
+        self.in_combat = False
+
+    def add(self, event: Event) -> Optional[CombatEncounter]:
+        """
+        Processes the next event of the log.
+        @return: The previous encounter, if the event begins a new encounter.
+        """
+        if isinstance(event, BeginCombat):
+            self.in_combat = True
+            if self.begin_encounter is None:
+                self.begin_encounter = event
+            elif self.last_end_combat is not None and (event.time - self.last_end_combat.time) < self.COMBAT_PHASE_DELTA:
+                # The time delta between this begin combat and the last end combat is too small.
+                # The encounter is still ongoing
+                pass
+            else:
+                # This is a new encounter. We can save the data for the last encounter.
+                encounter = CombatEncounter(self.begin_encounter, self.last_end_combat, self.encounter_log)
+
+                # Reset the variables determining the combat encounters
+                self.begin_encounter = event
+                self.last_end_combat = None
+                return encounter
+        elif isinstance(event, EndCombat):
+            self.in_combat = False
+            self.last_end_combat = event
+
+    def expire(self, time: datetime) -> Optional[CombatEncounter]:
+        """
+        Completes the current encounter if combat ended longer than the combat phase delta before the given time, since no further combat phase
+        can belong to it. An encounter is never completed while one of its combat phases is ongoing.
+        @param time: Time of the log up to which all events were processed.
+        @return: The completed encounter, if any.
+        """
+        if self.begin_encounter is None or self.last_end_combat is None or self.in_combat or (time - self.last_end_combat.time) < self.COMBAT_PHASE_DELTA:
+            return None
+
+        encounter = CombatEncounter(self.begin_encounter, self.last_end_combat, self.encounter_log)
+        self.begin_encounter = None
+        self.last_end_combat = None
+        return encounter
+
+    def close(self) -> Optional[CombatEncounter]:
+        """
+        Completes the last encounter of the log. Has to be called after the last event of the log was added.
+        @return: The last encounter, if combat ended in it.
+        """
+        if self.begin_encounter is None or self.last_end_combat is None:
+            return None
+
+        encounter = CombatEncounter(self.begin_encounter, self.last_end_combat, self.encounter_log)
+        self.begin_encounter = None
+        self.last_end_combat = None
+        return encounter
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from collections import defaultdict
 from datetime import datetime
 from typing import TYPE_CHECKING, Dict, Tuple, List, Union
@@ -22,15 +23,19 @@ class Unit(Base):
 
         # Compute the "real" time filter for the uptime by finding the first and last combat events targeting the target unit.
         uptime_begin = max(self.unit, self.combat_encounter.begin)
-        uptime_end = min(self.unit.unit_removed, self.combat_encounter.end)
+        # Units that were not removed (yet) are alive until the end of the encounter
+        uptime_end = min(self.unit.unit_removed, self.combat_encounter.end) if self.unit.unit_removed is not None else self.combat_encounter.end
         target_uptime = EventSpan(uptime_begin, uptime_end)
 
         self.uptime_begin_event = self.__compute_new_uptime_boundary(target_uptime)
         self.uptime_end_event = self.__compute_new_uptime_boundary(reversed(target_uptime))
         self.uptime_begin = self.uptime_begin_event.time
         self.uptime_end = self.uptime_end_event.time
-        self.logger.debug(f"Shortening uptime begin for {self.display_str} from {uptime_begin.time} to {self.uptime_begin}")
-        self.logger.debug(f"Shortening uptime end for {self.display_str} from {uptime_end.time} to {self.uptime_end}")
+        # Debug messages are formatted lazily, since units are created for every hostile unit of every encounter
+        self.__debug = self.logger.isEnabledFor(logging.DEBUG)
+        if self.__debug:
+            self.logger.debug("Shortening uptime begin for %s from %s to %s", self.display_str, uptime_begin.time, self.uptime_begin)
+            self.logger.debug("Shortening uptime end for %s from %s to %s", self.display_str, uptime_end.time, self.uptime_end)
 
         # State to compute uptimes more efficiently
         # Contains uptime spans for ability (ability info -> list of span tuples)
@@ -87,7 +92,9 @@ class Unit(Base):
                 self.__current_span_per_unit[ability][event.unit] = event
             if ability not in self.__current_span:
                 # Track the first time is applied by any unit
-                self.logger.debug(f"Effect {ability.name} ({ability.ability_id}) gained at {self.uptime_delta(event)} for target {self.display_str}")
+                if self.__debug:
+                    self.logger.debug("Effect %s (%s) gained at %s for target %s", ability.name, ability.ability_id, self.uptime_delta(event),
+                                      self.display_str)
                 # If the event happened before combat started, track the time with the start of combat.
                 self.__current_span[ability] = max(event, self.uptime_begin_event)
 
@@ -98,7 +105,9 @@ class Unit(Base):
 
                 if len(self.__current_span_per_unit[ability]) == 0:
                     # No other units are applying the buff. Record the uptime
-                    self.logger.debug(f"Effect {ability.name} ({ability.ability_id}) lost at {self.uptime_delta(event)} for target {self.display_str}")
+                    if self.__debug:
+                        self.logger.debug("Effect %s (%s) lost at %s for target %s", ability.name, ability.ability_id, self.uptime_delta(event),
+                                          self.display_str)
                     self.__uptime_spans[ability].append((self.__current_span[ability], event))
                     del self.__current_span[ability]
 
@@ -122,7 +131,7 @@ class Unit(Base):
 
     def uptime_for_ability_name(self, ability_name: str) -> float:
         if ability_name not in self.max_uptime_for_abilities:
-            self.logger.debug(f"No uptime found for {ability_name} on {self.display_str}")
+            self.logger.debug("No uptime found for %s on %s", ability_name, self.display_str)
             return 0.0
         return self.max_uptime_for_abilities[ability_name][1]
 
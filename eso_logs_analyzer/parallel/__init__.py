@@ -1,7 +1,9 @@
 from .parallel_task import ParallelTask
 from .result_collector import ResultCollector
+from .threaded_task import ThreadedTask
 
 __all__ = [
     ParallelTask.__name__,
-    ResultCollector.__name__
+    ResultCollector.__name__,
+    ThreadedTask.__name__
 ]
@@ -3,6 +3,8 @@ from multiprocessing.queues import Queue
 from queue import Empty
 from typing import Callable
 
+from ..instrumentation import Span, span, collect_spans, init_worker
+
 
 class ParallelProcess(Process):
     __TQDM_INDEX_KWARG: str = "tqdm_index"
@@ -15,6 +17,8 @@ class ParallelProcess(Process):
                  set_tqdm_index: bool = False,
                  task_function_args: list = None,
                  task_function_kwargs: dict = None,
+                 description: str = None,
+                 parent_span: Span = None,
                  *args, **kwargs):
         """
         A process that performs a task in parallel.
@@ -25,6 +29,8 @@ class ParallelProcess(Process):
         @param set_tqdm_index: If set to true the task function is passed the index of the process as parameter 'tqdm_index' to allow parallel tqdm progress bars.
         @param task_function_args: Positional arguments that are passed to the task function.
         @param task_function_kwargs: Keyword arguments that are passed to the task function.
+        @param description: Description of the task the process is part of.
+        @param parent_span: Span of the step that started the task. Each input object is processed in a span below it.
         """
 
         super().__init__(*args, **kwargs)
@@ -32,6 +38,9 @@ class ParallelProcess(Process):
         self.output_queue = output_queue
 
         self.task_function = task_function
+        self.index = index
+        self.description = description
+        self.parent_span = parent_span
         # Create copies of these collections, since they are otherwise shared between processes and we may need to modify it for the tqdm index.
         self.task_function_args = list(task_function_args) if task_function_args else []
         self.task_function_kwargs = dict(task_function_kwargs) if task_function_kwargs else {}
@@ -41,9 +50,14 @@ class ParallelProcess(Process):
             self.task_function_kwargs[self.__TQDM_INDEX_KWARG] = index + 1
 
     def run(self):
+        # The spans and the profiler of the parent process were inherited when this process was forked
+        init_worker()
         while True:
             try:
                 input_object = self.input_queue.get()
-                self.output_queue.put(self.task_function(input_object, *self.task_function_args, **self.task_function_kwargs))
+                with span("worker", parent=self.parent_span, task=self.description, worker=self.index):
+                    result = self.task_function(input_object, *self.task_function_args, **self.task_function_kwargs)
+                # The spans are sent with the result, since the process is killed as soon as all results were received
+                self.output_queue.put((result, collect_spans()))
             except Empty:
                 break
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from multiprocessing import Queue
+from queue import Empty
 from typing import Callable, TYPE_CHECKING
 
 from tqdm import tqdm
 
 from .empty_collector import EmptyCollector
 from .parallel_process import ParallelProcess
+from ..instrumentation import current_span, add_spans
+from ..progress import ProgressBar, is_progress_enabled
 
 if TYPE_CHECKING:
     from .result_collector import ResultCollector
@@ -21,7 +24,8 @@ class ParallelTask:
                  result_collector: ResultCollector = None,
                  task_function_args: list = None,
                  task_function_kwargs: dict = None,
-                 set_tqdm_index: bool = False):
+                 set_tqdm_index: bool = False,
+                 progress: ProgressBar = None):
         """
         Performs a task in parallel using the multiprocessing framework.
         @param num_processes: Number of processes to use.
@@ -31,9 +35,12 @@ class ParallelTask:
                If unset, an empty collector is used that does not return any results.
         @param set_tqdm_index: If set to True, the keyword argument 'tqdm_index' is passed to the task function with the
                position for a tqdm progress bar.
+        @param progress: If set, the progress bar the task function adds its progress to. It is refreshed while waiting for the results instead of
+               showing the number of processed input objects. Has to be created before the task.
         """
         super().__init__()
         self.description = description
+        self.progress = progress
         self.input_objects = input_objects
         self.result_collector: ResultCollector = result_collector or EmptyCollector(len(input_objects))
 
@@ -53,10 +60,13 @@ class ParallelTask:
                                                   output_queue=self.output_queue,
                                                   task_function=task_function,
                                                   task_function_args=task_function_args,
-                                                  task_function_kwargs=task_function_kwargs))
+                                                  task_function_kwargs=task_function_kwargs,
+                                                  description=description,
+                                                  parent_span=current_span()))
 
     def execute(self):
-        progress_bar = tqdm(total=len(self.input_objects), desc=self.description)
+        # The processed input objects are only counted, if the task function doesn't report its progress itself
+        progress_bar = tqdm(total=len(self.input_objects), desc=self.description, disable=self.progress is not None or not is_progress_enabled())
 
         # Populate input queue
         for datum in self.input_objects:
@@ -68,9 +78,15 @@ class ParallelTask:
 
         # Wait for all processes to finish
         while not self.result_collector.is_completed():
-            result = self.output_queue.get(block=True)
+            try:
+                result, spans = self.output_queue.get(block=True, timeout=ProgressBar.REFRESH_INTERVAL if self.progress is not None else None)
+            except Empty:
+                self.progress.refresh()
+                continue
+            add_spans(spans)
             self.result_collector.collect_result(result)
             progress_bar.update(1)
+        progress_bar.close()
 
         # Kill all processes
         for process in self.processes:
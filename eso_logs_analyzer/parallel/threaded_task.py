@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from queue import SimpleQueue, Empty
+from threading import Thread, Lock, Event
+from typing import Callable, TYPE_CHECKING, Optional, List
+
+from tqdm import tqdm
+
+from .empty_collector import EmptyCollector
+from ..instrumentation import current_span, span
+from ..progress import ProgressBar, is_progress_enabled
+
+if TYPE_CHECKING:
+    from .result_collector import ResultCollector
+
+
+class ThreadedTask:
+    def __init__(self,
+                 description: str,
+                 num_threads: int,
+                 input_objects: list,
+                 task_function: Callable,
+                 result_collector: ResultCollector = None,
+                 task_function_args: list = None,
+                 task_function_kwargs: dict = None,
+                 progress: ProgressBar = None):
+        """
+        Performs a task in parallel using threads. Each thread writes its results into the preallocated slot of its input object, so the results are
+        shared with the calling thread instead of being pickled like the results of a ParallelTask.
+        The threads only run in parallel on free-threaded Python builds. On regular builds, they hold the GIL while executing the task function.
+        @param num_threads: Number of threads to use.
+        @param input_objects: List of input objects that are passed as input to the threads performing the task.
+        @param task_function: Function that is executed in a thread. Takes an input object as input and produces some kind of output.
+        @param result_collector: Processes result output produced by each thread and aggregates the results into some kind of final result.
+               If unset, an empty collector is used that does not return any results.
+        @param progress: If set, the progress bar the task function adds its progress to. It is refreshed while waiting for the results instead of
+               showing the number of processed input objects.
+        """
+        super().__init__()
+        self.description = description
+        self.progress = progress
+        self.input_objects = input_objects
+        self.result_collector: ResultCollector = result_collector or EmptyCollector(len(input_objects))
+
+        self.task_function = task_function
+        self.task_function_args = task_function_args or []
+        self.task_function_kwargs = task_function_kwargs or {}
+        # The threads don't share the open spans of the thread that created the task
+        self.parent_span = current_span()
+
+        # Result of each input object at the index of the input object
+        self.results: List = [None] * len(input_objects)
+        self.__next_index = 0
+        self.__index_lock = Lock()
+        # Indices of the processed input objects together with the error that occurred while processing them, if any
+        self.__processed: SimpleQueue = SimpleQueue()
+        self.__stopped = Event()
+
+        # Don't create more threads than necessary if there are not enough tasks.
+        num_threads = min(num_threads, len(input_objects))
+        # Daemon threads don't prevent the program from exiting, if they are still processing input objects after the task was completed
+        self.threads = [Thread(target=self.__run, args=(index,), name=f"{self.__class__.__name__}-{index}", daemon=True) for index in range(num_threads)]
+
+    def __next_input(self) -> Optional[int]:
+        with self.__index_lock:
+            if self.__stopped.is_set() or self.__next_index >= len(self.input_objects):
+                return None
+            index = self.__next_index
+            self.__next_index += 1
+            return index
+
+    def __run(self, thread_index: int):
+        while True:
+            index = self.__next_input()
+            if index is None:
+                break
+            try:
+                with span("worker", parent=self.parent_span, task=self.description, worker=thread_index):
+                    self.results[index] = self.task_function(self.input_objects[index], *self.task_function_args, **self.task_function_kwargs)
+                self.__processed.put((index, None))
+            except Exception as e:
+                self.__processed.put((index, e))
+                break
+
+    def execute(self):
+        # The processed input objects are only counted, if the task function doesn't report its progress itself
+        progress_bar = tqdm(total=len(self.input_objects), desc=self.description, disable=self.progress is not None or not is_progress_enabled())
+
+        # Start threads
+        for thread in self.threads:
+            thread.start()
+
+        try:
+            # Wait for all threads to finish
+            while not self.result_collector.is_completed():
+                try:
+                    index, error = self.__processed.get(block=True, timeout=ProgressBar.REFRESH_INTERVAL if self.progress is not None else None)
+                except Empty:
+                    self.progress.refresh()
+                    continue
+                if error is not None:
+                    raise RuntimeError(f"Error processing input object {index} of task '{self.description}'") from error
+                self.result_collector.collect_result(self.results[index])
+                progress_bar.update(1)
+            progress_bar.close()
+        finally:
+            # Threads can't be killed. Stop them from processing further input objects instead.
+            self.__stopped.set()
+
+        return self.result_collector.aggregated_result()
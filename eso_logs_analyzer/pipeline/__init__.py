@@ -0,0 +1,7 @@
+from .pipeline import Pipeline
+from .stage import Stage
+
+__all__ = [
+    Pipeline.__name__,
+    Stage.__name__
+]
@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor, Executor
+from queue import Queue, Full, Empty
+from threading import Thread, Lock, Event
+from typing import List, Iterable, Any, Optional
+
+from .stage import Stage
+from ..instrumentation import call_with_spans, add_spans
+from ..models import Base
+
+
+class Pipeline(Base):
+    # Marks the end of the items in a queue. Each worker of the receiving stage consumes one.
+    __STOP = object()
+    # Interval in seconds in which blocked workers check if the pipeline failed
+    __POLL_INTERVAL: float = 0.1
+
+    def __init__(self, stages: List[Stage], queue_size: int = 2):
+        """
+        Runs stages concurrently, so that each item is passed through the stages in order while the other stages process other items.
+        The stages are connected by bounded queues. A stage blocks if the queue to the next stage is full, which limits the number of items that
+        are in the pipeline at once.
+        @param stages: The stages in the order they are applied.
+        @param queue_size: Maximum number of items that wait for each stage.
+        """
+        super().__init__()
+        assert stages, "A pipeline needs at least one stage"
+        assert queue_size >= 1, "The queues between the stages need to hold at least one item"
+        self.stages = stages
+        self.queue_size = queue_size
+
+        self.__failed = Event()
+        self.__error: Optional[BaseException] = None
+
+    def __put(self, queue: Queue, item: Any):
+        # Don't block forever if the receiving stage failed and stopped consuming items
+        while not self.__failed.is_set():
+            try:
+                queue.put(item, timeout=self.__POLL_INTERVAL)
+                return
+            except Full:
+                continue
+
+    def __get(self, queue: Queue) -> Any:
+        while not self.__failed.is_set():
+            try:
+                return queue.get(timeout=self.__POLL_INTERVAL)
+            except Empty:
+                continue
+        return self.__STOP
+
+    def __fail(self, stage: Stage, error: BaseException):
+        if not self.__failed.is_set():
+            self.logger.error(f"Stage {stage.name} failed: {error}")
+            self.__error = error
+            self.__failed.set()
+
+    def __run_stage(self, stage: Stage, input_queue: Queue, output_queue: Queue, num_next_workers: int, executor: Optional[Executor]):
+        """
+        Starts the worker threads of a stage. If the stage uses processes, each worker thread passes its items to the process pool of the stage.
+        """
+        num_running_workers = [stage.num_workers]
+        lock = Lock()
+
+        def worker():
+            try:
+                while True:
+                    item = self.__get(input_queue)
+                    if item is self.__STOP:
+                        break
+                    if executor is not None:
+                        # The spans recorded in the worker process are returned with the result
+                        result, spans = executor.submit(call_with_spans, stage.function, item).result()
+                        add_spans(spans)
+                    else:
+                        result = stage.function(item)
+                    if result is not None:
+                        self.__put(output_queue, result)
+            except BaseException as e:
+                self.__fail(stage, e)
+            finally:
+                with lock:
+                    num_running_workers[0] -= 1
+                    is_last_worker = num_running_workers[0] == 0
+                if is_last_worker:
+                    # Only stop the next stage once all items of this stage were processed
+                    for _ in range(num_next_workers):
+                        self.__put(output_queue, self.__STOP)
+
+        threads = [Thread(target=worker, name=f"{stage.name}-{index}", daemon=True) for index in range(stage.num_workers)]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Passes the items through all stages.
+        @param items: Input items of the first stage. Items are only taken from the iterable if the first stage can receive them.
+        @return: The non-None results of the last stage. Their order may differ from the order of the items.
+        """
+        self.__failed.clear()
+        self.__error = None
+
+        queues = [Queue(maxsize=self.queue_size) for _ in self.stages]
+        # The results of the last stage are not bounded, since nothing consumes them while the pipeline runs
+        queues.append(Queue())
+
+        executors = [ProcessPoolExecutor(max_workers=stage.num_workers) if stage.use_processes else None for stage in self.stages]
+        try:
+            # Start the worker processes before any worker threads exist, since forking a process with running threads may deadlock the child
+            for executor in executors:
+                if executor is not None:
+                    executor.submit(int).result()
+
+            threads = []
+            for index, (stage, executor) in enumerate(zip(self.stages, executors)):
+                num_next_workers = self.stages[index + 1].num_workers if index + 1 < len(self.stages) else 1
+                self.logger.debug(f"Starting {stage}")
+                threads.extend(self.__run_stage(stage, queues[index], queues[index + 1], num_next_workers, executor))
+
+            for item in items:
+                if self.__failed.is_set():
+                    break
+                self.__put(queues[0], item)
+            for _ in range(self.stages[0].num_workers):
+                self.__put(queues[0], self.__STOP)
+
+            for thread in threads:
+                thread.join()
+        finally:
+            for executor in executors:
+                if executor is not None:
+                    executor.shutdown(wait=not self.__failed.is_set(), cancel_futures=True)
+
+        if self.__error is not None:
+            raise RuntimeError("Pipeline failed") from self.__error
+
+        results = []
+        while not queues[-1].empty():
+            result = queues[-1].get()
+            if result is not self.__STOP:
+                results.append(result)
+        return results
@@ -0,0 +1,24 @@
+from typing import Callable, Any
+
+
+class Stage(object):
+
+    def __init__(self, name: str, function: Callable[[Any], Any], num_workers: int = 1, use_processes: bool = False):
+        """
+        A stage of a pipeline that applies a function to each item it receives from the previous stage.
+        @param name: Name of the stage used in log messages.
+        @param function: Function that is applied to each item. Its result is passed to the next stage, unless it is None.
+        @param num_workers: How many items are processed concurrently.
+        @param use_processes: If set to True, the items are processed in separate processes. Should be used for CPU bound stages, while threads are
+               sufficient for I/O bound stages. The function, its inputs and its results need to be picklable in this case.
+        """
+        assert num_workers >= 1, f"Stage {name} needs at least one worker"
+        self.name = name
+        self.function = function
+        self.num_workers = num_workers
+        self.use_processes = use_processes
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(name={self.name}, num_workers={self.num_workers}, use_processes={self.use_processes})"
+
+    __repr__ = __str__
@@ -0,0 +1,12 @@
+from .counting_reader import CountingReader
+from .progress import enable_progress, is_progress_enabled, progress_bar, track
+from .progress_bar import ProgressBar
+
+__all__ = [
+    ProgressBar.__name__,
+    CountingReader.__name__,
+    enable_progress.__name__,
+    is_progress_enabled.__name__,
+    progress_bar.__name__,
+    track.__name__
+]
@@ -0,0 +1,41 @@
+import io
+from typing import BinaryIO
+
+from .progress_bar import ProgressBar
+
+
+class CountingReader(io.RawIOBase):
+
+    def __init__(self, file: BinaryIO, progress: ProgressBar):
+        """
+        Adds the number of bytes read from a binary file to a progress bar. Should be wrapped in a buffered reader, so that the progress is updated
+        once per block instead of once per line.
+        @param file: The file that is read.
+        @param progress: The progress bar the bytes are added to.
+        """
+        super().__init__()
+        self.file = file
+        self.progress = progress
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        num_bytes = self.file.readinto(buffer)
+        if num_bytes:
+            self.progress.update(num_bytes)
+        return num_bytes
+
+    def seekable(self) -> bool:
+        return self.file.seekable()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def close(self):
+        if not self.closed:
+            self.file.close()
+        super().close()
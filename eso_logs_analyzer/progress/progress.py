@@ -0,0 +1,51 @@
+from itertools import islice, chain
+from typing import Optional, Iterable, Iterator, TypeVar
+
+from .progress_bar import ProgressBar
+
+T = TypeVar("T")
+
+__ENABLED = True
+
+
+def enable_progress(enabled: bool = True):
+    """
+    Enables or disables all progress bars. Disabled progress bars are not created, so they don't add any cost to the work they would track.
+    Has to be called before any worker processes are created, since they inherit the setting.
+    """
+    global __ENABLED
+    __ENABLED = enabled
+
+
+def is_progress_enabled() -> bool:
+    return __ENABLED
+
+
+def progress_bar(description: str, total: Optional[int] = None, unit: str = "B") -> Optional[ProgressBar]:
+    """
+    @return: A progress bar or None, if progress bars are disabled.
+    """
+    if not __ENABLED:
+        return None
+    return ProgressBar(description, total=total, unit=unit)
+
+
+def __batches(iterator: Iterator[T], progress: ProgressBar, batch_size: int) -> Iterator[Iterable[T]]:
+    with progress:
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+            progress.update(len(batch))
+
+
+def track(iterable: Iterable[T], description: str, total: Optional[int] = None, batch_size: int = 1 << 14) -> Iterable[T]:
+    """
+    Tracks the progress of iterating through the items of an iterable. The progress is updated once per batch of items instead of once per item.
+    @return: The items of the iterable. The iterable itself if progress bars are disabled.
+    """
+    progress = progress_bar(description, total=total, unit="it")
+    if progress is None:
+        return iterable
+    return chain.from_iterable(__batches(iter(iterable), progress, batch_size))
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import ctypes
+import os
+import time
+from multiprocessing import Value
+from threading import Lock
+from typing import Optional
+
+from tqdm import tqdm
+
+
+class ProgressBar(object):
+    # Minimum number of seconds between two updates of the displayed bar
+    REFRESH_INTERVAL: float = 0.2
+
+    def __init__(self, description: str, total: Optional[int] = None, unit: str = "B"):
+        """
+        Progress bar whose count is kept in shared memory, so that worker processes forked after its creation (and threads) can add their progress
+        to the same bar. Only the process that created the bar displays it. Progress should be added in batches (e.g., per block of bytes that
+        was read) instead of per item.
+        @param description: Description shown in front of the bar.
+        @param total: Expected count once the work is completed, if known.
+        @param unit: Unit of the count. Bytes are scaled to KB, MB and so on.
+        """
+        self.description = description
+        self.total = total
+        self.unit = unit
+        self.__count = Value(ctypes.c_longlong, 0)
+        self.__pid = os.getpid()
+        self.__last_refresh = time.monotonic()
+        # Threads of the process that displays the bar may refresh it concurrently
+        self.__refresh_lock = Lock()
+        self.__bar = tqdm(desc=description, total=total, unit=unit, unit_scale=unit == "B", unit_divisor=1024)
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(description={self.description}, count={self.count}, total={self.total})"
+
+    __repr__ = __str__
+
+    def __enter__(self) -> ProgressBar:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def count(self) -> int:
+        return self.__count.value
+
+    def update(self, count: int):
+        """
+        Adds progress. May be called from any process or thread.
+        """
+        with self.__count.get_lock():
+            self.__count.value += count
+        if time.monotonic() - self.__last_refresh >= self.REFRESH_INTERVAL:
+            self.refresh()
+
+    def refresh(self):
+        """
+        Displays the current count, if this is the process that created the bar. Should be called regularly while waiting for workers.
+        """
+        if os.getpid() != self.__pid:
+            return
+        with self.__refresh_lock:
+            self.__last_refresh = time.monotonic()
+            # Blocks read ahead of the end of a chunk may be counted more than once
+            count = self.count if self.total is None else min(self.count, self.total)
+            self.__bar.update(count - self.__bar.n)
+
+    def close(self):
+        if os.getpid() != self.__pid:
+            return
+        self.refresh()
+        self.__bar.close()
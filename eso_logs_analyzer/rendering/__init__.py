@@ -1,6 +1,8 @@
+from .assets import sync_web_resources
 from .rendering import render_log, render_readme
 
 __all__ = [
     render_log.__name__,
-    render_readme.__name__
+    render_readme.__name__,
+    sync_web_resources.__name__
 ]
@@ -0,0 +1,83 @@
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Union
+
+__MANIFEST_FILE = "asset-manifest.json"
+# Number of hex digits of the content hash that are added to the file name of an asset
+__HASH_LENGTH = 12
+# Only text based files benefit from being precompressed
+__COMPRESSIBLE_SUFFIXES = {".css", ".js", ".json", ".html", ".svg", ".txt"}
+
+
+def __fingerprinted_path(relative_path: Path, digest: str) -> Path:
+    """
+    Adds the content hash in front of the suffix of the file name (e.g., styles/custom.css -> styles/custom.0123456789ab.css).
+    """
+    return relative_path.with_name(f"{relative_path.stem}.{digest[:__HASH_LENGTH]}{relative_path.suffix}")
+
+
+def __write_atomic(path: Path, data: bytes) -> None:
+    """
+    Writes the data to a temporary file first and moves it to the target path afterwards. This ensures that an existing file
+    at the target path is always complete, even if the program is interrupted while writing.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with open(temp_path, "wb") as temp_file:
+        temp_file.write(data)
+    os.replace(temp_path, path)
+
+
+def write_compressed_sibling(path: Union[str, Path], data: bytes = None) -> None:
+    """
+    Writes a gzip compressed copy of the file next to it (e.g., log.html -> log.html.gz), so static hosting can serve the precompressed file.
+    @param path: Path of the uncompressed file.
+    @param data: Content of the file. If unset, the content is read from the file.
+    """
+    path = Path(path)
+    if data is None:
+        data = path.read_bytes()
+    # Set the modification time to a fixed value to produce the same output for the same input
+    __write_atomic(path.with_name(f"{path.name}.gz"), gzip.compress(data, compresslevel=9, mtime=0))
+
+
+def sync_web_resources(source_dir: Union[str, Path], target_dir: Union[str, Path]) -> Dict[str, str]:
+    """
+    Copies the web resources (javascript and css) to the target directory. Each file is stored under a name that contains the hash of its content,
+    so that browsers and CDNs can cache them indefinitely. Files that already exist with the same content are not written again.
+    The mapping of the original file paths to the fingerprinted ones is stored as manifest in the target directory.
+    @param source_dir: Directory containing the web resources.
+    @param target_dir: Directory that the web resources are exported to.
+    @return: Manifest mapping the relative path of each resource to the relative path of its fingerprinted copy.
+    """
+    source_dir = Path(source_dir)
+    target_dir = Path(target_dir)
+    manifest: Dict[str, str] = {}
+
+    for source_file in sorted(source_dir.rglob("*")):
+        if not source_file.is_file():
+            continue
+
+        relative_path = source_file.relative_to(source_dir)
+        data = source_file.read_bytes()
+        fingerprinted_path = __fingerprinted_path(relative_path, hashlib.sha256(data).hexdigest())
+        manifest[relative_path.as_posix()] = fingerprinted_path.as_posix()
+
+        # The content hash is part of the file name and files are written atomically, so an existing file always has the same content.
+        target_file = target_dir / fingerprinted_path
+        if not target_file.exists():
+            __write_atomic(target_file, data)
+
+        if target_file.suffix in __COMPRESSIBLE_SUFFIXES and not target_file.with_name(f"{target_file.name}.gz").exists():
+            write_compressed_sibling(target_file, data)
+
+    # Only rewrite the manifest if the resources changed
+    manifest_data = json.dumps(manifest, indent=4, sort_keys=True).encode("utf-8")
+    manifest_file = target_dir / __MANIFEST_FILE
+    if not manifest_file.exists() or manifest_file.read_bytes() != manifest_data:
+        __write_atomic(manifest_file, manifest_data)
+
+    return manifest
@@ -1,20 +1,32 @@
+import hashlib
+import json
 import uuid
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Tuple, Any
 
 import jinja2
 from colour import Color
 from jinja2 import FileSystemLoader
 from python_json_config import Config
 
+from .assets import write_compressed_sibling
+from ..analysis import LogResult, EncounterResult
+from ..analysis.analysis import DEBUFFS
 from ..formatting import format_time, format_uptime
-from ..models.data import EncounterLog
-from ..models.postprocessing import CombatEncounter
+from ..loading import TimeWindow
 from ..trials import Rockgrove
 from ..utils import tqdm
 
 __TEMPLATE_DIR = "templates/"
 __NAME_KEY = "Name"
+__OUTPUT_MODE_HTML = "html"
+__OUTPUT_MODE_JSON = "json"
+__LAYOUT_SINGLE = "single"
+__LAYOUT_SPLIT = "split"
+# Increase when the rendered output of encounter fragments changes to invalidate existing fragments
+__FRAGMENT_VERSION = 1
+__FRAGMENT_TEMPLATES = ["table"]
+__FINGERPRINT_LENGTH = 16
 
 
 class Cell:
@@ -51,11 +63,13 @@ def render_to_file(template_name: str, context: dict, output: Union[str, Path],
     if print_message:
         print(f"Rendering template {template_name} to {output}")
 
-    with open(output, "w") as out_file:
-        out_file.write(render_template(template_name, context))
+    data = render_template(template_name, context).encode("utf-8")
+    with open(output, "wb") as out_file:
+        out_file.write(data)
+    write_compressed_sibling(output, data)
 
 
-def render_readme(config: Config, dev_mode: bool = False):
+def render_readme(config: Config, dev_mode: bool = False, assets: Dict[str, str] = None):
     pages = []
 
     out_path = Path(config.export.path)
@@ -73,94 +87,168 @@ def render_readme(config: Config, dev_mode: bool = False):
         "title": config.export.title_prefix,
         "pages": pages,
         "url_prefix": config.web.url_prefix,
-        "dev_mode": dev_mode
+        "dev_mode": dev_mode,
+        "assets": assets
     }, file_name)
 
 
-def render_log(encounter_log: Union[EncounterLog, List[EncounterLog]], config: Config, dev_mode: bool = False) -> None:
+def render_log(results: List[LogResult], config: Config, dev_mode: bool = False, assets: Dict[str, str] = None, window: TimeWindow = None) -> None:
     """
-    Analyzes and renders a log as html.
-    @param encounter_log: Either a single log or multiple logs that were in a single file.
+    Renders the analysis results of a log file as html.
+    @param results: The results of each log that was in the file.
     @param config: The current configuration.
     @param dev_mode: If set, templates are rendered in development mode.
+    @param assets: Manifest mapping web resources to their fingerprinted file names.
+    @param window: If set, the time window the results were restricted to. The page is named after the window, so that it is written next to
+           the page of the complete log instead of replacing it.
     """
 
-    debuffs = sorted([
-        "Crusher",
-        "Major Breach",
-        "Minor Breach",
-        "Crimson Oath's Rive",
-        "Minor Vulnerability",
-        "Major Vulnerability",
-        "Minor Brittle",
-        "Flame Weakness",
-        "Frost Weakness",
-        "Shock Weakness"
-    ])
+    debuffs = DEBUFFS
 
     hostile_units = ["Oaxiltso", "Havocrel Annihilator"]
 
-    combat_encounters = []
-    if isinstance(encounter_log, list):
-        for log in encounter_log:
-            combat_encounters.extend(CombatEncounter.load(log))
-        encounter_log = encounter_log[0]
-    else:
-        combat_encounters = CombatEncounter.load(encounter_log)
-
-    boss_encounters = [encounter for encounter in combat_encounters if encounter.is_boss_encounter]
     # Sort first by encounter time and then by boss
     # TODO: sort by boss order in trial and not by name
-    boss_encounters = sorted(boss_encounters, key=lambda encounter: (encounter.begin, encounter.get_boss))
-
-    encounters_html = []
-
-    log_trial_name = ""
-
-    # TODO: group encounters by trial and trial boss (under a separate heading level (h1?))
-    for encounter in tqdm(boss_encounters, desc="Computing boss encounter uptimes"):
-        # TODO: filter for clears/make bosses configurable
-        try:
-            # TODO: filter for clears/make bosses configurable
-            if encounter.get_boss() != Rockgrove.OAXILTSO:
-                continue
-        except NotImplementedError:
-            continue
+    boss_encounters: List[Tuple[LogResult, EncounterResult]] = sorted([(log, encounter) for log in results for encounter in log.encounters],
+                                                                       key=lambda t: (t[1].begin_time, t[1].boss))
 
-        # Use the trial of the first encounter for the log title
-        if not log_trial_name:
-            log_trial_name = encounter.trial_id.name.capitalize()
+    output_mode = (config.export.output_mode or __OUTPUT_MODE_HTML).lower()
+    assert output_mode in [__OUTPUT_MODE_HTML, __OUTPUT_MODE_JSON], f"Unknown output mode {output_mode}"
+    layout = (config.export.layout or __LAYOUT_SINGLE).lower()
+    assert layout in [__LAYOUT_SINGLE, __LAYOUT_SPLIT], f"Unknown layout {layout}"
 
-        # Compute debuff uptimes
-        encounter.compute_debuff_uptimes()
+    # TODO: filter for clears/make bosses configurable
+    report_encounters = [(log, encounter) for log, encounter in boss_encounters if encounter.boss == Rockgrove.OAXILTSO.value]
 
-        # Render all data about the encounter
-        encounters_html.append(render_encounter(encounter, debuffs=debuffs, hostile_units=hostile_units))
+    # Use the trial of the first encounter for the log title
+    log_trial_name = report_encounters[0][1].trial.capitalize() if report_encounters else ""
 
-    title_timestamp = encounter_log.begin_log.time.strftime("%d.%m.%Y (%H:%M:%S)")
+    title_timestamp = results[0].begin_time.strftime("%d.%m.%Y (%H:%M:%S)")
     log_title = f"{config.export.title_prefix} - {log_trial_name} - {title_timestamp}"
 
-    timestamp = encounter_log.begin_log.time.strftime("%Y_%m_%d_%H_%M_%S")
-    file_name = f"{config.export.path}/{log_trial_name.lower()}_{timestamp}_{config.export.file_suffix}.html"
+    timestamp = results[0].begin_time.strftime("%Y_%m_%d_%H_%M_%S")
+    window_name = f"_{window.name}" if window is not None else ""
+    page_name = f"{log_trial_name.lower()}_{timestamp}{window_name}_{config.export.file_suffix}"
+    file_name = f"{config.export.path}/{page_name}.html"
 
-    render_to_file("log", {
+    context = {
         "navbar_title": config.export.navbar_title,
         "title": log_title,
-        "encounters": encounters_html,
         "url_prefix": config.web.url_prefix,
-        "dev_mode": dev_mode
-    }, file_name)
+        "dev_mode": dev_mode,
+        "assets": assets
+    }
+
+    if layout == __LAYOUT_SPLIT:
+        # Each encounter is stored in a separate fragment that is only loaded by the browser when the encounter is expanded.
+        fragment_dir = Path(config.export.path) / page_name
+        fragment_dir.mkdir(parents=True, exist_ok=True)
+        encounters_html = []
+        fingerprints = set()
+        for log, encounter in tqdm(report_encounters, desc="Rendering boss encounter fragments"):
+            fragment_file = __render_encounter_fragment(log, encounter, fragment_dir, output_mode=output_mode, debuffs=debuffs, hostile_units=hostile_units)
+            fingerprints.add(fragment_file.stem)
+            encounter_title, is_clear = __encounter_title(encounter)
+            encounters_html.append(__render_encounter(title=encounter_title, debuff_table="", is_clear=is_clear,
+                                                      fragment_url=f"/{config.web.url_prefix}/{page_name}/{fragment_file.name}"))
+
+        # Remove fragments of encounters that are no longer part of the log page
+        for file in fragment_dir.iterdir():
+            if file.is_file() and file.name.split(".")[0] not in fingerprints:
+                file.unlink()
+
+        render_to_file("log", dict(context, encounters=encounters_html, lazy_loading=True), file_name)
+        return
 
+    encounters_html = []
+    encounters_data = []
+
+    # TODO: group encounters by trial and trial boss (under a separate heading level (h1?))
+    for _, encounter in report_encounters:
+        # Render all data about the encounter
+        if output_mode == __OUTPUT_MODE_JSON:
+            encounters_data.append(encounter_data(encounter, debuffs=debuffs, hostile_units=hostile_units))
+        else:
+            encounters_html.append(render_encounter(encounter, debuffs=debuffs, hostile_units=hostile_units))
+
+    if output_mode == __OUTPUT_MODE_JSON:
+        # The tables are rendered by the browser from the data file, which keeps the html page small.
+        data_file_name = f"{page_name}.json"
+        render_data_to_file({"title": log_title, "encounters": encounters_data}, f"{config.export.path}/{data_file_name}")
+        render_to_file("log_data", dict(context, data_url=f"/{config.web.url_prefix}/{data_file_name}"), file_name)
+    else:
+        render_to_file("log", dict(context, encounters=encounters_html), file_name)
+
+
+def __encounter_fingerprint(log: LogResult, encounter: EncounterResult, output_mode: str, debuffs: List[str], hostile_units: List[str]) -> str:
+    """
+    Computes a fingerprint that identifies the rendered output of an encounter. It changes if the encounter, its analysis results, the rendered data
+    or the templates change.
+    """
+    fingerprint = hashlib.sha256()
+    fingerprint.update(str(__FRAGMENT_VERSION).encode("utf-8"))
+    # The log is identified by its begin time and server. The serialized result contains the event ids identifying the encounter in the log and
+    # all values shown in its tables, so a changed analysis creates a new fragment instead of reusing a stale one.
+    result_data = json.dumps(encounter.to_dict(), sort_keys=True, separators=(",", ":"))
+    for value in [log.begin_time.isoformat(), log.server, result_data, output_mode, *debuffs, "|", *hostile_units]:
+        fingerprint.update(str(value).encode("utf-8"))
+        fingerprint.update(b"\0")
+    if output_mode == __OUTPUT_MODE_HTML:
+        for template_name in __FRAGMENT_TEMPLATES:
+            fingerprint.update((Path(__TEMPLATE_DIR) / f"{template_name}.jinja2").read_bytes())
+    return fingerprint.hexdigest()[:__FINGERPRINT_LENGTH]
+
+
+def __render_encounter_fragment(log: LogResult, encounter: EncounterResult, fragment_dir: Path, output_mode: str, debuffs: List[str],
+                                hostile_units: List[str]) -> Path:
+    """
+    Renders the tables of an encounter into a separate file named by the encounter fingerprint. If the file already exists, the encounter was
+    rendered before and is not rendered again.
+    @return: Path of the fragment file.
+    """
+    fingerprint = __encounter_fingerprint(log, encounter, output_mode=output_mode, debuffs=debuffs, hostile_units=hostile_units)
+    suffix = ".json" if output_mode == __OUTPUT_MODE_JSON else ".html"
+    fragment_file = fragment_dir / f"{fingerprint}{suffix}"
+    if fragment_file.exists():
+        return fragment_file
+
+    if output_mode == __OUTPUT_MODE_JSON:
+        render_data_to_file(encounter_data(encounter, debuffs=debuffs, hostile_units=hostile_units), fragment_file, print_message=False)
+    else:
+        data = __render_debuff_table(encounter=encounter, units=hostile_units, abilities=debuffs).encode("utf-8")
+        with open(fragment_file, "wb") as out_file:
+            out_file.write(data)
+        write_compressed_sibling(fragment_file, data)
+    return fragment_file
 
-def render_encounter(encounter: CombatEncounter, hostile_units: List[str] = None, debuffs: List[str] = None) -> str:
+
+def render_data_to_file(data: Any, output: Union[str, Path], print_message: bool = True) -> None:
+    """
+    Writes the data as compact json file next to a gzip compressed copy.
+    """
+    if print_message:
+        print(f"Writing data to {output}")
+
+    data = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    with open(output, "wb") as out_file:
+        out_file.write(data)
+    write_compressed_sibling(output, data)
+
+
+def __encounter_title(encounter: EncounterResult) -> Tuple[str, bool]:
+    """
+    Creates the title for an encounter containing the boss, the duration and the boss hp for wipes.
+    @return: The title and if the encounter was a clear.
+    """
     # TODO: counter of wipes/clears
-    boss_name = encounter.get_boss().value
-    boss_unit = [unit for unit in encounter.boss_units if unit.unit.name == boss_name][0]
-    is_clear = all([unit.was_killed for unit in encounter.boss_units])
-    final_boss_hp = float(boss_unit.uptime_end_event.target_current_health) / float(boss_unit.uptime_end_event.target_maximum_health)
     # Don't show boss hp if it was a clear
-    final_boss_hp = "" if is_clear else f" - {format_uptime(final_boss_hp)[0]}"
-    encounter_title = f"{boss_name} - {format_time(encounter.event_span.duration)}{final_boss_hp} - ({encounter.begin.time.strftime('%H:%M:%S')})"
+    final_boss_hp = "" if encounter.is_clear else f" - {format_uptime(encounter.final_boss_hp)[0]}"
+    encounter_title = f"{encounter.boss} - {format_time(encounter.duration)}{final_boss_hp} - ({encounter.begin_time.strftime('%H:%M:%S')})"
+    return encounter_title, encounter.is_clear
+
+
+def render_encounter(encounter: EncounterResult, hostile_units: List[str] = None, debuffs: List[str] = None) -> str:
+    encounter_title, is_clear = __encounter_title(encounter)
 
     # TODO: dps
     # TODO: buff uptimes
@@ -172,18 +260,18 @@ def render_encounter(encounter: CombatEncounter, hostile_units: List[str] = None
     return __render_encounter(title=encounter_title, debuff_table=debuff_table, is_clear=is_clear)
 
 
-def __render_debuff_table(encounter: CombatEncounter, units: List[str] = None, abilities: List[str] = None):
+def __render_debuff_table(encounter: EncounterResult, units: List[str] = None, abilities: List[str] = None):
     header_row: List[str] = [__NAME_KEY]
     rows: List[Dict[str, Cell]] = []
 
-    units = [unit for unit in encounter.hostile_units if unit.unit.name in units]
+    units = [unit for unit in encounter.units if unit.name in units]
 
     target_active_times = {
         __NAME_KEY: Cell("Active time of each target")
     }
     for unit in units:
         header_row.append(unit.display_str)
-        active_time_str = f"{format_time(unit.uptime_begin, encounter)} to {format_time(unit.uptime_end, encounter)} ({format_time(unit.duration)})"
+        active_time_str = f"{format_time(unit.uptime_begin)} to {format_time(unit.uptime_end)} ({format_time(unit.duration)})"
         # Use the uptime colors (green=died, red=alive)
         color = format_uptime(unit.was_killed)[1]
         target_active_times[unit.display_str] = Cell(value=active_time_str, color=color)
@@ -201,3 +289,46 @@ def __render_debuff_table(encounter: CombatEncounter, units: List[str] = None, a
         rows.append(row)
 
     return __render_table(title="Debuff uptimes", header_row=header_row, active_row=target_active_times, rows=rows)
+
+
+def encounter_data(encounter: EncounterResult, hostile_units: List[str] = None, debuffs: List[str] = None) -> dict:
+    """
+    Creates the data of an encounter that is rendered by the browser. Only raw values are stored. Formatting and coloring of the values happens
+    client side.
+    """
+    encounter_title, is_clear = __encounter_title(encounter)
+
+    return {
+        "title": encounter_title,
+        "is_clear": is_clear,
+        "tables": [__debuff_table_data(encounter=encounter, units=hostile_units, abilities=debuffs)]
+    }
+
+
+def __debuff_table_data(encounter: EncounterResult, units: List[str] = None, abilities: List[str] = None) -> dict:
+    units = [unit for unit in encounter.units if unit.name in units]
+
+    # Each active time is a list of [begin, end, duration, was killed] with times in seconds relative to the start of the encounter
+    active_times = []
+    for unit in units:
+        active_times.append([
+            round(unit.uptime_begin, 3),
+            round(unit.uptime_end, 3),
+            round(unit.duration, 3),
+            unit.was_killed
+        ])
+
+    # Each row is a list of the ability name followed by a list of [relative uptime, total uptime in seconds] for each unit
+    rows = []
+    for ability_name in abilities:
+        rows.append([ability_name, [[round(unit.relative_uptime_for_ability_name(ability_name), 4), round(unit.uptime_for_ability_name(ability_name), 3)]
+                                    for unit in units]])
+
+    return {
+        "title": "Debuff uptimes",
+        "name_column": __NAME_KEY,
+        "active_row_title": "Active time of each target",
+        "columns": [unit.display_str for unit in units],
+        "active_times": active_times,
+        "rows": rows
+    }
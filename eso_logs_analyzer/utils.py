@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 
 
@@ -12,17 +13,25 @@ def tqdm(iterable=None, desc=None, total=None, leave=True, file=None,
     Wrapper for tqdm that uses the logging_redirect_tqdm functionality to allow logging with tqdm progress bars
     while maintaining the same tqdm api.
     See https://tqdm.github.io/docs/contrib.logging/
+    Returns the iterable itself if progress bars are disabled (see enable_progress), so that iterating through it has no overhead.
     """
+    from .progress import is_progress_enabled
+    if disable or not is_progress_enabled():
+        return iterable
+    return __tqdm(iterable=iterable, desc=desc, total=total, leave=leave, file=file,
+                  ncols=ncols, mininterval=mininterval, maxinterval=maxinterval, miniters=miniters,
+                  ascii=ascii, unit=unit, unit_scale=unit_scale,
+                  dynamic_ncols=dynamic_ncols, smoothing=smoothing, bar_format=bar_format, initial=initial,
+                  position=position, postfix=postfix, unit_divisor=unit_divisor, write_bytes=write_bytes,
+                  lock_args=lock_args, nrows=nrows, colour=colour, delay=delay, gui=gui,
+                  **kwargs)
+
+
+def __tqdm(iterable, **kwargs):
     import tqdm as o_tqdm
     from tqdm.contrib.logging import logging_redirect_tqdm
     with logging_redirect_tqdm():
-        for obj in o_tqdm.tqdm(iterable=iterable, desc=desc, total=total, leave=leave, file=file,
-                               ncols=ncols, mininterval=mininterval, maxinterval=maxinterval, miniters=miniters,
-                               ascii=ascii, disable=disable, unit=unit, unit_scale=unit_scale,
-                               dynamic_ncols=dynamic_ncols, smoothing=smoothing, bar_format=bar_format, initial=initial,
-                               position=position, postfix=postfix, unit_divisor=unit_divisor, write_bytes=write_bytes,
-                               lock_args=lock_args, nrows=nrows, colour=colour, delay=delay, gui=gui,
-                               **kwargs):
+        for obj in o_tqdm.tqdm(iterable=iterable, **kwargs):
             yield obj
 
 
@@ -30,6 +39,15 @@ def parse_epoch_time(epoch_time: str) -> datetime:
     return datetime.fromtimestamp(int(epoch_time) / 1000)
 
 
+def is_gil_enabled() -> bool:
+    """
+    Checks if the GIL is enabled. It can only be disabled on free-threaded Python builds (3.13t and later).
+    """
+    # Builds before Python 3.13 always have a GIL
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled() if is_enabled is not None else True
+
+
 def all_subclasses(cls):
     classes = []
     for subclass in cls.__subclasses__():
@@ -0,0 +1,31 @@
+from argparse import Namespace, ArgumentParser
+from pathlib import Path
+
+from eso_logs_analyzer.generation import LogGenerator
+
+
+def cli_args() -> Namespace:
+    parser = ArgumentParser(prog="ESO Logs Generator",
+                            description="Generates a synthetic encounterlog file for scale testing. The same arguments always generate the same file.")
+    parser.add_argument("output", type=str, help="The generated log file.")
+    parser.add_argument("--seed", default=0, type=int, help="Seed of the random number generator.")
+    parser.add_argument("--lines", default=None, type=int, help="Approximate number of lines of the file. Overrides --events-per-pull.")
+    parser.add_argument("--logs", default=1, type=int, help="Number of logs in the file.")
+    parser.add_argument("--pulls", default=10, type=int, help="Number of boss pulls in each log.")
+    parser.add_argument("--events-per-pull", default=5000, type=int, help="Number of combat lines in each pull.")
+    parser.add_argument("--group-size", default=12, type=int, help="Number of players in the group.")
+    return parser.parse_args()
+
+
+def main(args: Namespace):
+    events_per_pull = args.events_per_pull
+    if args.lines is not None:
+        events_per_pull = LogGenerator.events_per_pull_for_size(args.lines, args.logs, args.pulls)
+    generator = LogGenerator(seed=args.seed, num_logs=args.logs, num_pulls=args.pulls, events_per_pull=events_per_pull, group_size=args.group_size)
+    output = Path(args.output)
+    num_lines = generator.write(output)
+    print(f"Generated {num_lines} lines ({output.stat().st_size >> 10} KiB) with {generator} at {output}")
+
+
+if __name__ == "__main__":
+    main(cli_args())
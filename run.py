@@ -1,7 +1,9 @@
 from argparse import Namespace, ArgumentParser
+from datetime import datetime
 from pathlib import Path
 
 from eso_logs_analyzer import Analyzer
+from eso_logs_analyzer.catalog import parse_trial_id
 
 
 def cli_args() -> Namespace:
@@ -11,6 +13,19 @@ def cli_args() -> Namespace:
     parser.add_argument("--config", default="./config.json", type=str, help="Configuration file (JSON).")
     parser.add_argument("--dev", action="store_true", help="Set to enable development mode (i.e. use dev config and load css from web).")
     parser.add_argument("--single", action="store_false", help="Set to only read the first encounterlog in each log file.")
+    parser.add_argument("--follow", action="store_true", help="Set to keep following the log file and render each boss encounter as soon as it is complete.")
+    parser.add_argument("--interval", default=1.0, type=float, help="Seconds between checks for new lines of the followed log file.")
+    parser.add_argument("--catalog", action="store_true", help="Set to only list the logs of the log files (by reading their headers) without analyzing them.")
+    parser.add_argument("--trial", action="append", type=parse_trial_id, help="Only analyze log files with a log of this trial (name or id). May be repeated.")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only analyze the events after this local time (ISO format). Encounters overlapping it are analyzed completely.")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Only analyze the events before this local time (ISO format). Encounters overlapping it are analyzed completely.")
+    parser.add_argument("--profile-report", default=None, type=str, help="Set to write the wall time, CPU time and processed events of each stage, file and worker to this JSON file.")
+    parser.add_argument("--profile", nargs="*", default=None, type=str, metavar="STAGE",
+                        help="Set to profile the stages (e.g., load, initialize, create_encounters, compute_uptimes or render) with cProfile, including their worker processes. Profiles the main stages if no stages are passed.")
+    parser.add_argument("--profile-dir", default="profiles", type=str, help="Directory the merged profile of each stage is written to as .pstats file.")
+    parser.add_argument("--profile-top", default=20, type=int, help="Number of functions with the highest own time that are printed for each profiled stage.")
+    parser.add_argument("--no-progress", action="store_true", help="Set to disable all progress bars, e.g., for batch or cron runs.")
+    parser.add_argument("--trace-memory", action="store_true", help="Set to add the peak memory allocated in each stage to the profile report. Slows down the analysis considerably.")
     return parser.parse_args()
 
 
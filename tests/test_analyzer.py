@@ -0,0 +1,69 @@
+import json
+import tempfile
+import unittest
+from argparse import Namespace
+from datetime import datetime
+from pathlib import Path
+
+from eso_logs_analyzer import Analyzer
+from eso_logs_analyzer.generation import LogGenerator
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class AnalyzerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.log_dir = self.dir / "logs"
+        self.log_dir.mkdir()
+        self.export_dir = self.dir / "export"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_log(self, complete: bool) -> Path:
+        """
+        Writes a generated log into the log directory. An incomplete log is still being written, so it has no end log event yet.
+        """
+        file = self.log_dir / "Encounter.log"
+        LogGenerator(num_pulls=2, events_per_pull=200).write(file)
+        if not complete:
+            lines = file.read_text(encoding="utf-8").splitlines(keepends=True)
+            file.write_text("".join([line for line in lines if ",END_LOG" not in line]), encoding="utf-8")
+        return file
+
+    def analyzer(self, **args) -> Analyzer:
+        config = {
+            "logging": {"file": str(self.dir / "debug.log"), "console_level": "ERROR", "file_level": "DEBUG"},
+            "export": {"path": str(self.export_dir), "file_suffix": "test", "title_prefix": "Test", "navbar_title": "Test"},
+            "web": {"url_prefix": "test", "resource_path": "web-resources"},
+            "cache": {"path": str(self.dir / "cache")},
+            "progress": {"enabled": False}
+        }
+        config_file = self.dir / "config.json"
+        config_file.write_text(json.dumps(config), encoding="utf-8")
+        cli_args = dict(log=str(self.log_dir), config=str(config_file), dev=False, single=True, follow=False, interval=1.0, catalog=False,
+                        trial=None, since=None, until=None, profile_report=None, profile=None, profile_dir="profiles", profile_top=20,
+                        no_progress=True, trace_memory=False)
+        cli_args.update(args)
+        return Analyzer(project_root=PROJECT_ROOT, cli_args=Namespace(**cli_args))
+
+    def pages(self):
+        return sorted([file.name for file in self.export_dir.glob("*_test.html")])
+
+    def test_complete_log_is_rendered(self):
+        self.write_log(complete=True)
+        self.analyzer().run()
+        self.assertEqual(len(self.pages()), 1)
+
+    def test_log_without_end_log_is_not_rendered(self):
+        self.write_log(complete=False)
+        self.analyzer().run()
+        self.assertEqual(self.pages(), [])
+
+    def test_log_without_end_log_is_not_rendered_in_window(self):
+        self.write_log(complete=False)
+        self.analyzer(since=datetime(2023, 6, 1, 20, 0)).run()
+        self.assertEqual(self.pages(), [])
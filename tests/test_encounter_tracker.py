@@ -0,0 +1,53 @@
+import unittest
+from datetime import datetime, timedelta
+
+from eso_logs_analyzer.models.data import EncounterLog
+from eso_logs_analyzer.models.data.events import BeginCombat, EndCombat
+from eso_logs_analyzer.models.postprocessing import EncounterTracker
+
+BEGIN_TIME = datetime(2023, 6, 1, 20, 0)
+
+
+class EncounterTrackerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.log = EncounterLog()
+        self.store = []
+        self.tracker = EncounterTracker(self.log)
+
+    def add(self, event_type, seconds: int):
+        """
+        Adds an event of the given type at the given number of seconds after the begin of the log to the log and the tracker.
+        """
+        event = event_type(len(self.store), self.log, seconds * 1000)
+        event.time = BEGIN_TIME + timedelta(seconds=seconds)
+        self.store.append(event)
+        self.log.assign_events(self.store, 0, len(self.store))
+        return self.tracker.add(event)
+
+    def test_expire_after_combat_ended(self):
+        self.add(BeginCombat, 0)
+        self.add(EndCombat, 10)
+
+        self.assertIsNone(self.tracker.expire(BEGIN_TIME + timedelta(seconds=11)))
+        encounter = self.tracker.expire(BEGIN_TIME + timedelta(seconds=20))
+        self.assertIsNotNone(encounter)
+        self.assertIs(encounter.end, self.store[1])
+
+    def test_no_expire_during_later_combat_phase(self):
+        self.add(BeginCombat, 0)
+        self.add(EndCombat, 10)
+        # The next phase begins within the combat phase delta, so it belongs to the same encounter
+        self.assertIsNone(self.add(BeginCombat, 11))
+
+        self.assertIsNone(self.tracker.expire(BEGIN_TIME + timedelta(seconds=20)))
+
+        self.add(EndCombat, 30)
+        encounter = self.tracker.expire(BEGIN_TIME + timedelta(seconds=40))
+        self.assertIsNotNone(encounter)
+        self.assertIs(encounter.begin, self.store[0])
+        self.assertIs(encounter.end, self.store[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+/*
+ * Renders the encounters of a log from its json data file or loads the content of each encounter from a separate fragment.
+ * Tables are only created when an encounter is expanded and only the rows that are visible are added to the page.
+ */
+(function () {
+    "use strict";
+
+    // Number of rows that are rendered above and below the visible rows of a table
+    const OVERSCAN_ROWS = 10;
+    // Tables with more rows than this are rendered in a scrollable container
+    const MAX_VISIBLE_ROWS = 30;
+    const SECONDS_IN_A_MINUTE = 60;
+
+    // Same gradient as the server side formatting: 101 steps in HSL space from #ffaaaa (red) to #bfffbe (green)
+    const RED = {hue: 0, saturation: 100, lightness: 83.33};
+    const GREEN = {hue: 119.06, saturation: 100, lightness: 87.25};
+    const INVALID_COLOR = "#ff6ee2";
+
+    function getColor(value) {
+        const step = Math.floor(value * 100);
+        if (!(step >= 0 && step <= 100)) {
+            return INVALID_COLOR;
+        }
+        const ratio = step / 100;
+        const hue = RED.hue + (GREEN.hue - RED.hue) * ratio;
+        const saturation = RED.saturation + (GREEN.saturation - RED.saturation) * ratio;
+        const lightness = RED.lightness + (GREEN.lightness - RED.lightness) * ratio;
+        return `hsl(${hue.toFixed(2)}, ${saturation.toFixed(2)}%, ${lightness.toFixed(2)}%)`;
+    }
+
+    function formatSeconds(seconds) {
+        return `${Math.round(seconds)}s`;
+    }
+
+    function formatTime(seconds) {
+        if (seconds < SECONDS_IN_A_MINUTE) {
+            return formatSeconds(seconds);
+        }
+        const minutes = Math.floor(seconds / SECONDS_IN_A_MINUTE);
+        return `${minutes}m${formatSeconds(seconds % SECONDS_IN_A_MINUTE)}`;
+    }
+
+    function formatUptime(relativeUptime) {
+        return `${(relativeUptime * 100).toFixed(2)}%`;
+    }
+
+    function createCell(tagName, text, color) {
+        const cell = document.createElement(tagName);
+        cell.textContent = text;
+        if (color !== undefined) {
+            cell.style.backgroundColor = color;
+        }
+        return cell;
+    }
+
+    function createRow(row) {
+        const [abilityName, values] = row;
+        const tableRow = document.createElement("tr");
+        tableRow.appendChild(createCell("td", abilityName));
+        for (const [relativeUptime, totalUptime] of values) {
+            tableRow.appendChild(createCell("td", `${formatUptime(relativeUptime)} (${formatTime(totalUptime)})`, getColor(relativeUptime)));
+        }
+        return tableRow;
+    }
+
+    function createSpacer(numColumns) {
+        const spacer = document.createElement("tr");
+        const cell = document.createElement("td");
+        cell.colSpan = numColumns;
+        cell.className = "p-0 border-0";
+        spacer.appendChild(cell);
+        return spacer;
+    }
+
+    function createHeader(table) {
+        const head = document.createElement("thead");
+        head.className = "table-light";
+
+        const headerRow = document.createElement("tr");
+        headerRow.appendChild(createCell("th", table.name_column));
+        for (const column of table.columns) {
+            headerRow.appendChild(createCell("th", column));
+        }
+        head.appendChild(headerRow);
+
+        // Row describing the time each target was active. Green if the target died, red otherwise
+        const activeRow = document.createElement("tr");
+        activeRow.appendChild(createCell("th", table.active_row_title));
+        for (const [begin, end, duration, wasKilled] of table.active_times) {
+            activeRow.appendChild(createCell("th", `${formatTime(begin)} to ${formatTime(end)} (${formatTime(duration)})`, getColor(wasKilled ? 1 : 0)));
+        }
+        head.appendChild(activeRow);
+
+        for (const row of [headerRow, activeRow]) {
+            for (const cell of row.children) {
+                cell.scope = "col";
+            }
+        }
+        return head;
+    }
+
+    /*
+     * Renders the rows of the table that are currently visible in the scroll container.
+     * Rows outside the visible area are replaced by two spacer rows with the height of the rows they replace.
+     */
+    function renderVisibleRows(container, body, rows, numColumns, state) {
+        const firstRow = Math.max(0, Math.floor(container.scrollTop / state.rowHeight) - OVERSCAN_ROWS);
+        const numRows = Math.ceil(container.clientHeight / state.rowHeight) + 2 * OVERSCAN_ROWS;
+        const lastRow = Math.min(rows.length, firstRow + numRows);
+        if (firstRow === state.firstRow && lastRow === state.lastRow) {
+            return;
+        }
+        state.firstRow = firstRow;
+        state.lastRow = lastRow;
+
+        const topSpacer = createSpacer(numColumns);
+        topSpacer.style.height = `${firstRow * state.rowHeight}px`;
+        const bottomSpacer = createSpacer(numColumns);
+        bottomSpacer.style.height = `${(rows.length - lastRow) * state.rowHeight}px`;
+
+        const fragment = document.createDocumentFragment();
+        fragment.appendChild(topSpacer);
+        for (let index = firstRow; index < lastRow; index++) {
+            fragment.appendChild(createRow(rows[index]));
+        }
+        fragment.appendChild(bottomSpacer);
+        body.replaceChildren(fragment);
+    }
+
+    function createTable(table) {
+        const wrapper = document.createElement("div");
+        wrapper.appendChild(createCell("h3", table.title));
+        wrapper.lastChild.className = "text-dark";
+
+        const container = document.createElement("div");
+        container.className = "p-2";
+        wrapper.appendChild(container);
+
+        const tableElement = document.createElement("table");
+        tableElement.className = "table table-striped w-auto";
+        tableElement.appendChild(createHeader(table));
+        const body = document.createElement("tbody");
+        body.className = "table-group-divider";
+        tableElement.appendChild(body);
+        container.appendChild(tableElement);
+
+        const numColumns = table.columns.length + 1;
+        if (table.rows.length <= MAX_VISIBLE_ROWS) {
+            for (const row of table.rows) {
+                body.appendChild(createRow(row));
+            }
+            return wrapper;
+        }
+
+        // Measure the height of a single row and only render the rows in the visible part of the container
+        body.appendChild(createRow(table.rows[0]));
+        const state = {rowHeight: 0, firstRow: -1, lastRow: -1};
+        let scheduled = false;
+        container.style.overflowY = "auto";
+        container.addEventListener("scroll", () => {
+            if (!scheduled) {
+                scheduled = true;
+                window.requestAnimationFrame(() => {
+                    scheduled = false;
+                    renderVisibleRows(container, body, table.rows, numColumns, state);
+                });
+            }
+        });
+        // The row height can only be measured once the table is part of the visible document
+        wrapper.addEventListener("table-attached", () => {
+            state.rowHeight = body.firstChild.getBoundingClientRect().height || 1;
+            container.style.maxHeight = `${MAX_VISIBLE_ROWS * state.rowHeight + tableElement.tHead.getBoundingClientRect().height}px`;
+            renderVisibleRows(container, body, table.rows, numColumns, state);
+        });
+        return wrapper;
+    }
+
+    function createEncounter(encounter, index) {
+        const encounterId = `encounter-${index}`;
+        const element = document.createElement("div");
+        element.className = "p-2";
+
+        // If the encounter was a clear, color the header element green. Otherwise, color it red.
+        const link = document.createElement("a");
+        link.className = `text-decoration-none ${encounter.is_clear ? "text-success" : "text-danger"}`;
+        link.href = `#${encounterId}`;
+        link.role = "button";
+        link.dataset.bsToggle = "collapse";
+        link.setAttribute("aria-expanded", "false");
+        link.setAttribute("aria-controls", encounterId);
+        link.appendChild(createCell("h2", encounter.title));
+        const paragraph = document.createElement("p");
+        paragraph.appendChild(link);
+        element.appendChild(paragraph);
+
+        const content = document.createElement("div");
+        content.className = "collapse";
+        content.id = encounterId;
+        element.appendChild(content);
+
+        // Only create the tables once the encounter is expanded for the first time
+        content.addEventListener("show.bs.collapse", () => {
+            if (content.childElementCount === 0) {
+                for (const table of encounter.tables) {
+                    content.appendChild(createTable(table));
+                }
+            }
+        });
+        content.addEventListener("shown.bs.collapse", () => notifyTablesAttached(content));
+        return element;
+    }
+
+    function notifyTablesAttached(content) {
+        for (const table of content.children) {
+            table.dispatchEvent(new Event("table-attached"));
+        }
+    }
+
+    /*
+     * Loads the content of an encounter from its fragment the first time it is expanded.
+     * Fragments are either rendered html or the json data of the encounter.
+     */
+    function lazyLoadFragment(content) {
+        let loaded = false;
+        content.addEventListener("show.bs.collapse", async () => {
+            if (loaded) {
+                return;
+            }
+            loaded = true;
+
+            const url = content.dataset.fragmentSrc;
+            const response = await fetch(url);
+            if (!response.ok) {
+                loaded = false;
+                content.textContent = `Could not load encounter (${response.status})`;
+                return;
+            }
+
+            if (url.endsWith(".json")) {
+                const encounter = await response.json();
+                const fragment = document.createDocumentFragment();
+                for (const table of encounter.tables) {
+                    fragment.appendChild(createTable(table));
+                }
+                content.replaceChildren(fragment);
+            } else {
+                content.innerHTML = await response.text();
+            }
+
+            // The encounter may already be completely expanded when the fragment finishes loading
+            if (content.classList.contains("show")) {
+                notifyTablesAttached(content);
+            }
+        });
+        content.addEventListener("shown.bs.collapse", () => notifyTablesAttached(content));
+    }
+
+    async function renderLog(root) {
+        const response = await fetch(root.dataset.logSrc);
+        if (!response.ok) {
+            root.textContent = `Could not load encounters (${response.status})`;
+            return;
+        }
+        const log = await response.json();
+        const fragment = document.createDocumentFragment();
+        log.encounters.forEach((encounter, index) => fragment.appendChild(createEncounter(encounter, index)));
+        root.replaceChildren(fragment);
+    }
+
+    document.addEventListener("DOMContentLoaded", () => {
+        for (const root of document.querySelectorAll("[data-log-src]")) {
+            renderLog(root);
+        }
+        for (const content of document.querySelectorAll("[data-fragment-src]")) {
+            lazyLoadFragment(content);
+        }
+    });
+})();